@@ -0,0 +1,3 @@
+from air_company.app import main
+
+main()
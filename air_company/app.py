@@ -1,13 +1,30 @@
+from __future__ import annotations
+
+import os
 import sys
+import argparse
 import datetime
-from typing import Callable, Any, Tuple
+import json
+import getpass
+import time
+from typing import Callable, Any, Tuple, Optional, Iterable, List, TextIO, TYPE_CHECKING
 
-import requests as requests
 from valid8 import ValidationError, validate
 
+from air_company.instrumentation import Instrumentation, MetricsProbe, DISABLED
 from air_company.menu import Menu, Description, Entry
-from air_company.domain import AirCompany, Ticket, Name, Surname, Departure, Destination, Price, DepartureDateTime, \
-    TimeFlight, Author
+
+if TYPE_CHECKING:
+    from air_company.bulk import ImportReport
+    from air_company.transport import Transport
+    from air_company.cache import TicketCache
+    from air_company.columnar import TicketStore
+    from air_company.parallel import ParallelDecoder
+    from air_company.refresh import Refresher, TicketSnapshot
+    from air_company.script import Command, CommandResult
+    from air_company.view import TicketTable
+    from air_company.domain import Ticket, Name, Surname, Departure, Destination, Price, \
+        DepartureDateTime, TimeFlight
 
 api_server = 'http://localhost:8000/api/v1'
 
@@ -16,70 +33,157 @@ class App:
     __key = None
     __idUser = None
 
-    def __first_menu(self):
-        self.__first_menu = Menu.Builder(Description('Reservation Flights Login'), auto_select=lambda: print("Hi!")) \
+    def __build_first_menu(self) -> Menu:
+        return Menu.Builder(Description('Reservation Flights Login'), auto_select=lambda: print("Hi!"),
+                            instrumentation=self.__instrumentation) \
             .with_entry(Entry.create('1', 'Login', is_logged=lambda: self.login())) \
             .with_entry(Entry.create('2', 'Sign in', on_selected=lambda: self.registration())) \
             .with_entry(Entry.create('0', 'Exit', on_selected=lambda: print('Bye!'), is_exit=True)) \
             .build()
 
-    def __secondary_menu(self):
-        self.__secondary_menu = Menu.Builder(Description('Reservation Flights Home'), auto_select=lambda: self.__print_tickets()) \
+    def __build_secondary_menu(self) -> Menu:
+        return Menu.Builder(Description('Reservation Flights Home'), auto_select=lambda: self.__print_tickets(),
+                            instrumentation=self.__instrumentation) \
             .with_entry(Entry.create('1', 'Add ticket', on_selected=lambda: self.__add_ticket())) \
             .with_entry(Entry.create('2', 'Remove ticket', on_selected=lambda: self.__remove_ticket())) \
             .with_entry(Entry.create('3', 'Update ticket', on_selected=lambda: self.__update_ticket())) \
             .with_entry(Entry.create('4', 'Sort by departure date', on_selected=lambda: self.__sort_by_departure_date_time())) \
             .with_entry(Entry.create('5', 'Sort by price', on_selected=lambda: self.__sort_by_price())) \
+            .with_entry(Entry.create('6', 'Refresh tickets', on_selected=lambda: self.__refresh_tickets())) \
+            .with_entry(Entry.create('7', 'Search', on_selected=lambda: self.__search_tickets())) \
+            .with_entry(Entry.create('8', 'Filter by price', on_selected=lambda: self.__filter_by_price())) \
+            .with_entry(Entry.create('9', 'Filter by departure date', on_selected=lambda: self.__filter_by_departure_date())) \
+            .with_entry(Entry.create('i', 'Import tickets', on_selected=lambda: self.__import_tickets())) \
+            .with_entry(Entry.create('e', 'Export tickets', on_selected=lambda: self.__export_tickets())) \
+            .with_entry(Entry.create('n', 'Next page', on_selected=lambda: self.__table.next_page())) \
+            .with_entry(Entry.create('p', 'Previous page', on_selected=lambda: self.__table.previous_page())) \
+            .with_entry(Entry.create('g', 'Go to page', on_selected=lambda: self.__go_to_page())) \
+            .with_entry(Entry.create('s', 'Set page size', on_selected=lambda: self.__set_page_size())) \
             .with_entry(Entry.create('0', 'Logout', on_selected=lambda: self.logout(), is_exit=True)) \
             .build()
 
-    def __init__(self):
-        self.__first_menu()
-        self.__secondary_menu()
-        self.__airCompany = AirCompany()
+    def __init__(self, transport: Optional[Transport] = None, page_size: int = 20, cache: Optional[TicketCache] = None,
+                 instrumentation: Instrumentation = DISABLED, concurrency: int = 8,
+                 refresh_interval: Optional[float] = None, columnar: bool = False, decode_workers: int = 1):
+        validate('page_size', page_size, min_value=1)
+        validate('concurrency', concurrency, min_value=1)
+        validate('decode_workers', decode_workers, min_value=1)
+        if refresh_interval is not None:
+            validate('refresh_interval', refresh_interval, min_value=0, min_strict=True)
+        self.__instrumentation = instrumentation
+        self.__page_size = page_size
+        self.__concurrency = concurrency
+        self.__first_menu: Optional[Menu] = None
+        self.__secondary_menu: Optional[Menu] = None
+        self.__lazy_air_company: Optional[TicketStore] = None
+        self.__lazy_table: Optional[TicketTable] = None
+        self.__lazy_transport = transport
+        self.__cache = cache
+        self.__cached = None
+        self.__username = None
+        self.__refresh_interval = refresh_interval
+        self.__columnar = columnar
+        self.__decode_workers = decode_workers
+        self.__lazy_decoder: Optional[ParallelDecoder] = None
+        self.__refresher: Optional[Refresher] = None
+        self.__generation = 0
+        self.__stale = False
+        self.__prompts: Optional[Callable[[str], str]] = None
+
+    @property
+    def __transport(self) -> Transport:
+        from air_company.transport import Transport
+        if self.__lazy_transport is None:
+            self.__lazy_transport = Transport(api_server, pool_size=max(10, self.__concurrency),
+                                              instrumentation=self.__instrumentation)
+        return self.__lazy_transport
+
+    @property
+    def __airCompany(self) -> TicketStore:
+        if self.__lazy_air_company is None:
+            self.__create_tickets()
+        return self.__lazy_air_company
+
+    @property
+    def __table(self) -> TicketTable:
+        if self.__lazy_table is None:
+            self.__create_tickets()
+        return self.__lazy_table
+
+    def __new_store(self) -> TicketStore:
+        from air_company.columnar import ColumnarAirCompany
+        from air_company.domain import AirCompany
+        if self.__columnar:
+            return ColumnarAirCompany()
+        return AirCompany(on_drop=self.__dropped)
+
+    def __dropped(self, id: int) -> None:
+        self.__stale = True
+
+    @property
+    def __decoder(self) -> ParallelDecoder:
+        from air_company.parallel import ParallelDecoder, PARALLEL_CHUNK
+        if self.__lazy_decoder is None:
+            self.__lazy_decoder = ParallelDecoder(self.__decode_workers, PARALLEL_CHUNK)
+        return self.__lazy_decoder
+
+    def __fill(self, airCompany: TicketStore, items: List[dict]) -> None:
+        from air_company.decoder import decode_records, decode_tickets
+        from air_company.parallel import PARALLEL_THRESHOLD
+        if self.__decode_workers > 1 and not self.__columnar and len(items) >= PARALLEL_THRESHOLD:
+            airCompany.add_records(self.__decoder.decode(items))
+        elif self.__columnar:
+            airCompany.add_tickets(decode_tickets(items))
+        else:
+            airCompany.add_records(decode_records(items))
+
+    def __create_tickets(self) -> None:
+        from air_company.view import TicketTable
+        self.__lazy_air_company = self.__new_store()
+        self.__lazy_table = TicketTable(self.__lazy_air_company, self.__page_size)
 
     def __print_tickets(self) -> None:
-        print_sep = lambda: print('-' * 140)
-        print_sep()
-        fmt1 = '%1s %4s %10s %15s %20s %20s %9s %25s %15s'
-        fmt2 = '%1s %4s %14s %15s %20s %15s %12s %25s %13s'
-        print(fmt1 % (
-            '#', 'AUTHOR', 'NAME', 'SURNAME', 'DEPARTURE', 'DESTINATION', 'PRICE', 'DEPARTURE_DATE_TIME',
-            'TIME_FLIGHT'))
-        print_sep()
-        for index in range(self.__airCompany.tickets()):
-            ticket = self.__airCompany.ticket(index)
-            print(fmt2 % (
-                index + 1, ticket.author.value, ticket.name.value, ticket.surname.value, ticket.departure.value,
-                ticket.destination.value, ticket.price, ticket.departureDateTime.value, ticket.timeFlight.value))
-        print_sep()
+        self.__apply_snapshot()
+        with self.__instrumentation.span('action', 'Render tickets'):
+            print(self.__table.render())
+
+    def __print_table(self, tickets: Iterable[Ticket]) -> None:
+        print(self.__table.render_tickets(tickets))
 
     def login(self):
-        username = input('Username: ')
-        password = input('Password: ')
+        username = self.__input('Username: ')
+        password = self.__input('Password: ')
+        return self.authenticate(username, password)
 
-        res = requests.post(url=f'{api_server}/auth/login/', data={'username': username, 'password': password})
+    def authenticate(self, username: str, password: str) -> bool:
+        res = self.__transport.post('auth/login/', data={'username': username, 'password': password})
         if res.status_code != 200:
             print('Wrong Credentials!')
             return False
         json = res.json()
+        self.__username = username
         self.__key = json['key']
-        resGetId = requests.get(url=f'{api_server}/tickets/idUserLogged/{username}', headers={'Authorization': f'Token {self.__key}'})
+        self.__transport.authorize(self.__key)
+        self.__cached = self.__cache.load(username) if self.__cache is not None else None
+        if self.__refresh_interval is not None:
+            self.__start_refresher()
+        resGetId = self.__transport.get(f'tickets/idUserLogged/{username}')
         json = resGetId.json()
         self.__idUser = json['id']
         return True
 
     def registration(self):
-        username = input('Username: ')
-        email = input("Email: ")
-        password = input('Password: ')
-        password2 = input('Ripeti Password: ')
+        username = self.__input('Username: ')
+        email = self.__input("Email: ")
+        password = self.__input('Password: ')
+        password2 = self.__input('Ripeti Password: ')
 
-        res = requests.post(url=f'{api_server}/auth/registration/', data={'username': username, 'email': email, 'password1': password, 'password2': password2})
+        res = self.__transport.post('auth/registration/', data={'username': username, 'email': email, 'password1': password, 'password2': password2})
         if res.status_code == 400:
             print('Something went wrong')
 
     def __add_ticket(self) -> None:
+        from air_company.decoder import decode_ticket
         name, surname, departure, destination, price, departureDateTime, timeFlight = self.__read_ticket()
         obj = {
             "author": self.__idUser,
@@ -91,31 +195,42 @@ class App:
             "departureDateTime": str(departureDateTime),
             "timeFlight": str(timeFlight)
         }
-        res = requests.post(url=f'{api_server}/tickets/', json=obj, headers={'Authorization': f'Token {self.__key}'})
-        self.__airCompany.clear()
-        self.fetch_tickets()
-        print('Ticket added!')
+        self.__generation += 1
+        res = self.__transport.post('tickets/', json=obj)
+        if self.__reconcile(res, lambda: self.__airCompany.add_ticket(decode_ticket(res.json()))):
+            print('Ticket added!')
 
     def __remove_ticket(self) -> None:
-        def builder(value: str) -> int:
-            validate('value', int(value), min_value=0, max_value=self.__airCompany.tickets())
-            return int(value)
+        from air_company.bulk import parse_selection, delete_tickets, REMOVED, NOT_FOUND, FAILED
 
-        index = self.__read('Index (0 to cancel)', builder)
-        if index == 0:
+        def builder(value: str) -> List[int]:
+            return [] if value == '0' else parse_selection(value, self.__airCompany.tickets())
+
+        indexes = self.__read('Indexes, e.g. 1,4,7-20 (0 to cancel)', builder)
+        if not indexes:
             print('Cancelled!')
             return
 
-        to_delete = self.__airCompany.ticket(index - 1)
-        res = requests.delete(url=f'{api_server}/tickets/{to_delete.id}/', headers={'Authorization': f'Token {self.__key}'})
-        if res.status_code == 403:
-            print("You are not authorized to delete this ticket")
-        else:
-            self.__airCompany.clear()
-            self.fetch_tickets()
+        selection = [(index, self.__airCompany.ticket(index - 1)) for index in indexes]
+        self.__generation += 1
+        with self.__instrumentation.span('action', 'Remove tickets batch'):
+            report = delete_tickets(self.__transport, selection, self.__concurrency)
+        results = report.results
+        self.__airCompany.remove_by_ids(result.ticket_id for result in results
+                                        if result.status in (REMOVED, NOT_FOUND))
+        if report.counts()[FAILED]:
+            self.__resync()
+
+        if len(results) > 1:
+            print(report.render())
+        elif results[0].status in (REMOVED, NOT_FOUND):
             print('Ticket removed!')
+        else:
+            print(results[0].error)
 
     def __update_ticket(self) -> None:
+        from air_company.decoder import decode_ticket
+
         def builder(value: str) -> int:
             validate('value', int(value), min_value=0, max_value=self.__airCompany.tickets())
             return int(value)
@@ -136,48 +251,273 @@ class App:
             "departureDateTime": str(departureDateTime),
             "timeFlight": str(timeFlight)
         }
-        res = requests.put(url=f'{api_server}/tickets/{to_update.id}/', json=obj, headers={'Authorization': f'Token {self.__key}'})
+        self.__generation += 1
+        res = self.__transport.put(f'tickets/{to_update.id}/', json=obj)
         if res.status_code == 403:
             print("You are not authorized to update this ticket")
-        else:
-            self.__airCompany.clear()
-            self.fetch_tickets()
+        elif self.__reconcile(res, lambda: self.__airCompany.replace_by_id(decode_ticket(res.json()))):
             print('Ticket updated!')
 
+    def __search_tickets(self) -> None:
+        def builder(value: str) -> str:
+            validate('value', value, min_len=1)
+            return value
+
+        query = self.__read('Search (city, name or surname prefix)', builder)
+        tickets = self.__airCompany.search(query)
+        if not tickets:
+            print('No tickets found!')
+            return
+        self.__print_table(tickets)
+
+    def __filter_by_price(self) -> None:
+        from air_company.domain import Price
+        min_price = self.__read('Min price', Price.parse)
+        max_price = self.__read('Max price', Price.parse)
+        self.__print_filtered(lambda: self.__airCompany.tickets_in_price_range(min_price, max_price))
+
+    def __filter_by_departure_date(self) -> None:
+        def builder(value: str) -> datetime.datetime:
+            return datetime.datetime.strptime(value, '%d/%m/%Y %H:%M')
+
+        start = self.__read('From (dd/mm/yyyy hh:mm)', builder)
+        end = self.__read('To (dd/mm/yyyy hh:mm)', builder)
+        self.__print_filtered(lambda: self.__airCompany.tickets_departing_between(start, end))
+
+    def __print_filtered(self, query: Callable[[], List[Ticket]]) -> None:
+        try:
+            tickets = query()
+        except ValidationError as e:
+            print(e)
+            return
+        if not tickets:
+            print('No tickets found!')
+            return
+        self.__print_table(tickets)
+
+    def __import_tickets(self) -> None:
+        def builder(value: str) -> str:
+            if value:
+                validate('value', value, custom=os.path.isfile)
+            return value
+
+        path = self.__read('File (.csv, .json or .jsonl, empty to cancel)', builder)
+        if not path:
+            print('Cancelled!')
+            return
+        try:
+            print(self.__import(path).render())
+        except (OSError, ValueError, ValidationError) as e:
+            print(e)
+
+    def __import(self, path: str) -> ImportReport:
+        from air_company.bulk import import_tickets, read_rows
+        self.__generation += 1
+        with self.__instrumentation.span('action', 'Import tickets file'):
+            try:
+                report = import_tickets(self.__transport, self.__idUser, read_rows(path), self.__concurrency)
+            except (OSError, ValueError, ValidationError):
+                self.__resync()
+                raise
+        try:
+            self.__airCompany.add_tickets(report.tickets)
+        except (KeyError, TypeError, ValueError, ValidationError):
+            self.__resync()
+            return report
+        if len(report.tickets) != report.counts()['created']:
+            self.__resync()
+        return report
+
+    def run_import(self, path: str, username: str, password: str, report_path: Optional[str] = None) -> bool:
+        if not self.authenticate(username, password):
+            return False
+        try:
+            report = self.__import(path)
+        except (OSError, ValueError, ValidationError) as e:
+            print(e, file=sys.stderr)
+            return False
+        finally:
+            self.logout()
+        print(report.render())
+        if report_path is not None:
+            with open(report_path, 'w') as file:
+                file.write(report.to_json())
+        return report.is_complete()
+
+    def __export_tickets(self) -> None:
+        from air_company.export import FORMATS, export, ticket_records
+
+        def builder(value: str) -> str:
+            if value:
+                validate('value', os.path.splitext(value)[1].lower(), is_in=set(FORMATS))
+            return value
+
+        path = self.__read('File (.csv or .jsonl, empty to cancel)', builder)
+        if not path:
+            print('Cancelled!')
+            return
+        query = self.__input('Search filter (empty for every ticket): ').strip()
+        tickets = self.__airCompany.search(query) if query else self.__airCompany.iter_tickets()
+        try:
+            with self.__instrumentation.span('action', 'Export tickets file'):
+                count = export(ticket_records(tickets), path)
+        except OSError as e:
+            print(e)
+            return
+        print(f'{count} tickets exported to {path}')
+
+    def run_export(self, path: str, username: str, password: str) -> bool:
+        from air_company.export import CHUNK_SIZE, export, iter_json_array
+        if not self.authenticate(username, password):
+            return False
+        try:
+            with self.__transport.get('tickets/', stream=True) as res:
+                if res.status_code != 200:
+                    print(f'Unable to retrieve tickets (HTTP {res.status_code})', file=sys.stderr)
+                    return False
+                count = export(iter_json_array(res.iter_content(CHUNK_SIZE)), path)
+        except (OSError, ValueError, ValidationError) as e:
+            print(e, file=sys.stderr)
+            return False
+        finally:
+            self.logout()
+        print(f'{count} tickets exported to {path}')
+        return True
+
+    def __go_to_page(self) -> None:
+        def builder(value: str) -> int:
+            validate('value', int(value), min_value=1, max_value=self.__table.pages())
+            return int(value)
+
+        self.__table.go_to_page(self.__read(f'Page (1 to {self.__table.pages()})', builder))
+
+    def __set_page_size(self) -> None:
+        def builder(value: str) -> int:
+            validate('value', int(value), min_value=1)
+            return int(value)
+
+        self.__table.set_page_size(self.__read('Page size', builder))
+
     def __sort_by_departure_date_time(self) -> None:
         self.__airCompany.sort_by_departure_date()
 
     def __sort_by_price(self) -> None:
         self.__airCompany.sort_by_price()
 
-    def fetch_tickets(self):
-        res = requests.get(url=f'{api_server}/tickets/', headers={'Authorization': f'Token {self.__key}'})
-        if res.status_code != 200:
-            return None
+    def __refresh_tickets(self) -> None:
+        if self.__refresher is not None:
+            self.__refresher.refresh()
+            self.__apply_snapshot()
+        else:
+            self.__resync()
+        print('Tickets refreshed!')
 
-        json = res.json()
-        for item in json:
-            id = int(item['id'])
-            author = Author(item['author'])
-            name = Name(item['name'])
-            surname = Surname(item['surname'])
-            departure = Departure(item['departure'])
-            destination = Destination(item['destination'])
-            price = Price.parse(item['price'])
-            departureDateTime = DepartureDateTime(datetime.datetime.strptime(item['departureDateTime'], '%Y-%m-%dT%H:%M:%SZ'))
-            timeFlight = TimeFlight(datetime.datetime.strptime(item['timeFlight'], '%H:%M:%S').time())
-
-            self.__airCompany.add_ticket(
-                Ticket(id, author, name, surname, departure, destination, price, departureDateTime, timeFlight))
-
-        return res.json()
+    def __resync(self) -> None:
+        if self.__refresher is not None:
+            self.__generation += 1
+            self.__refresher.request()
+            return
+        self.__airCompany.clear()
+        self.__table.invalidate()
+        self.__cached = None
+        self.fetch_tickets()
+
+    def __reconcile(self, res, apply: Callable[[], None]) -> bool:
+        if res.status_code not in (200, 201, 204):
+            print(f'Something went wrong: HTTP {res.status_code}')
+            if not 400 <= res.status_code < 500:
+                self.__resync()
+            return False
+        try:
+            apply()
+        except (KeyError, TypeError, ValueError, ValidationError):
+            self.__resync()
+        return True
+
+    def __load_tickets(self) -> None:
+        rejected = False
+        if self.__cached is not None:
+            try:
+                self.__fill(self.__airCompany, json.loads(self.__cached.payload))
+            except (KeyError, TypeError, ValueError, ValidationError):
+                self.__airCompany.clear()
+                self.__cached = None
+                rejected = True
+        if self.__refresher is None:
+            self.fetch_tickets()
+            return
+        if rejected:
+            self.__refresher.refresh()
+        elif self.__cached is None:
+            self.__refresher.wait(1)
+        self.__apply_snapshot()
+
+    def __start_refresher(self) -> None:
+        from air_company.refresh import Refresher
+        if self.__refresher is None:
+            self.__refresher = Refresher(self.__fetch_snapshot, self.__refresh_interval, 'tickets-refresh')
+        self.__refresher.start()
+
+    def __fetch_snapshot(self) -> Optional[TicketSnapshot]:
+        from air_company.cache import CachedTickets
+        from air_company.refresh import TicketSnapshot
+        generation, cached = self.__generation, self.__cached
+        with self.__instrumentation.span('task', 'Refresh tickets'):
+            headers = cached.conditional_headers() if cached is not None else {}
+            res = self.__transport.get('tickets/', **({'headers': headers} if headers else {}))
+            if res.status_code != 200:
+                return None
+            airCompany = self.__new_store()
+            self.__fill(airCompany, res.json())
+        cached = CachedTickets(res.content, res.headers.get('ETag'), res.headers.get('Last-Modified')) \
+            if self.__cache is not None else None
+        return TicketSnapshot(generation, airCompany, cached)
+
+    def __apply_snapshot(self) -> None:
+        if self.__stale:
+            self.__stale = False
+            self.__resync()
+        snapshot = self.__refresher.take() if self.__refresher is not None else None
+        if snapshot is None:
+            return
+        if snapshot.generation != self.__generation:
+            self.__refresher.request()
+            return
+        self.__airCompany.swap(snapshot.air_company)
+        self.__table.invalidate()
+        if snapshot.cached is not None:
+            self.__cached = snapshot.cached
+            self.__cache.store(self.__username, snapshot.cached)
+
+    def fetch_tickets(self):
+        from air_company.cache import CachedTickets
+        with self.__instrumentation.span('action', 'Fetch tickets'):
+            headers = self.__cached.conditional_headers() if self.__cached is not None else {}
+            res = self.__transport.get('tickets/', **({'headers': headers} if headers else {}))
+            if res.status_code != 200:
+                return None
+
+            json = res.json()
+            airCompany = self.__new_store()
+            self.__fill(airCompany, json)
+            self.__airCompany.swap(airCompany)
+            self.__table.invalidate()
+
+            if self.__cache is not None:
+                self.__cached = CachedTickets(res.content, res.headers.get('ETag'), res.headers.get('Last-Modified'))
+                self.__cache.store(self.__username, self.__cached)
+            return json
 
     def __run(self) -> None:
         welcome()
+        if self.__first_menu is None:
+            self.__first_menu = self.__build_first_menu()
         while not self.__first_menu.run() == (True, False):
             if self.__key is None:
                 error_message()
-            self.fetch_tickets()
+            self.__load_tickets()
+            if self.__secondary_menu is None:
+                self.__secondary_menu = self.__build_secondary_menu()
             self.__secondary_menu.run()
         goodbye()
 
@@ -186,12 +526,76 @@ class App:
             self.__run()
         except:
             print('Panic error!', file=sys.stderr)
-
-    @staticmethod
-    def __read(prompt: str, builder: Callable) -> Any:
+        finally:
+            self.__instrumentation.export()
+
+    def run_script(self, lines: Iterable[str], out: Optional[TextIO] = None, stop_on_error: bool = False) -> bool:
+        from air_company.script import CommandResult, headless, parse_command
+        out = out if out is not None else sys.stdout
+        if self.__first_menu is None:
+            self.__first_menu = self.__build_first_menu()
+        menu, ok = self.__first_menu, True
+        for number, text in enumerate(lines, start=1):
+            try:
+                command = parse_command(number, text)
+            except ValueError as e:
+                command, result = None, CommandResult(number, text.strip())
+                result.fail(str(e))
+            else:
+                if command is None:
+                    continue
+                result = self.__run_command(menu, command)
+                if menu is self.__first_menu and result.logged:
+                    menu = self.__secondary_menu
+                elif menu is self.__secondary_menu and result.exit:
+                    menu = self.__first_menu
+                elif result.exit:
+                    menu = None
+            out.write(result.to_json() + '\n')
+            ok = ok and result.ok
+            if menu is None or (stop_on_error and not result.ok):
+                break
+        if self.__key is not None:
+            with headless(()):
+                self.logout()
+        out.flush()
+        return ok
+
+    def __run_command(self, menu: Menu, command: Command) -> CommandResult:
+        from air_company.script import CommandResult, ScriptError, headless, output_lines
+        result = CommandResult(command.line, command.key, menu.description.value)
+        start = time.perf_counter()
+        self.__apply_snapshot()
+        with headless(command.args) as (prompts, output):
+            self.__prompts = prompts
+            try:
+                result.exit, result.logged = menu.dispatch(command.key)
+                if menu is self.__first_menu and result.logged:
+                    self.__load_tickets()
+                    if self.__secondary_menu is None:
+                        self.__secondary_menu = self.__build_secondary_menu()
+            except KeyError:
+                result.fail(f'unknown key {command.key!r}')
+            except (ScriptError, ValueError, ValidationError) as e:
+                result.fail(str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__)
+            except Exception as e:
+                result.fail(f'{type(e).__name__}: {e}')
+            else:
+                if prompts.remaining:
+                    result.fail(f'{prompts.remaining} unused arguments')
+            finally:
+                self.__prompts = None
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        result.output = output_lines(output)
+        return result
+
+    def __input(self, prompt: str) -> str:
+        return input(prompt) if self.__prompts is None else self.__prompts(prompt)
+
+    def __read(self, prompt: str, builder: Callable) -> Any:
         while True:
             try:
-                line = input(f'{prompt}: ')
+                line = self.__input(f'{prompt}: ')
                 if prompt == "DepartureDateTime":
                     line = datetime.datetime.strptime(line, '%d/%m/%Y %H:%M')
                     res = builder(line)
@@ -207,6 +611,7 @@ class App:
                 print(e)
 
     def __read_ticket(self) -> Tuple[Name, Surname, Departure, Destination, Price, DepartureDateTime, TimeFlight]:
+        from air_company.domain import Name, Surname, Departure, Destination, Price, DepartureDateTime, TimeFlight
         name = self.__read('Name', Name)
         surname = self.__read('Surname', Surname)
         departure = self.__read('Departure', Departure)
@@ -218,16 +623,84 @@ class App:
         return name, surname, departure, destination, price, departureDateTime, timeFlight
 
     def logout(self):
-        res = requests.post(url=f'{api_server}/auth/logout/', headers={'Authorization': f'Token {self.__key}'})
+        if self.__refresher is not None:
+            self.__refresher.stop()
+        if self.__lazy_decoder is not None:
+            self.__lazy_decoder.close()
+        res = self.__transport.post('auth/logout/')
         print('Logged out!')
         print()
         self.__key = None
+        self.__cached = None
+        self.__transport.deauthorize()
         self.__airCompany.clear()
+        self.__table.invalidate()
+        self.__instrumentation.export()
+
+
+def main(argv: Optional[List[str]] = None):
+    from air_company.profiling import ProfileProbe
+    parser = argparse.ArgumentParser(prog='air_company', description='ReservationFlights TUI')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='record HTTP and menu action metrics, written as JSON (or Prometheus text for '
+                             '.prom/.txt files) at logout and exit')
+    parser.add_argument('--profile', metavar='DIR',
+                        help='profile every menu action with cProfile and tracemalloc, writing one ranked '
+                             'report per action to DIR')
+    parser.add_argument('--concurrency', type=int, default=8, help='parallel requests of bulk operations')
+    parser.add_argument('--refresh-interval', type=float, default=60.0, metavar='SECONDS',
+                        help='refresh the tickets in the background every SECONDS (0 fetches them synchronously)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='keep the tickets in compact array-backed columns instead of one object per field')
+    parser.add_argument('--decode-workers', type=int, default=1, metavar='N',
+                        help='validate payloads of at least 50000 tickets across N processes (object store only)')
+    parser.add_argument('--import', dest='import_path', metavar='FILE',
+                        help='import the tickets of a .csv, .json or .jsonl file and exit')
+    parser.add_argument('--export', dest='export_path', metavar='FILE',
+                        help='stream every ticket from the server into a .csv or .jsonl file and exit')
+    parser.add_argument('--script', metavar='FILE',
+                        help="run the menu commands of FILE ('-' for stdin) without rendering, one JSON result "
+                             "per command on stdout")
+    parser.add_argument('--stop-on-error', action='store_true', help='stop --script at the first failed command')
+    parser.add_argument('--username', help='account used by --import and --export')
+    parser.add_argument('--password', help='password of --username (asked when omitted)')
+    parser.add_argument('--report', metavar='PATH', help='write the per-row --import report as JSON')
+    args = parser.parse_args(argv)
+    probes = [MetricsProbe(args.metrics)] if args.metrics else []
+    if args.profile:
+        probes.append(ProfileProbe(args.profile))
+    instrumentation = Instrumentation(probes) if probes else DISABLED
+
+    if args.import_path is not None or args.export_path is not None:
+        username = args.username if args.username is not None else input('Username: ')
+        password = args.password if args.password is not None else getpass.getpass('Password: ')
+        app = App(instrumentation=instrumentation, concurrency=args.concurrency)
+        try:
+            if args.import_path is not None:
+                done = app.run_import(args.import_path, username, password, args.report)
+            else:
+                done = app.run_export(args.export_path, username, password)
+        finally:
+            instrumentation.export()
+        sys.exit(0 if done else 1)
+
+    if args.script is not None:
+        app = App(instrumentation=instrumentation, concurrency=args.concurrency, columnar=args.columnar,
+                  decode_workers=args.decode_workers)
+        try:
+            if args.script == '-':
+                done = app.run_script(sys.stdin, stop_on_error=args.stop_on_error)
+            else:
+                with open(args.script, encoding='utf-8') as file:
+                    done = app.run_script(file, stop_on_error=args.stop_on_error)
+        finally:
+            instrumentation.export()
+        sys.exit(0 if done else 1)
 
-
-def main(name: str):
-    if name == '__main__':
-        App().run()
+    from air_company.cache import TicketCache
+    App(cache=TicketCache(TicketCache.default_path()), instrumentation=instrumentation,
+        concurrency=args.concurrency, refresh_interval=args.refresh_interval or None, columnar=args.columnar,
+        decode_workers=args.decode_workers).run()
 
 
 def welcome():
@@ -248,4 +721,5 @@ def goodbye():
     print('It was nice to have your here. Have a nice day!\n')
 
 
-main(__name__)
+if __name__ == '__main__':
+    main()
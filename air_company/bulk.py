@@ -0,0 +1,226 @@
+import csv
+import datetime
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Iterator, Iterable, List, Optional, Tuple, Dict, Set
+
+import requests
+from typeguard import typechecked
+from valid8 import ValidationError, validate
+
+from air_company.decoder import decode_ticket, intern_name, intern_surname, intern_departure, intern_destination
+from air_company.domain import Ticket, Name, Surname, Departure, Destination, Price, DepartureDateTime, TimeFlight
+from air_company.export import CHUNK_SIZE, iter_json_array
+from air_company.transport import Transport
+
+FIELDS = ('name', 'surname', 'departure', 'destination', 'price', 'departureDateTime', 'timeFlight')
+FORMATS = ('.csv', '.json', '.jsonl')
+DEPARTURE_DATE_TIME_FORMATS = ('%d/%m/%Y %H:%M', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+                               '%Y-%m-%dT%H:%M:%SZ')
+TIME_FLIGHT_FORMATS = ('%H:%M', '%H:%M:%S')
+
+CREATED = 'created'
+INVALID = 'invalid'
+REMOVED = 'removed'
+FORBIDDEN = 'forbidden'
+NOT_FOUND = 'not found'
+FAILED = 'failed'
+
+TicketFields = Tuple[Name, Surname, Departure, Destination, Price, DepartureDateTime, TimeFlight]
+
+
+def read_rows(path: str) -> Iterator[Tuple[int, dict]]:
+    extension = os.path.splitext(path)[1].lower()
+    validate('extension', extension, is_in=set(FORMATS))
+    if extension == '.json':
+        with open(path, 'rb') as file:
+            yield from enumerate(iter_json_array(iter(lambda: file.read(CHUNK_SIZE), b'')), start=1)
+        return
+    with open(path, newline='', encoding='utf-8') as file:
+        if extension == '.csv':
+            yield from enumerate(csv.DictReader(file), start=1)
+        else:
+            number = 0
+            for line in file:
+                if line.strip():
+                    number += 1
+                    try:
+                        yield number, json.loads(line)
+                    except ValueError:
+                        yield number, line.strip()
+
+
+def _parse(value: str, formats: Tuple[str, ...]) -> datetime.datetime:
+    for format in formats:
+        try:
+            return datetime.datetime.strptime(value, format)
+        except ValueError:
+            pass
+    raise ValueError(f"'{value}' does not match any of {', '.join(formats)}")
+
+
+def parse_row(row: dict) -> TicketFields:
+    if not isinstance(row, dict):
+        raise ValueError(f'expected an object, got {row!r}')
+    values = {}
+    for key in FIELDS:
+        if row.get(key) is None:
+            raise KeyError(key)
+        values[key] = str(row[key]).strip()
+    return (intern_name(values['name']),
+            intern_surname(values['surname']),
+            intern_departure(values['departure']),
+            intern_destination(values['destination']),
+            Price.parse(values['price']),
+            DepartureDateTime(_parse(values['departureDateTime'], DEPARTURE_DATE_TIME_FORMATS)),
+            TimeFlight(_parse(values['timeFlight'], TIME_FLIGHT_FORMATS).time()))
+
+
+def ticket_payload(author: int, fields: TicketFields) -> dict:
+    return dict(zip(('author',) + FIELDS, [author] + [str(value) for value in fields]))
+
+
+def _error(e: Exception) -> str:
+    if isinstance(e, KeyError):
+        return f'missing field {e.args[0]!r}'
+    return str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+
+
+@typechecked
+@dataclass(frozen=True)
+class RowResult:
+    row: int
+    status: str
+    ticket_id: Optional[int] = None
+    error: Optional[str] = None
+
+
+@typechecked
+class BulkReport:
+    STATUSES: Tuple[str, ...] = ()
+    SUCCESS = ''
+    ITEM = 'Row'
+
+    def __init__(self):
+        self.__results: List[RowResult] = []
+        self.__tickets: List[Ticket] = []
+
+    def add(self, result: RowResult, ticket: Optional[Ticket] = None) -> None:
+        self.__results.append(result)
+        if ticket is not None:
+            self.__tickets.append(ticket)
+
+    @property
+    def results(self) -> List[RowResult]:
+        return sorted(self.__results, key=lambda result: result.row)
+
+    @property
+    def tickets(self) -> List[Ticket]:
+        return list(self.__tickets)
+
+    def counts(self) -> Dict[str, int]:
+        res = dict.fromkeys(self.STATUSES, 0)
+        for result in self.__results:
+            res[result.status] += 1
+        return res
+
+    def is_complete(self) -> bool:
+        return all(result.status == self.SUCCESS for result in self.__results)
+
+    def render(self) -> str:
+        lines = [f'{self.ITEM} {result.row}: {result.status} - {result.error}' for result in self.results
+                 if result.status != self.SUCCESS]
+        summary = ', '.join(f'{count} {status}' for status, count in self.counts().items())
+        lines.append(f'{summary} ({len(self.__results)} {self.ITEM.lower()}s)')
+        return '\n'.join(lines)
+
+    def to_json(self) -> str:
+        return json.dumps({'counts': self.counts(), 'rows': [result.__dict__ for result in self.results]}, indent=2)
+
+
+class ImportReport(BulkReport):
+    STATUSES = (CREATED, INVALID, FAILED)
+    SUCCESS = CREATED
+
+
+class RemoveReport(BulkReport):
+    STATUSES = (REMOVED, FORBIDDEN, NOT_FOUND, FAILED)
+    SUCCESS = REMOVED
+    ITEM = 'Ticket'
+
+
+def parse_selection(text: str, maximum: int) -> List[int]:
+    res = set()
+    for part in text.split(','):
+        first, sep, last = part.partition('-')
+        first = int(first)
+        last = int(last) if sep else first
+        validate('first', first, min_value=1, max_value=maximum)
+        validate('last', last, min_value=first, max_value=maximum)
+        res.update(range(first, last + 1))
+    return sorted(res)
+
+
+def _post(transport: Transport, number: int, obj: dict) -> Tuple[RowResult, Optional[Ticket]]:
+    try:
+        res = transport.post('tickets/', json=obj)
+    except requests.RequestException as e:
+        return RowResult(number, FAILED, error=_error(e)), None
+    if res.status_code != 201:
+        return RowResult(number, FAILED, error=f'HTTP {res.status_code}: {res.text[:200]}'), None
+    try:
+        ticket = decode_ticket(res.json())
+    except (KeyError, TypeError, ValueError, ValidationError) as e:
+        return RowResult(number, CREATED, error=_error(e)), None
+    return RowResult(number, CREATED, ticket.id), ticket
+
+
+def import_tickets(transport: Transport, author: int, rows: Iterable[Tuple[int, dict]], concurrency: int = 8) \
+        -> ImportReport:
+    validate('concurrency', concurrency, min_value=1)
+    report = ImportReport()
+    pending: Set[Future] = set()
+
+    def collect(futures: Iterable[Future]) -> None:
+        for future in futures:
+            report.add(*future.result())
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='import') as executor:
+        for number, row in rows:
+            try:
+                fields = parse_row(row)
+            except (KeyError, TypeError, ValueError, ValidationError) as e:
+                report.add(RowResult(number, INVALID, error=_error(e)))
+                continue
+            pending.add(executor.submit(_post, transport, number, ticket_payload(author, fields)))
+            if len(pending) >= 2 * concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(pending)
+    return report
+
+
+def _delete(transport: Transport, number: int, ticket: Ticket) -> Tuple[RowResult, None]:
+    try:
+        res = transport.delete(f'tickets/{ticket.id}/')
+    except requests.RequestException as e:
+        return RowResult(number, FAILED, ticket.id, _error(e)), None
+    if res.status_code in (200, 204):
+        return RowResult(number, REMOVED, ticket.id), None
+    if res.status_code == 403:
+        return RowResult(number, FORBIDDEN, ticket.id, 'You are not authorized to delete this ticket'), None
+    if res.status_code == 404:
+        return RowResult(number, NOT_FOUND, ticket.id, 'The ticket was already removed'), None
+    return RowResult(number, FAILED, ticket.id, f'HTTP {res.status_code}'), None
+
+
+def delete_tickets(transport: Transport, selection: Iterable[Tuple[int, Ticket]], concurrency: int = 8) \
+        -> RemoveReport:
+    validate('concurrency', concurrency, min_value=1)
+    report = RemoveReport()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='remove') as executor:
+        for future in [executor.submit(_delete, transport, number, ticket) for number, ticket in selection]:
+            report.add(*future.result())
+    return report
@@ -0,0 +1,71 @@
+import os
+import sqlite3
+from dataclasses import dataclass
+from typing import Optional
+
+from typeguard import typechecked
+from valid8 import validate
+
+
+@typechecked
+@dataclass(frozen=True)
+class CachedTickets:
+    payload: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> dict:
+        res = {}
+        if self.etag is not None:
+            res['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            res['If-Modified-Since'] = self.last_modified
+        return res
+
+
+@typechecked
+class TicketCache:
+    def __init__(self, path: str):
+        validate('path', path, min_len=1)
+        self.__path = path
+        self.__connection: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def default_path() -> str:
+        root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(root, 'reservation-flights', 'tickets.sqlite3')
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def __connect(self) -> sqlite3.Connection:
+        if self.__connection is None:
+            if self.__path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.__path)), exist_ok=True)
+            self.__connection = sqlite3.connect(self.__path, check_same_thread=False)
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS tickets ('
+                                      'username TEXT PRIMARY KEY, payload BLOB NOT NULL, '
+                                      'etag TEXT, last_modified TEXT)')
+        return self.__connection
+
+    def load(self, username: str) -> Optional[CachedTickets]:
+        row = self.__connect().execute('SELECT payload, etag, last_modified FROM tickets WHERE username = ?',
+                                       (username,)).fetchone()
+        if row is None:
+            return None
+        return CachedTickets(bytes(row[0]), row[1], row[2])
+
+    def store(self, username: str, entry: CachedTickets) -> None:
+        with self.__connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO tickets (username, payload, etag, last_modified) '
+                               'VALUES (?, ?, ?, ?)', (username, entry.payload, entry.etag, entry.last_modified))
+
+    def remove(self, username: str) -> None:
+        with self.__connect() as connection:
+            connection.execute('DELETE FROM tickets WHERE username = ?', (username,))
+
+    def close(self) -> None:
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
@@ -0,0 +1,378 @@
+import bisect
+import dataclasses
+import datetime
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple, Union
+
+from typeguard import typechecked
+from valid8 import validate
+
+from air_company.domain import AirCompany, Ticket, trusted, microseconds, from_microseconds, seconds, from_seconds, \
+    Author, Name, Surname, Departure, Destination, Price, DepartureDateTime, TimeFlight, INSERTION_ORDER, PRICE_ORDER, \
+    DEPARTURE_DATE_ORDER
+
+_TICKET_FIELDS = tuple(field.name for field in dataclasses.fields(Ticket))
+_COMPACT_MIN_ROWS = 1024
+
+
+def _values(ticket: Ticket) -> Tuple[Any, ...]:
+    return tuple(getattr(ticket, name) for name in _TICKET_FIELDS)
+
+
+class _Strings:
+    __slots__ = ('values', 'codes', 'terms')
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.terms: List[Tuple[str, ...]] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+            lower = value.lower()
+            self.terms.append(tuple({lower, *lower.split()}))
+        return code
+
+
+class _Columns:
+    __slots__ = ('strings', 'ids', 'authors', 'names', 'surnames', 'departures', 'destinations', 'prices',
+                 'departure_times', 'flights', 'seqs')
+
+    def __init__(self, strings: _Strings):
+        self.strings = strings
+        self.ids = array('q')
+        self.authors = array('q')
+        self.names = array('I')
+        self.surnames = array('I')
+        self.departures = array('I')
+        self.destinations = array('I')
+        self.prices = array('q')
+        self.departure_times = array('q')
+        self.flights = array('i')
+        self.seqs = array('q')
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def key(self, order: str, row: int) -> int:
+        if order == PRICE_ORDER:
+            return -self.prices[row]
+        if order == DEPARTURE_DATE_ORDER:
+            return -self.departure_times[row]
+        return 0
+
+    def sort_key(self, order: str) -> Callable[[int], Any]:
+        seqs = self.seqs
+        if order == PRICE_ORDER:
+            prices = self.prices
+            return lambda row: (-prices[row], seqs[row])
+        if order == DEPARTURE_DATE_ORDER:
+            departure_times = self.departure_times
+            return lambda row: (-departure_times[row], seqs[row])
+        return seqs.__getitem__
+
+    def terms(self, row: int) -> Set[str]:
+        terms = self.strings.terms
+        return {*terms[self.names[row]], *terms[self.surnames[row]], *terms[self.departures[row]],
+                *terms[self.destinations[row]]}
+
+    def append(self, seq: int, ticket: Ticket) -> int:
+        code = self.strings.code
+        self.ids.append(ticket.id)
+        self.authors.append(ticket.author.value)
+        self.names.append(code(ticket.name.value))
+        self.surnames.append(code(ticket.surname.value))
+        self.departures.append(code(ticket.departure.value))
+        self.destinations.append(code(ticket.destination.value))
+        self.prices.append(ticket.price.value_in_cents)
+        self.departure_times.append(microseconds(ticket.departureDateTime.value))
+        self.flights.append(seconds(ticket.timeFlight.value))
+        self.seqs.append(seq)
+        return len(self.ids) - 1
+
+
+class _Postings:
+    __slots__ = ('rows', 'terms')
+
+    def __init__(self):
+        self.rows: Dict[str, array] = {}
+        self.terms: List[str] = []
+
+    def add(self, columns: _Columns, first: int, last: int) -> None:
+        postings = self.rows
+        new_terms = []
+        for row in range(first, last):
+            for term in columns.terms(row):
+                rows = postings.get(term)
+                if rows is None:
+                    rows = postings[term] = array('I')
+                    new_terms.append(term)
+                rows.append(row)
+        if new_terms:
+            self.terms.extend(new_terms)
+            self.terms.sort()
+
+    def matching(self, query: str, prefix: bool) -> Set[int]:
+        if not prefix:
+            return set(self.rows.get(query, ()))
+        res: Set[int] = set()
+        index = bisect.bisect_left(self.terms, query)
+        while index < len(self.terms) and self.terms[index].startswith(query):
+            res.update(self.rows[self.terms[index]])
+            index += 1
+        return res
+
+
+class TicketView(Ticket):
+    __slots__ = ('_columns', '_row')
+
+    def __init__(self, columns: _Columns, row: int):
+        object.__setattr__(self, '_columns', columns)
+        object.__setattr__(self, '_row', row)
+
+    @property
+    def location(self) -> Tuple[_Columns, int]:
+        return self._columns, self._row
+
+    @property
+    def id(self) -> int:
+        return self._columns.ids[self._row]
+
+    @property
+    def author(self) -> Author:
+        return trusted(Author, value=self._columns.authors[self._row])
+
+    @property
+    def name(self) -> Name:
+        return trusted(Name, value=self._columns.strings.values[self._columns.names[self._row]])
+
+    @property
+    def surname(self) -> Surname:
+        return trusted(Surname, value=self._columns.strings.values[self._columns.surnames[self._row]])
+
+    @property
+    def departure(self) -> Departure:
+        return trusted(Departure, value=self._columns.strings.values[self._columns.departures[self._row]])
+
+    @property
+    def destination(self) -> Destination:
+        return trusted(Destination, value=self._columns.strings.values[self._columns.destinations[self._row]])
+
+    @property
+    def price(self) -> Price:
+        return trusted(Price, value_in_cents=self._columns.prices[self._row])
+
+    @property
+    def departureDateTime(self) -> DepartureDateTime:
+        return trusted(DepartureDateTime, value=from_microseconds(self._columns.departure_times[self._row]))
+
+    @property
+    def timeFlight(self) -> TimeFlight:
+        return trusted(TimeFlight, value=from_seconds(self._columns.flights[self._row]))
+
+    def materialize(self) -> Ticket:
+        return Ticket(*_values(self))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Ticket):
+            return NotImplemented
+        return _values(self) == _values(other)
+
+    def __hash__(self) -> int:
+        return hash(_values(self))
+
+
+@typechecked
+class ColumnarAirCompany:
+    def __init__(self):
+        self.__strings = _Strings()
+        self.__order = INSERTION_ORDER
+        self.clear()
+
+    def clear(self) -> None:
+        self.__columns = _Columns(self.__strings)
+        self.__by_id: Dict[int, int] = {}
+        self.__views: Dict[str, Tuple[array, array]] = {order: (array('q'), array('I'))
+                                                        for order in (INSERTION_ORDER, PRICE_ORDER, DEPARTURE_DATE_ORDER)}
+        self.__postings = _Postings()
+        self.__next_seq = 0
+
+    def tickets(self) -> int:
+        return len(self.__by_id)
+
+    def ticket(self, index: int) -> TicketView:
+        validate('index', index, min_value=0, max_value=self.tickets() - 1)
+        return TicketView(self.__columns, self.__views[self.__order][1][index])
+
+    def page(self, first: int, count: int) -> List[TicketView]:
+        columns = self.__columns
+        return [TicketView(columns, row) for row in self.__views[self.__order][1][first:first + count]]
+
+    def iter_tickets(self) -> Iterator[TicketView]:
+        columns = self.__columns
+        return (TicketView(columns, row) for row in self.__views[self.__order][1])
+
+    def add_ticket(self, ticket: Ticket) -> None:
+        if ticket.id in self.__by_id:
+            validate('ticket.id', ticket.id, custom=lambda v: v not in self.__by_id)
+        self.__insert(self.__append(self.__next_seq, ticket))
+        self.__next_seq += 1
+
+    def add_tickets(self, tickets: Iterable[Ticket]) -> None:
+        tickets = list(tickets)
+        if not tickets:
+            return
+        ids = {ticket.id for ticket in tickets}
+        if len(ids) != len(tickets) or not ids.isdisjoint(self.__by_id):
+            validate('tickets', tickets, custom=lambda v: len({t.id for t in v}) == len(v) and
+                     all(t.id not in self.__by_id for t in v))
+        columns, by_id = self.__columns, self.__by_id
+        first = len(columns)
+        for seq, ticket in enumerate(tickets, start=self.__next_seq):
+            by_id[ticket.id] = columns.append(seq, ticket)
+        self.__next_seq += len(tickets)
+        self.__postings.add(columns, first, len(columns))
+        for order, (keys, rows) in self.__views.items():
+            merged = list(rows)
+            merged.extend(range(first, len(columns)))
+            merged.sort(key=columns.sort_key(order))
+            self.__views[order] = array('q', (columns.key(order, row) for row in merged)), array('I', merged)
+
+    def remove_ticket(self, index: int) -> None:
+        validate('index', index, min_value=0, max_value=self.tickets() - 1)
+        self.__remove(self.__views[self.__order][1][index])
+
+    def has_id(self, id: int) -> bool:
+        return id in self.__by_id
+
+    def get_by_id(self, id: int) -> TicketView:
+        return TicketView(self.__columns, self.__find(id))
+
+    def replace_by_id(self, ticket: Ticket) -> None:
+        row = self.__find(ticket.id)
+        seq = self.__columns.seqs[row]
+        self.__remove(row)
+        self.__insert(self.__append(seq, ticket))
+
+    def remove_by_id(self, id: int) -> None:
+        self.__remove(self.__find(id))
+
+    def remove_by_ids(self, ids: Iterable[int]) -> None:
+        removed = {self.__find(id) for id in ids}
+        if not removed:
+            return
+        for order, (keys, rows) in self.__views.items():
+            kept = [(key, row) for key, row in zip(keys, rows) if row not in removed]
+            self.__views[order] = array('q', (key for key, _ in kept)), array('I', (row for _, row in kept))
+        ids_column = self.__columns.ids
+        for row in removed:
+            del self.__by_id[ids_column[row]]
+        self.__compact_if_sparse()
+
+    def __find(self, id: int) -> int:
+        if id not in self.__by_id:
+            validate('id', id, custom=lambda v: v in self.__by_id)
+        return self.__by_id[id]
+
+    def __append(self, seq: int, ticket: Ticket) -> int:
+        columns = self.__columns
+        row = self.__by_id[ticket.id] = columns.append(seq, ticket)
+        self.__postings.add(columns, row, row + 1)
+        return row
+
+    def __position(self, keys: array, rows: array, key: int, seq: int) -> int:
+        lo = bisect.bisect_left(keys, key)
+        hi = bisect.bisect_right(keys, key, lo)
+        seqs = self.__columns.seqs
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if seqs[rows[mid]] < seq:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __insert(self, row: int) -> None:
+        columns = self.__columns
+        seq = columns.seqs[row]
+        for order, (keys, rows) in self.__views.items():
+            key = columns.key(order, row)
+            index = self.__position(keys, rows, key, seq)
+            keys.insert(index, key)
+            rows.insert(index, row)
+
+    def __remove(self, row: int) -> None:
+        columns = self.__columns
+        seq = columns.seqs[row]
+        for order, (keys, rows) in self.__views.items():
+            index = self.__position(keys, rows, columns.key(order, row), seq)
+            del keys[index]
+            del rows[index]
+        del self.__by_id[columns.ids[row]]
+        self.__compact_if_sparse()
+
+    def __compact_if_sparse(self) -> None:
+        old = self.__columns
+        if len(old) < _COMPACT_MIN_ROWS or len(old) < 2 * len(self.__by_id):
+            return
+        live = self.__views[INSERTION_ORDER][1]
+        new = _Columns(self.__strings)
+        for name in _Columns.__slots__[1:]:
+            column = getattr(old, name)
+            setattr(new, name, array(column.typecode, map(column.__getitem__, live)))
+        remap = array('I', bytes(4 * len(old)))
+        for index, row in enumerate(live):
+            remap[row] = index
+        self.__columns = new
+        self.__views = {order: (keys, array('I', (remap[row] for row in rows)))
+                        for order, (keys, rows) in self.__views.items()}
+        self.__by_id = {id: row for row, id in enumerate(new.ids)}
+        self.__postings = _Postings()
+        self.__postings.add(new, 0, len(new))
+
+    def tickets_in_price_range(self, min_price: Price, max_price: Price) -> List[TicketView]:
+        validate('max_price', max_price, min_value=min_price)
+        return self.__range(PRICE_ORDER, -max_price.value_in_cents, -min_price.value_in_cents)
+
+    def tickets_departing_between(self, start: datetime.datetime, end: datetime.datetime) -> List[TicketView]:
+        validate('end', end, min_value=start)
+        return self.__range(DEPARTURE_DATE_ORDER, -microseconds(end), -microseconds(start))
+
+    def __range(self, order: str, low_key: int, high_key: int) -> List[TicketView]:
+        keys, rows = self.__views[order]
+        begin = bisect.bisect_left(keys, low_key)
+        end = bisect.bisect_right(keys, high_key, lo=begin)
+        columns = self.__columns
+        return [TicketView(columns, row) for row in rows[begin:end]]
+
+    def search(self, query: str, prefix: bool = True) -> List[TicketView]:
+        query = ' '.join(query.lower().split())
+        validate('query', query, min_len=1)
+        columns, by_id = self.__columns, self.__by_id
+        rows = [row for row in self.__postings.matching(query, prefix) if by_id.get(columns.ids[row]) == row]
+        rows.sort(key=columns.sort_key(self.__order))
+        return [TicketView(columns, row) for row in rows]
+
+    @property
+    def order(self) -> str:
+        return self.__order
+
+    def sort_by_departure_date(self) -> None:
+        self.__order = DEPARTURE_DATE_ORDER
+
+    def sort_by_price(self) -> None:
+        self.__order = PRICE_ORDER
+
+    def swap(self, other: 'ColumnarAirCompany') -> None:
+        self.__strings, other.__strings = other.__strings, self.__strings
+        self.__columns, other.__columns = other.__columns, self.__columns
+        self.__by_id, other.__by_id = other.__by_id, self.__by_id
+        self.__views, other.__views = other.__views, self.__views
+        self.__postings, other.__postings = other.__postings, self.__postings
+        self.__next_seq, other.__next_seq = other.__next_seq, self.__next_seq
+
+
+TicketStore = Union[AirCompany, ColumnarAirCompany]
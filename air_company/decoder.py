@@ -0,0 +1,153 @@
+import datetime
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, List, Union, Iterable
+
+from typeguard import typechecked, typeguard_ignore
+from valid8 import validate
+
+from air_company.domain import Ticket, TicketRecord, Primitives, microseconds, seconds, capitalized_words_rule, \
+    Author, Name, Surname, Departure, Destination, Price, DepartureDateTime, TimeFlight
+from validation.engine import Rule, compile_argument_checks
+
+DEPARTURE_DATE_TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+TIME_FLIGHT_FORMAT = '%H:%M:%S'
+INTERNED_VALUES = 4096
+
+
+@typechecked
+class Interner:
+    def __init__(self, factory: Callable[[Any], Any], max_size: int = INTERNED_VALUES):
+        validate('max_size', max_size, min_value=1)
+        self.__factory = factory
+        self.__max_size = max_size
+        self.__values: 'OrderedDict[Any, Any]' = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @typeguard_ignore
+    def __call__(self, value: Any) -> Any:
+        with self.__lock:
+            res = self.__values.get(value)
+            if res is not None:
+                self.__values.move_to_end(value)
+                self.hits += 1
+                return res
+        res = self.__factory(value)
+        with self.__lock:
+            self.misses += 1
+            self.__values[value] = res
+            if len(self.__values) > self.__max_size:
+                self.__values.popitem(last=False)
+        return res
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__values.clear()
+            self.hits = self.misses = 0
+
+
+intern_name = Interner(Name)
+intern_surname = Interner(Surname)
+intern_departure = Interner(Departure)
+intern_destination = Interner(Destination)
+
+
+def _is_digits(value: str) -> bool:
+    return value.isascii() and value.isdigit()
+
+
+def parse_departure_date_time(value: str) -> datetime.datetime:
+    if len(value) == 20 and value[4] == '-' and value[7] == '-' and value[10] == 'T' and value[13] == ':' \
+            and value[16] == ':' and value[19] == 'Z' \
+            and _is_digits(value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16] + value[17:19]):
+        try:
+            return datetime.datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                                     int(value[11:13]), int(value[14:16]), int(value[17:19]))
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(value, DEPARTURE_DATE_TIME_FORMAT)
+
+
+def parse_time_flight(value: str) -> datetime.time:
+    if len(value) == 8 and value[2] == ':' and value[5] == ':' \
+            and _is_digits(value[0:2] + value[3:5] + value[6:8]):
+        try:
+            return datetime.time(int(value[0:2]), int(value[3:5]), int(value[6:8]))
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(value, TIME_FLIGHT_FORMAT).time()
+
+
+def parse_price(value: str) -> Price:
+    euro, sep, cents = value.partition('.')
+    if 0 < len(euro) <= 11 and _is_digits(euro) and (not sep or (len(cents) == 2 and _is_digits(cents))):
+        return Price.create(int(euro), int(cents) if sep else 0)
+    return Price.parse(value)
+
+
+def _price_in_cents(value: str) -> int:
+    euro, sep, cents = value.partition('.')
+    if 0 < len(euro) <= 11 and _is_digits(euro) and (not sep or (len(cents) == 2 and _is_digits(cents))):
+        return int(euro) * 100 + (int(cents) if sep else 0)
+    return Price.parse(value).value_in_cents
+
+
+_check_record = compile_argument_checks(author=Rule(instance_of=int), name=capitalized_words_rule,
+                                        surname=capitalized_words_rule, departure=capitalized_words_rule,
+                                        destination=capitalized_words_rule,
+                                        departure_date_time=Rule(min_value=datetime.datetime.now),
+                                        time_flight=Rule(min_value=datetime.time(0, 30)))
+
+
+class RawTicket(TicketRecord):
+    __slots__ = ('item',)
+
+    def __init__(self, item: dict):
+        texts = (item['name'], item['surname'], item['departure'], item['destination'])
+        if not all(type(text) is str for text in texts):
+            raise TypeError(f'ticket {item.get("id")!r} has non-string text fields')
+        departure_date_time = parse_departure_date_time(item['departureDateTime'])
+        _check_record(item['author'], *texts, departure_date_time, parse_time_flight(item['timeFlight']))
+        super().__init__(int(item['id']), _price_in_cents(item['price']), microseconds(departure_date_time), texts)
+        self.item = item
+
+    def materialize(self) -> Ticket:
+        return decode_ticket(self.item)
+
+    def primitives(self) -> Primitives:
+        return (self.id, int(self.item['author']), *self.texts, self.price_in_cents, self.departure_in_microseconds,
+                seconds(parse_time_flight(self.item['timeFlight'])))
+
+
+def decode_ticket(item: dict) -> Ticket:
+    return Ticket(int(item['id']),
+                  Author(item['author']),
+                  intern_name(item['name']),
+                  intern_surname(item['surname']),
+                  intern_departure(item['departure']),
+                  intern_destination(item['destination']),
+                  parse_price(item['price']),
+                  DepartureDateTime(parse_departure_date_time(item['departureDateTime'])),
+                  TimeFlight(parse_time_flight(item['timeFlight'])))
+
+
+def decode_tickets(items: Iterable[dict]) -> List[Ticket]:
+    return [decode_ticket(item) for item in items]
+
+
+def decode_records(items: Iterable[dict]) -> List[RawTicket]:
+    return [RawTicket(item) for item in items]
+
+
+def decode_payload(payload: Union[str, bytes]) -> List[Ticket]:
+    return decode_tickets(json.loads(payload))
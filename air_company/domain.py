@@ -1,14 +1,19 @@
+import abc
+import bisect
 import re
 from dataclasses import dataclass, InitVar, field
 import datetime
-from typing import Any, List
+from typing import Any, Callable, List, Dict, Optional, Tuple, Set, Iterable, Iterator, Union
 
-from typeguard import typechecked
-from valid8 import validate
+from typeguard import typechecked, typeguard_ignore
+from valid8 import validate, ValidationError
 
-from validation.dataclasses import validate_dataclass
+from validation.engine import Rule, compile_checks, compile_argument_checks
 from validation.regex import pattern
 
+capitalized_words = pattern(r'^[A-Z][a-z]*(?:\s[A-Z][a-z]*)*$')
+capitalized_words_rule = Rule(min_len=1, max_len=50, custom=capitalized_words)
+
 
 @typechecked
 @dataclass(frozen=True, order=True)
@@ -16,87 +21,97 @@ class Author:
     value: int
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('value', self.value)
+        _check_author(self)
 
     def __str__(self):
         return str(self.value)
 
 
+_check_author = compile_checks(Author, value=Rule())
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class Name:
     value: str
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('value', self.value, min_len=1, max_len=50, custom=pattern(r'^[A-Z][a-z]*(?:\s[A-Z][a-z]*)*$'))
+        _check_name(self)
 
     def __str__(self) -> str:
         return self.value
 
 
+_check_name = compile_checks(Name, value=capitalized_words_rule)
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class Surname:
     value: str
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('value', self.value, min_len=1, max_len=50, custom=pattern(r'^[A-Z][a-z]*(?:\s[A-Z][a-z]*)*$'))
+        _check_surname(self)
 
     def __str__(self) -> str:
         return self.value
 
 
+_check_surname = compile_checks(Surname, value=capitalized_words_rule)
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class Departure:
     value: str
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('value', self.value, min_len=1, max_len=50, custom=pattern(r'^[A-Z][a-z]*(?:\s[A-Z][a-z]*)*$'))
+        _check_departure(self)
 
     def __str__(self) -> str:
         return self.value
 
 
+_check_departure = compile_checks(Departure, value=capitalized_words_rule)
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class Destination:
     value: str
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('value', self.value, min_len=1, max_len=50, custom=pattern(r'^[A-Z][a-z]*(?:\s[A-Z][a-z]*)*$'))
+        _check_destination(self)
 
     def __str__(self) -> str:
         return self.value
 
 
+_check_destination = compile_checks(Destination, value=capitalized_words_rule)
+
+
+_price_create_key = object()
+_price_max_value = 100000000000 - 1
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class Price:
     value_in_cents: int
     create_key: InitVar[Any] = field(default=None)
-    __create_key = object()
-    __max_value = 100000000000 - 1
     __parse_pattern = re.compile(r'(?P<euro>\d{0,11})(?:\.(?P<cents>\d{2}))?')
 
     def __post_init__(self, create_key):
-        validate('create_key', create_key, equals=self.__create_key)
-        validate_dataclass(self)
-        validate('value_in_cents', self.value_in_cents, min_value=0, max_value=self.__max_value)
+        _check_price(self, create_key)
 
     def __str__(self) -> str:
         return f'{self.value_in_cents // 100}.{self.value_in_cents % 100:02}'
 
     @staticmethod
-    def create(euro: int, cents: int = 0) -> 'Price':
-        validate('euro', euro, min_value=0, max_value=Price.__max_value // 100)
-        validate('cents', cents, min_value=0, max_value=99)
-        return Price(euro * 100 + cents, Price.__create_key)
+    @typeguard_ignore
+    def create(euro, cents=0):
+        _check_price_create(euro, cents)
+        return Price(euro * 100 + cents, _price_create_key)
 
     @staticmethod
     def parse(value: str) -> 'Price':
@@ -115,32 +130,42 @@ class Price:
         return self.value_in_cents // 100
 
 
+_check_price = compile_checks(Price, initvars={'create_key': Rule(equals=_price_create_key)},
+                              value_in_cents=Rule(min_value=0, max_value=_price_max_value))
+_check_price_create = compile_argument_checks(euro=Rule(min_value=0, max_value=_price_max_value // 100, instance_of=int),
+                                              cents=Rule(min_value=0, max_value=99, instance_of=int))
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class DepartureDateTime:
     value: datetime.datetime
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('value', self.value, min_value=datetime.datetime.now())
+        _check_departure_date_time(self)
 
     def __str__(self) -> str:
         return str(self.value)
 
 
+_check_departure_date_time = compile_checks(DepartureDateTime, value=Rule(min_value=datetime.datetime.now))
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class TimeFlight:
     value: datetime.time
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('value', self.value, min_value=datetime.time(0, 30))
+        _check_time_flight(self)
 
     def __str__(self) -> str:
         return str(self.value)
 
 
+_check_time_flight = compile_checks(TimeFlight, value=Rule(min_value=datetime.time(0, 30)))
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class Ticket:
@@ -155,7 +180,7 @@ class Ticket:
     timeFlight: TimeFlight
 
     def __post_init__(self):
-        validate_dataclass(self)
+        _check_ticket(self)
 
     def __str__(self):
         return str('name\t surname\t departure\t destination\t price\t departureDateTime\t timeFlight\n' +
@@ -163,30 +188,363 @@ class Ticket:
                    '\t' + str(self.price) + '\t' + str(self.departureDateTime) + '\t' + str(self.timeFlight) + '\n')
 
 
+_check_ticket = compile_checks(Ticket)
+
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+INSERTION_ORDER = 'insertion'
+PRICE_ORDER = 'price'
+DEPARTURE_DATE_ORDER = 'departure_date'
+
+
+Primitives = Tuple[int, int, str, str, str, str, int, int, int]
+
+
+def microseconds(value: datetime.datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_microseconds(value: int) -> datetime.datetime:
+    return _EPOCH + value * _MICROSECOND
+
+
+def seconds(value: datetime.time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def from_seconds(value: int) -> datetime.time:
+    return datetime.time(value // 3600, value // 60 % 60, value % 60)
+
+
+def trusted(cls: type, **values: Any) -> Any:
+    res = object.__new__(cls)
+    for name, value in values.items():
+        object.__setattr__(res, name, value)
+    return res
+
+
+def primitives(ticket: Ticket) -> Primitives:
+    return (ticket.id, ticket.author.value, ticket.name.value, ticket.surname.value, ticket.departure.value,
+            ticket.destination.value, ticket.price.value_in_cents, microseconds(ticket.departureDateTime.value),
+            seconds(ticket.timeFlight.value))
+
+
+class TicketRecord(abc.ABC):
+    __slots__ = ('id', 'price_in_cents', 'departure_in_microseconds', 'texts')
+
+    def __init__(self, id: int, price_in_cents: int, departure_in_microseconds: int,
+                 texts: Tuple[str, str, str, str]):
+        self.id = id
+        self.price_in_cents = price_in_cents
+        self.departure_in_microseconds = departure_in_microseconds
+        self.texts = texts
+
+    @abc.abstractmethod
+    def materialize(self) -> Ticket:
+        pass
+
+    @abc.abstractmethod
+    def primitives(self) -> Primitives:
+        pass
+
+
+_order_keys = {
+    INSERTION_ORDER: lambda ticket: 0,
+    PRICE_ORDER: lambda ticket: -ticket.price.value_in_cents,
+    DEPARTURE_DATE_ORDER: lambda ticket: -microseconds(ticket.departureDateTime.value),
+}
+
+_record_order_keys = {
+    INSERTION_ORDER: lambda record: 0,
+    PRICE_ORDER: lambda record: -record.price_in_cents,
+    DEPARTURE_DATE_ORDER: lambda record: -record.departure_in_microseconds,
+}
+
+
+_INVALID = (KeyError, TypeError, ValueError, ValidationError)
+
+
+def _ticket(item: Union[Ticket, TicketRecord], seq: int,
+            drop: Callable[[int, TicketRecord], None]) -> Optional[Ticket]:
+    if not isinstance(item, TicketRecord):
+        return item
+    try:
+        return item.materialize()
+    except _INVALID:
+        drop(seq, item)
+        return None
+
+
+def _order_key(order: str, item: Union[Ticket, TicketRecord]) -> int:
+    return (_record_order_keys if isinstance(item, TicketRecord) else _order_keys)[order](item)
+
+
+def _texts(item: Union[Ticket, TicketRecord]) -> Tuple[str, str, str, str]:
+    return item.texts if isinstance(item, TicketRecord) else \
+        (item.name.value, item.surname.value, item.departure.value, item.destination.value)
+
+
+def _text_terms(value: str) -> Set[str]:
+    value = value.lower()
+    res = set(value.split())
+    res.add(value)
+    return res
+
+
+def _search_terms(item: Union[Ticket, TicketRecord]) -> Set[str]:
+    res = set()
+    for value in _texts(item):
+        res.update(_text_terms(value))
+    return res
+
+
 @typechecked
-@dataclass(frozen=True)
+@dataclass
 class AirCompany:
-    __tickets: List[Ticket] = field(default_factory=list, init=False)
+    __views: Dict[str, List[Tuple[int, int, Ticket]]] = field(
+        default_factory=lambda: {order: [] for order in _order_keys}, init=False, repr=False)
+    __by_id: Dict[int, Tuple[int, Ticket]] = field(default_factory=dict, init=False, repr=False)
+    __by_term: Dict[str, Set[int]] = field(default_factory=dict, init=False, repr=False)
+    __terms: List[str] = field(default_factory=list, init=False, repr=False)
+    __order: str = field(default=INSERTION_ORDER, init=False)
+    __next_seq: int = field(default=0, init=False, repr=False)
+    __snapshots: List[Any] = field(default_factory=list, init=False, repr=False)
+    on_drop: Optional[Callable[[int], None]] = field(default=None, repr=False, compare=False)
 
     def clear(self):
-        self.__tickets.clear()
+        for view in self.__views.values():
+            view.clear()
+        self.__by_id.clear()
+        self.__by_term.clear()
+        self.__terms.clear()
+        for snapshot in self.__snapshots:
+            snapshot.close()
+        self.__snapshots.clear()
+
+    def swap(self, other: 'AirCompany') -> None:
+        self.__views, other.__views = other.__views, self.__views
+        self.__by_id, other.__by_id = other.__by_id, self.__by_id
+        self.__by_term, other.__by_term = other.__by_term, self.__by_term
+        self.__terms, other.__terms = other.__terms, self.__terms
+        self.__next_seq, other.__next_seq = other.__next_seq, self.__next_seq
+        self.__snapshots, other.__snapshots = other.__snapshots, self.__snapshots
 
     def tickets(self) -> int:
-        return len(self.__tickets)
+        return len(self.__views[INSERTION_ORDER])
 
     def ticket(self, index: int):
-        validate('index', index, min_value=0, max_value=self.tickets() - 1)
-        return self.__tickets[index]
+        while True:
+            validate('index', index, min_value=0, max_value=self.tickets() - 1)
+            _, seq, item = self.__views[self.__order][index]
+            if not isinstance(item, TicketRecord):
+                return item
+            ticket = self.__materialize(seq, item)
+            if ticket is not None:
+                return ticket
+
+    def page(self, first: int, count: int) -> List[Ticket]:
+        view, index, res = self.__views[self.__order], first, []
+        while len(res) < count and index < len(view):
+            _, seq, item = view[index]
+            ticket = self.__materialize(seq, item) if isinstance(item, TicketRecord) else item
+            if ticket is not None:
+                res.append(ticket)
+                index += 1
+        return res
+
+    def iter_tickets(self) -> Iterator[Ticket]:
+        drop = self.__drop
+        return (ticket for ticket in (_ticket(item, seq, drop) for _, seq, item in list(self.__views[self.__order]))
+                if ticket is not None)
+
+    def save(self, path: str) -> int:
+        from air_company.snapshot import write_snapshot
+        return write_snapshot((item.primitives() if isinstance(item, TicketRecord) else primitives(item)
+                               for _, _, item in self.__views[INSERTION_ORDER]), self.__order, path)
+
+    @staticmethod
+    def load(path: str) -> 'AirCompany':
+        from air_company.snapshot import read_snapshot
+        snapshot = read_snapshot(path)
+        res = AirCompany()
+        try:
+            res.add_records(snapshot.records())
+        except BaseException:
+            snapshot.close()
+            raise
+        res.__snapshots.append(snapshot)
+        res.__order = snapshot.order
+        return res
+
+    def is_materialized(self, id: int) -> bool:
+        return not isinstance(self.__find(id)[1], TicketRecord)
 
     def add_ticket(self, ticket: Ticket) -> None:
-        self.__tickets.append(ticket)
+        if ticket.id in self.__by_id:
+            validate('ticket.id', ticket.id, custom=lambda v: v not in self.__by_id)
+        self.__insert(self.__next_seq, ticket)
+        self.__next_seq += 1
+
+    def add_tickets(self, tickets: Iterable[Ticket]) -> None:
+        self.__add_all(list(tickets), _order_keys)
+
+    def add_records(self, records: Iterable[TicketRecord]) -> None:
+        self.__add_all(list(records), _record_order_keys)
+
+    def __add_all(self, items: List[Any], keys: Dict[str, Any]) -> None:
+        ids = {item.id for item in items}
+        if len(ids) != len(items) or not ids.isdisjoint(self.__by_id):
+            validate('items', items, custom=lambda v: len({t.id for t in v}) == len(v) and
+                     all(t.id not in self.__by_id for t in v))
+        for order, view in self.__views.items():
+            key = keys[order]
+            view.extend((key(item), seq, item) for seq, item in enumerate(items, start=self.__next_seq))
+            view.sort()
+        new_terms = []
+        text_terms: Dict[str, List[Set[int]]] = {}
+        for seq, item in enumerate(items, start=self.__next_seq):
+            self.__by_id[item.id] = seq, item
+            for value in _texts(item):
+                postings = text_terms.get(value)
+                if postings is None:
+                    postings = text_terms[value] = []
+                    for term in _text_terms(value):
+                        ids = self.__by_term.get(term)
+                        if ids is None:
+                            ids = self.__by_term[term] = set()
+                            new_terms.append(term)
+                        postings.append(ids)
+                for ids in postings:
+                    ids.add(item.id)
+        if new_terms:
+            self.__terms.extend(new_terms)
+            self.__terms.sort()
+        self.__next_seq += len(items)
 
     def remove_ticket(self, index: int) -> None:
         validate('index', index, min_value=0, max_value=self.tickets() - 1)
-        del self.__tickets[index]
+        _, seq, ticket = self.__views[self.__order][index]
+        self.__remove(seq, ticket)
+
+    def has_id(self, id: int) -> bool:
+        return id in self.__by_id
+
+    def get_by_id(self, id: int) -> Ticket:
+        seq, item = self.__find(id)
+        if not isinstance(item, TicketRecord):
+            return item
+        ticket = self.__materialize(seq, item)
+        return ticket if ticket is not None else self.get_by_id(id)
+
+    def replace_by_id(self, ticket: Ticket) -> None:
+        seq, old = self.__find(ticket.id)
+        self.__remove(seq, old)
+        self.__insert(seq, ticket)
+
+    def remove_by_id(self, id: int) -> None:
+        self.__remove(*self.__find(id))
+
+    def remove_by_ids(self, ids: Iterable[int]) -> None:
+        removed = {id: self.__find(id)[1] for id in ids}
+        if not removed:
+            return
+        for view in self.__views.values():
+            view[:] = [entry for entry in view if entry[2].id not in removed]
+        for id, ticket in removed.items():
+            del self.__by_id[id]
+            for term in _search_terms(ticket):
+                ids_by_term = self.__by_term[term]
+                ids_by_term.discard(id)
+                if not ids_by_term:
+                    del self.__by_term[term]
+        self.__terms[:] = [term for term in self.__terms if term in self.__by_term]
+
+    def __find(self, id: int) -> Tuple[int, Union[Ticket, TicketRecord]]:
+        if id not in self.__by_id:
+            validate('id', id, custom=lambda v: v in self.__by_id)
+        return self.__by_id[id]
+
+    def __materialize(self, seq: int, record: TicketRecord) -> Optional[Ticket]:
+        try:
+            ticket = record.materialize()
+        except _INVALID:
+            self.__drop(seq, record)
+            return None
+        if ticket.id != record.id:
+            validate('ticket.id', ticket.id, equals=record.id)
+        for order, view in self.__views.items():
+            index = bisect.bisect_left(view, (_order_key(order, record), seq))
+            view[index] = view[index][0], seq, ticket
+        self.__by_id[record.id] = seq, ticket
+        return ticket
+
+    def __drop(self, seq: int, record: TicketRecord) -> None:
+        self.__remove(seq, record)
+        if self.on_drop is not None:
+            self.on_drop(record.id)
+
+    def __insert(self, seq: int, ticket: Ticket) -> None:
+        for order, view in self.__views.items():
+            bisect.insort(view, (_order_keys[order](ticket), seq, ticket))
+        self.__by_id[ticket.id] = seq, ticket
+        for term in _search_terms(ticket):
+            ids = self.__by_term.get(term)
+            if ids is None:
+                ids = self.__by_term[term] = set()
+                bisect.insort(self.__terms, term)
+            ids.add(ticket.id)
+
+    def __remove(self, seq: int, ticket: Union[Ticket, TicketRecord]) -> None:
+        for order, view in self.__views.items():
+            del view[bisect.bisect_left(view, (_order_key(order, ticket), seq))]
+        del self.__by_id[ticket.id]
+        for term in _search_terms(ticket):
+            ids = self.__by_term[term]
+            ids.discard(ticket.id)
+            if not ids:
+                del self.__by_term[term]
+                del self.__terms[bisect.bisect_left(self.__terms, term)]
+
+    def tickets_in_price_range(self, min_price: Price, max_price: Price) -> List[Ticket]:
+        validate('max_price', max_price, min_value=min_price)
+        return self.__range(PRICE_ORDER, -max_price.value_in_cents, -min_price.value_in_cents)
+
+    def tickets_departing_between(self, start: datetime.datetime, end: datetime.datetime) -> List[Ticket]:
+        validate('end', end, min_value=start)
+        return self.__range(DEPARTURE_DATE_ORDER, -microseconds(end), -microseconds(start))
+
+    def __range(self, order: str, low_key: int, high_key: int) -> List[Ticket]:
+        view = self.__views[order]
+        begin = bisect.bisect_left(view, (low_key,))
+        end = bisect.bisect_left(view, (high_key + 1,), lo=begin)
+        drop = self.__drop
+        return [ticket for ticket in (_ticket(item, seq, drop) for _, seq, item in view[begin:end])
+                if ticket is not None]
+
+    def search(self, query: str, prefix: bool = True) -> List[Ticket]:
+        query = ' '.join(query.lower().split())
+        validate('query', query, min_len=1)
+        if not prefix:
+            ids = self.__by_term.get(query, set())
+        else:
+            ids = set()
+            index = bisect.bisect_left(self.__terms, query)
+            while index < len(self.__terms) and self.__terms[index].startswith(query):
+                ids.update(self.__by_term[self.__terms[index]])
+                index += 1
+        order = self.__order
+        entries = sorted((_order_key(order, item), seq, item) for seq, item in (self.__by_id[id] for id in ids))
+        drop = self.__drop
+        return [ticket for ticket in (_ticket(item, seq, drop) for _, seq, item in entries) if ticket is not None]
+
+    @property
+    def order(self) -> str:
+        return self.__order
 
     def sort_by_departure_date(self) -> None:
-        self.__tickets.sort(key=lambda x: x.departureDateTime, reverse=True)
+        self.__order = DEPARTURE_DATE_ORDER
 
     def sort_by_price(self) -> None:
-        self.__tickets.sort(key=lambda x: x.price, reverse=True)
\ No newline at end of file
+        self.__order = PRICE_ORDER
@@ -0,0 +1,128 @@
+import codecs
+import csv
+import io
+import itertools
+import json
+import os
+import re
+from typing import Any, Iterable, Iterator
+
+from valid8 import validate
+
+from air_company.decoder import DEPARTURE_DATE_TIME_FORMAT, TIME_FLIGHT_FORMAT
+from air_company.domain import Ticket
+
+FORMATS = ('.csv', '.jsonl')
+RECORD_FIELDS = ('id', 'author', 'name', 'surname', 'departure', 'destination', 'price', 'departureDateTime',
+                 'timeFlight')
+CHUNK_SIZE = 64 * 1024
+
+
+def ticket_record(ticket: Ticket) -> dict:
+    return {
+        'id': ticket.id,
+        'author': ticket.author.value,
+        'name': ticket.name.value,
+        'surname': ticket.surname.value,
+        'departure': ticket.departure.value,
+        'destination': ticket.destination.value,
+        'price': str(ticket.price),
+        'departureDateTime': ticket.departureDateTime.value.strftime(DEPARTURE_DATE_TIME_FORMAT),
+        'timeFlight': ticket.timeFlight.value.strftime(TIME_FLIGHT_FORMAT),
+    }
+
+
+def ticket_records(tickets: Iterable[Ticket]) -> Iterator[dict]:
+    return map(ticket_record, tickets)
+
+
+def csv_lines(records: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, RECORD_FIELDS, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def jsonl_lines(records: Iterable[dict]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps({key: record.get(key) for key in RECORD_FIELDS}) + '\n'
+
+
+_PARTIAL_TOKEN = len('-Infinity')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+_VALUE_CHARACTERS = frozenset('{["-0123456789tfnNI')
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    while position < len(text) and text[position] in ' \t\r\n':
+        position += 1
+    return position
+
+
+def _incomplete(text: str, error: json.JSONDecodeError) -> bool:
+    return len(text) - error.pos <= _PARTIAL_TOKEN or error.msg.startswith('Unterminated string')
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer, offset, position, expected = '', 0, 0, '['
+    for chunk in itertools.chain(chunks, [None]):
+        final = chunk is None
+        buffer = buffer[position:] + text_decoder.decode(b'' if final else chunk, final)
+        offset, position = offset + position, 0
+        while True:
+            position = _skip_whitespace(buffer, position)
+            if position == len(buffer):
+                break
+            character = buffer[position]
+            if expected == '[':
+                if character != '[':
+                    raise ValueError('expected a JSON array')
+                expected = 'value or ]'
+                position += 1
+            elif expected != 'value' and character == ']':
+                return
+            elif expected == ', or ]':
+                if character != ',':
+                    raise ValueError(f'expected , or ] at character {offset + position}')
+                expected = 'value'
+                position += 1
+            elif character not in _VALUE_CHARACTERS:
+                raise ValueError(f'expected a JSON value at character {offset + position}')
+            else:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    if not final and _incomplete(buffer, e):
+                        break
+                    raise ValueError(f'{e.msg} at character {offset + e.pos}') from None
+                if not final and isinstance(value, (int, float)) and not isinstance(value, bool) and \
+                        _NUMBER_TAIL.match(buffer, end):
+                    break
+                yield value
+                position, expected = end, ', or ]'
+    raise ValueError('truncated JSON array')
+
+
+def export(records: Iterable[dict], path: str) -> int:
+    extension = os.path.splitext(path)[1].lower()
+    validate('extension', extension, is_in=set(FORMATS))
+    count = 0
+
+    def counted() -> Iterator[dict]:
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+
+    lines = csv_lines(counted()) if extension == '.csv' else jsonl_lines(counted())
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        file.writelines(lines)
+    return count
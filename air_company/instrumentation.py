@@ -0,0 +1,199 @@
+import bisect
+import itertools
+import json
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from typeguard import typechecked, typeguard_ignore
+from valid8 import validate
+
+QUANTILES = (0.5, 0.95, 0.99)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRIC_PREFIX = 'reservation_flights'
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+_USERNAME_SEGMENT = re.compile(r'(idUserLogged)/[^/]+')
+
+
+def route(path: str) -> str:
+    return _USERNAME_SEGMENT.sub(r'\1/{username}', _ID_SEGMENT.sub('/{id}', '/' + path.lstrip('/')))[1:]
+
+
+class Probe:
+    def begin(self, span: 'Span') -> Any:
+        return None
+
+    def end(self, span: 'Span', state: Any) -> None:
+        pass
+
+    def export(self) -> None:
+        pass
+
+
+class Span:
+    __slots__ = ('__probes', '__states', '__start', 'kind', 'name', 'size', 'status', 'failed', 'elapsed')
+
+    def __init__(self, probes: Tuple[Probe, ...], kind: str, name: str):
+        self.__probes = probes
+        self.__states: List[Any] = []
+        self.__start = 0
+        self.kind = kind
+        self.name = name
+        self.size = 0
+        self.status: Optional[int] = None
+        self.failed = False
+        self.elapsed = 0.0
+
+    def response(self, res, streamed: bool = False) -> None:
+        self.size = int(res.headers.get('Content-Length') or 0) if streamed else len(res.content)
+        self.status = res.status_code
+        self.failed = res.status_code >= 400
+
+    def __enter__(self) -> 'Span':
+        self.__states = [probe.begin(self) for probe in self.__probes]
+        self.__start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.elapsed = (time.perf_counter_ns() - self.__start) / 1e9
+        self.failed = self.failed or exc_type is not None
+        for probe, state in zip(reversed(self.__probes), reversed(self.__states)):
+            probe.end(self, state)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def response(self, res, streamed: bool = False) -> None:
+        pass
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@typechecked
+class Instrumentation:
+    def __init__(self, probes: Iterable[Probe] = ()):
+        self.__probes: Tuple[Probe, ...] = tuple(probes)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.__probes)
+
+    @property
+    def probes(self) -> Tuple[Probe, ...]:
+        return self.__probes
+
+    def add_probe(self, probe: Probe) -> None:
+        self.__probes = self.__probes + (probe,)
+
+    @typeguard_ignore
+    def span(self, kind, name):
+        probes = self.__probes
+        return Span(probes, kind, name) if probes else _NOOP_SPAN
+
+    def export(self) -> None:
+        for probe in self.__probes:
+            probe.export()
+
+
+DISABLED = Instrumentation()
+
+
+def bucket_quantile(buckets: List[int], quantile: float, maximum: float) -> float:
+    rank, seen = quantile * sum(buckets), 0
+    for index, count in enumerate(buckets):
+        if count and seen + count >= rank:
+            lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+            upper = min(LATENCY_BUCKETS[index], maximum) if index < len(LATENCY_BUCKETS) else maximum
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return 0.0
+
+
+def _label(name: str) -> str:
+    return 'name="{}"'.format(name.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+@typechecked
+class MetricsProbe(Probe):
+    def __init__(self, path: Optional[str] = None, format: Optional[str] = None):
+        format = format or ('prometheus' if path is not None and path.endswith(('.prom', '.txt')) else 'json')
+        validate('format', format, is_in={'json', 'prometheus'})
+        self.__path = path
+        self.__format = format
+        self.__lock = threading.Lock()
+        self.__series: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def end(self, span: Span, state: Any) -> None:
+        with self.__lock:
+            series = self.__series.get((span.kind, span.name))
+            if series is None:
+                series = self.__series[span.kind, span.name] = {
+                    'count': 0, 'errors': 0, 'bytes': 0, 'sum': 0.0, 'max': 0.0,
+                    'buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+                }
+            series['count'] += 1
+            series['errors'] += span.failed
+            series['bytes'] += span.size
+            series['sum'] += span.elapsed
+            series['max'] = max(series['max'], span.elapsed)
+            series['buckets'][bisect.bisect_left(LATENCY_BUCKETS, span.elapsed)] += 1
+
+    def __collect(self) -> List[Tuple[Tuple[str, str], Dict[str, Any]]]:
+        with self.__lock:
+            return sorted((key, dict(value, buckets=list(value['buckets']))) for key, value in self.__series.items())
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        res: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (kind, name), value in self.__collect():
+            res.setdefault(kind, {})[name] = {
+                'count': value['count'],
+                'errors': value['errors'],
+                'bytes': value['bytes'],
+                'latency_ms': {
+                    'sum': value['sum'] * 1000,
+                    'mean': value['sum'] / value['count'] * 1000,
+                    **{f'p{int(q * 100)}': bucket_quantile(value['buckets'], q, value['max']) * 1000
+                       for q in QUANTILES},
+                    'max': value['max'] * 1000,
+                },
+            }
+        return res
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        kinds: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (kind, name), value in self.__collect():
+            kinds.setdefault(kind, {})[name] = value
+        lines = []
+        for kind, series in kinds.items():
+            seconds, size, errors = f'{METRIC_PREFIX}_{kind}_seconds', f'{METRIC_PREFIX}_{kind}_bytes_total', \
+                f'{METRIC_PREFIX}_{kind}_errors_total'
+            lines.append(f'# TYPE {seconds} histogram')
+            for name, value in series.items():
+                label = _label(name)
+                for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), itertools.accumulate(value['buckets'])):
+                    lines.append(f'{seconds}_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f'{seconds}_sum{{{label}}} {value["sum"]}')
+                lines.append(f'{seconds}_count{{{label}}} {value["count"]}')
+            for metric, field in ((size, 'bytes'), (errors, 'errors')):
+                lines.append(f'# TYPE {metric} counter')
+                lines.extend(f'{metric}{{{_label(name)}}} {value[field]}' for name, value in series.items())
+        return '\n'.join(lines) + '\n'
+
+    def export(self) -> None:
+        if self.__path is None:
+            return
+        with open(self.__path, 'w') as file:
+            file.write(self.to_prometheus() if self.__format == 'prometheus' else self.to_json())
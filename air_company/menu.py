@@ -4,7 +4,8 @@ from typing import Callable, List, Dict, Optional, Any
 from typeguard import typechecked
 from valid8 import validate
 
-from validation.dataclasses import validate_dataclass
+from air_company.instrumentation import Instrumentation, DISABLED
+from validation.engine import Rule, compile_checks
 from validation.regex import pattern
 
 
@@ -14,26 +15,31 @@ class Description:
     value: str
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('Description.value', self.value, min_len=1, max_len=1000, custom=pattern(r'[0-9A-Za-z ;.,_-]*'))
+        _check_description(self)
 
     def __str__(self):
         return self.value
 
 
+_check_description = compile_checks(Description, value=Rule(min_len=1, max_len=1000, custom=pattern(r'[0-9A-Za-z ;.,_-]*'),
+                                                            label='Description.value'))
+
+
 @typechecked
 @dataclass(order=True, frozen=True)
 class Key:
     value: str
 
     def __post_init__(self):
-        validate_dataclass(self)
-        validate('Key.value', self.value, min_len=1, max_len=10, custom=pattern(r'[0-9A-Za-z_-]*'))
+        _check_key(self)
 
     def __str__(self):
         return self.value
 
 
+_check_key = compile_checks(Key, value=Rule(min_len=1, max_len=10, custom=pattern(r'[0-9A-Za-z_-]*'), label='Key.value'))
+
+
 @typechecked
 @dataclass(frozen=True)
 class Entry:
@@ -44,7 +50,7 @@ class Entry:
     is_logged: Callable[[], bool] = field(default=lambda: False)
 
     def __post_init__(self):
-        validate_dataclass(self)
+        _check_entry(self)
 
     @staticmethod
     def create(key: str, description: str, on_selected: Callable[[], None] = lambda: None,
@@ -52,18 +58,21 @@ class Entry:
         return Entry(Key(key), Description(description), on_selected, is_exit, is_logged)
 
 
+_check_entry = compile_checks(Entry)
+
+
 @typechecked
 @dataclass(frozen=True)
 class Menu:
     description: Description
     auto_select: Callable[[], None] = field(default=lambda: None)
+    instrumentation: Instrumentation = field(default=DISABLED, repr=False)
     __entries: List[Entry] = field(default_factory=list, repr=False, init=False)
     __key2entry: Dict[Key, Entry] = field(default_factory=dict, repr=False, init=False)
     create_key: InitVar[Any] = field(default=None)
 
     def __post_init__(self, create_key: Any):
-        validate('create_key', create_key, custom=Menu.Builder.is_valid_key)
-        validate_dataclass(self)
+        _check_menu(self, create_key)
 
     def _add_entry(self, value: Entry, create_key: Any) -> None:
         validate('create_key', create_key, custom=Menu.Builder.is_valid_key)
@@ -84,14 +93,17 @@ class Menu:
         for entry in self.__entries:
             print(f'{entry.key}:\t{entry.description}')
 
+    def dispatch(self, line: str) -> (bool, bool):
+        key = Key(line.strip())
+        entry = self.__key2entry[key]
+        with self.instrumentation.span('action', entry.description.value):
+            entry.on_selected()
+            return entry.is_exit, entry.is_logged()
+
     def __select_from_input(self) -> (bool, bool):
         while True:
             try:
-                line = input("? ")
-                key = Key(line.strip())
-                entry = self.__key2entry[key]
-                entry.on_selected()
-                return entry.is_exit, entry.is_logged()
+                return self.dispatch(input("? "))
             except (KeyError, TypeError, ValueError) as e:
                 print(e)
                 print('Invalid selection. Please, try again...')
@@ -109,8 +121,9 @@ class Menu:
         __menu: Optional['Menu']
         __create_key = object()
 
-        def __init__(self, description: Description, auto_select: Callable[[], None] = lambda: None):
-            self.__menu = Menu(description, auto_select, self.__create_key)
+        def __init__(self, description: Description, auto_select: Callable[[], None] = lambda: None,
+                     instrumentation: Instrumentation = DISABLED):
+            self.__menu = Menu(description, auto_select, instrumentation, self.__create_key)
 
         @staticmethod
         def is_valid_key(key: Any) -> bool:
@@ -126,3 +139,6 @@ class Menu:
             validate('menu.entries', self.__menu._has_exit(), equals=True)
             res, self.__menu = self.__menu, None
             return res
+
+
+_check_menu = compile_checks(Menu, initvars={'create_key': Rule(custom=Menu.Builder.is_valid_key)})
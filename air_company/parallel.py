@@ -0,0 +1,86 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+
+from typeguard import typechecked
+from valid8 import validate, ValidationError
+
+from air_company.decoder import RawTicket, intern_name, intern_surname, intern_departure, intern_destination
+from air_company.domain import Ticket, TicketRecord, Primitives, trusted, from_microseconds, \
+    from_seconds, Author, Price, DepartureDateTime, TimeFlight
+
+PARALLEL_CHUNK = 10000
+PARALLEL_THRESHOLD = 50000
+
+
+def decode_rows(items: List[dict]) -> List[Primitives]:
+    try:
+        return [RawTicket(item).primitives() for item in items]
+    except ValidationError as e:
+        raise ValueError(str(e)) from None
+
+
+class DecodedTicket(TicketRecord):
+    __slots__ = ('row',)
+
+    def __init__(self, row: Primitives):
+        super().__init__(row[0], row[6], row[7], row[2:6])
+        self.row = row
+
+    def materialize(self) -> Ticket:
+        id, author, name, surname, departure, destination, price, departure_date_time, time_flight = self.row
+        return trusted(Ticket, id=id, author=trusted(Author, value=author), name=intern_name(name),
+                       surname=intern_surname(surname), departure=intern_departure(departure),
+                       destination=intern_destination(destination), price=trusted(Price, value_in_cents=price),
+                       departureDateTime=trusted(DepartureDateTime, value=from_microseconds(departure_date_time)),
+                       timeFlight=trusted(TimeFlight, value=from_seconds(time_flight)))
+
+    def primitives(self) -> Primitives:
+        return self.row
+
+
+def chunks(items: List[dict], size: int) -> Iterator[List[dict]]:
+    for first in range(0, len(items), size):
+        yield items[first:first + size]
+
+
+@typechecked
+class ParallelDecoder:
+    def __init__(self, workers: int, chunk_size: int = PARALLEL_CHUNK):
+        validate('workers', workers, min_value=1)
+        validate('chunk_size', chunk_size, min_value=1)
+        self.__workers = workers
+        self.__chunk_size = chunk_size
+        self.__lock = threading.Lock()
+        self.__executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def workers(self) -> int:
+        return self.__workers
+
+    @property
+    def chunk_size(self) -> int:
+        return self.__chunk_size
+
+    def __pool(self) -> ProcessPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(max_workers=self.__workers,
+                                                      mp_context=multiprocessing.get_context('spawn'))
+            return self.__executor
+
+    def decode(self, items: List[dict]) -> List[DecodedTicket]:
+        if self.__workers == 1 or len(items) <= self.__chunk_size:
+            rows = decode_rows(items)
+        else:
+            rows = []
+            for chunk in self.__pool().map(decode_rows, chunks(items, self.__chunk_size)):
+                rows.extend(chunk)
+        return [DecodedTicket(row) for row in rows]
+
+    def close(self) -> None:
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,152 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Tuple, Union
+
+from typeguard import typechecked
+from valid8 import validate
+
+from air_company.instrumentation import Probe, Span
+
+COMPONENTS = (
+    ('typeguard', re.compile(r'[/\\]typeguard[/\\]')),
+    ('valid8', re.compile(r'[/\\]valid8[/\\]')),
+    ('type_validator', re.compile(r'[/\\]dataclass_type_validator[/\\]')),
+    ('strptime', re.compile(r'_strptime\.py$')),
+    ('http', re.compile(r'[/\\](requests|urllib3|http|socket|ssl)[/\\.]')),
+    ('json', re.compile(r'[/\\]json[/\\]')),
+    ('air_company', re.compile(r'[/\\]air_company[/\\]')),
+    ('validation', re.compile(r'[/\\]validation[/\\]|<string>$')),
+)
+_SLUG = re.compile(r'[^A-Za-z0-9]+')
+_SNAPSHOT_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+                     tracemalloc.Filter(False, '<frozen importlib._bootstrap>'))
+
+
+def component(function: Tuple[str, int, str]) -> str:
+    filename, _, name = function
+    if filename == '~':
+        return 'strptime' if 'strptime' in name else 'builtins'
+    for label, pattern in COMPONENTS:
+        if pattern.search(filename):
+            return label
+    return 'other'
+
+
+def time_by_component(stats: pstats.Stats) -> Dict[str, float]:
+    res: Dict[str, float] = {}
+    for function, (_, _, tottime, _, _) in stats.stats.items():
+        label = component(function)
+        res[label] = res.get(label, 0.0) + tottime
+    return res
+
+
+@typechecked
+class ProfileProbe(Probe):
+    def __init__(self, directory: str, top: int = 25, kinds: Tuple[str, ...] = ('action',)):
+        validate('directory', directory, min_len=1)
+        validate('top', top, min_value=1)
+        self.__directory = directory
+        self.__top = top
+        self.__kinds = kinds
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__sequence = 0
+        self.__totals: Dict[str, Dict[str, float]] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        return self.__directory
+
+    def begin(self, span: Span) -> Any:
+        if span.kind not in self.__kinds or getattr(self.__local, 'active', False):
+            return None
+        before = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if before is None:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            if before is None:
+                tracemalloc.stop()
+            return None
+        self.__local.active = True
+        return profile, before
+
+    def end(self, span: Span, state: Any) -> None:
+        if state is None:
+            return
+        profile, before = state
+        profile.disable()
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        if before is None:
+            tracemalloc.stop()
+            allocations = after.statistics('lineno')
+        else:
+            allocations = after.compare_to(before.filter_traces(_SNAPSHOT_FILTERS), 'lineno')
+        self.__local.active = False
+        with self.__lock:
+            self.__sequence += 1
+            sequence = self.__sequence
+        self.__report(sequence, span, pstats.Stats(profile), allocations, peak)
+
+    def __report(self, sequence: int, span: Span, stats: pstats.Stats,
+                 allocations: List[Union[tracemalloc.Statistic, tracemalloc.StatisticDiff]], peak: int) -> None:
+        name = f'{sequence:04}-{_SLUG.sub("-", span.name).strip("-").lower()}'
+        stats.dump_stats(os.path.join(self.__directory, f'{name}.prof'))
+
+        components = time_by_component(stats)
+        with self.__lock:
+            totals = self.__totals.setdefault(span.name, {})
+            for label, seconds in components.items():
+                totals[label] = totals.get(label, 0.0) + seconds
+
+        out = io.StringIO()
+        out.write(f'{span.kind}: {span.name}\nwall time: {span.elapsed * 1000:.3f} ms\n'
+                  f'peak traced memory: {peak / 1024:.1f} KiB\n\n')
+        out.write(_components_table(components))
+        for order in ('cumulative', 'tottime'):
+            out.write(f'\nTop {self.__top} functions by {order}\n')
+            out.write(_functions_table(stats, order, self.__top))
+        out.write(f'\nTop {self.__top} allocation sites still alive at the end of the action\n')
+        for diff in allocations[:self.__top]:
+            out.write(f'{diff}\n')
+        with open(os.path.join(self.__directory, f'{name}.txt'), 'w') as file:
+            file.write(out.getvalue())
+
+    def export(self) -> None:
+        with self.__lock:
+            totals = {name: dict(components) for name, components in self.__totals.items()}
+        out = io.StringIO()
+        for name, components in sorted(totals.items()):
+            out.write(f'{name}\n')
+            out.write(_components_table(components))
+            out.write('\n')
+        with open(os.path.join(self.__directory, 'summary.txt'), 'w') as file:
+            file.write(out.getvalue())
+
+
+def _functions_table(stats: pstats.Stats, order: str, top: int) -> str:
+    column = 3 if order == 'cumulative' else 2
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][column])[:top]
+    lines = [f'{"ncalls":>9} {"tottime ms":>11} {"cumtime ms":>11}  function']
+    for function, (_, ncalls, tottime, cumtime, _) in rows:
+        lines.append(f'{ncalls:>9} {tottime * 1000:11.3f} {cumtime * 1000:11.3f}  {pstats.func_std_string(function)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _components_table(components: Dict[str, float]) -> str:
+    total = sum(components.values()) or 1.0
+    lines = [f'{"component":<12} {"own time ms":>12} {"share":>7}']
+    for label, seconds in sorted(components.items(), key=lambda item: -item[1]):
+        lines.append(f'{label:<12} {seconds * 1000:12.3f} {seconds / total:7.1%}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,110 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from typeguard import typechecked
+from valid8 import validate
+
+from air_company.cache import CachedTickets
+from air_company.columnar import TicketStore
+
+
+@typechecked
+@dataclass(frozen=True)
+class TicketSnapshot:
+    generation: int
+    air_company: TicketStore
+    cached: Optional[CachedTickets] = None
+
+
+@typechecked
+class Refresher:
+    def __init__(self, fetch: Callable[[], Any], interval: Optional[float] = None, name: str = 'refresh'):
+        if interval is not None:
+            validate('interval', interval, min_value=0, min_strict=True)
+        self.__fetch = fetch
+        self.__interval = interval
+        self.__name = name
+        self.__done = threading.Condition()
+        self.__stop: Optional[threading.Event] = None
+        self.__wake: Optional[threading.Event] = None
+        self.__busy = False
+        self.__completed = 0
+        self.__result: Any = None
+        self.__error: Optional[Exception] = None
+
+    @property
+    def interval(self) -> Optional[float]:
+        return self.__interval
+
+    @property
+    def completed(self) -> int:
+        return self.__completed
+
+    @property
+    def error(self) -> Optional[Exception]:
+        return self.__error
+
+    def is_running(self) -> bool:
+        return self.__stop is not None
+
+    def start(self) -> None:
+        if self.__stop is not None:
+            return
+        with self.__done:
+            self.__stop, self.__wake = threading.Event(), threading.Event()
+            self.__busy = True
+            self.__completed = 0
+            self.__result = self.__error = None
+        threading.Thread(target=self.__loop, args=(self.__stop, self.__wake), name=self.__name, daemon=True).start()
+
+    def stop(self) -> None:
+        with self.__done:
+            if self.__stop is None:
+                return
+            self.__stop.set()
+            self.__wake.set()
+            self.__stop = self.__wake = None
+            self.__busy = False
+            self.__result = None
+            self.__done.notify_all()
+
+    def __loop(self, stop: threading.Event, wake: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                result, error = self.__fetch(), None
+            except Exception as e:
+                result, error = None, e
+            with self.__done:
+                if stop.is_set():
+                    return
+                if result is not None:
+                    self.__result = result
+                self.__error = error
+                self.__completed += 1
+                self.__busy = False
+                self.__done.notify_all()
+            wake.wait(self.__interval)
+            with self.__done:
+                wake.clear()
+                self.__busy = not stop.is_set()
+
+    def request(self) -> None:
+        wake = self.__wake
+        if wake is not None:
+            wake.set()
+
+    def wait(self, completed: int, timeout: Optional[float] = None) -> bool:
+        with self.__done:
+            return self.__done.wait_for(lambda: self.__completed >= completed or self.__stop is None, timeout)
+
+    def refresh(self, timeout: Optional[float] = None) -> bool:
+        with self.__done:
+            target = self.__completed + 1 + self.__busy
+        self.request()
+        return self.wait(target, timeout) and self.__stop is not None
+
+    def take(self) -> Any:
+        with self.__done:
+            res, self.__result = self.__result, None
+            return res
@@ -0,0 +1,77 @@
+import contextlib
+import io
+import json
+import shlex
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from typeguard import typechecked
+
+
+class ScriptError(Exception):
+    pass
+
+
+@typechecked
+@dataclass(frozen=True)
+class Command:
+    line: int
+    key: str
+    args: Tuple[str, ...] = ()
+
+
+def parse_command(line: int, text: str) -> Optional[Command]:
+    words = shlex.split(text, comments=True)
+    if not words:
+        return None
+    return Command(line, words[0], tuple(words[1:]))
+
+
+@dataclass
+class CommandResult:
+    line: int
+    key: str
+    menu: Optional[str] = None
+    ok: bool = True
+    logged: bool = False
+    exit: bool = False
+    output: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    def fail(self, error: str) -> None:
+        self.ok = False
+        self.error = error
+
+    def to_json(self) -> str:
+        return json.dumps(self.__dict__)
+
+
+class Prompts:
+    def __init__(self, answers: Iterable[str]):
+        self.__answers = list(answers)
+        self.__position = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.__answers) - self.__position
+
+    def __call__(self, prompt: str = '') -> str:
+        if self.__position == len(self.__answers):
+            raise ScriptError(f'no answer left for prompt {str(prompt).strip()!r}')
+        self.__position += 1
+        return self.__answers[self.__position - 1]
+
+
+@contextlib.contextmanager
+def headless(answers: Iterable[str]) -> Iterator[Tuple[Prompts, io.StringIO]]:
+    if threading.current_thread() is not threading.main_thread():
+        raise ScriptError('headless sessions capture stdout and must run on the main thread')
+    prompts, output = Prompts(answers), io.StringIO()
+    with contextlib.redirect_stdout(output):
+        yield prompts, output
+
+
+def output_lines(output: io.StringIO) -> List[str]:
+    return [line for line in output.getvalue().splitlines() if line.strip()]
@@ -0,0 +1,129 @@
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, List, Tuple
+
+from valid8 import validate
+
+from air_company.decoder import intern_name, intern_surname, intern_departure, intern_destination
+from air_company.domain import Ticket, TicketRecord, Primitives, Author, Price, DepartureDateTime, TimeFlight, \
+    trusted, from_microseconds, from_seconds, INSERTION_ORDER, PRICE_ORDER, DEPARTURE_DATE_ORDER
+
+MAGIC = b'AIRSNAP\x00'
+VERSION = 1
+ORDERS = (INSERTION_ORDER, PRICE_ORDER, DEPARTURE_DATE_ORDER)
+HEADER = struct.Struct('<8sHHIQQ')
+STRING = struct.Struct('<I')
+RECORD = struct.Struct('<qqIIIIqqi4x')
+KEYS = struct.Struct('<q8xIIIIqq8x')
+
+
+def _code(codes: Dict[str, int], value: str) -> int:
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(codes)
+    return code
+
+
+def write_snapshot(rows: Iterable[Primitives], order: str, path: str) -> int:
+    validate('order', order, is_in=ORDERS)
+    codes: Dict[str, int] = {}
+    records = bytearray()
+    count = 0
+    for id, author, name, surname, departure, destination, price, departure_date_time, time_flight in rows:
+        records += RECORD.pack(id, author, _code(codes, name), _code(codes, surname), _code(codes, departure),
+                               _code(codes, destination), price, departure_date_time, time_flight)
+        count += 1
+    table = bytearray()
+    for value in codes:
+        data = value.encode('utf-8')
+        table += STRING.pack(len(data))
+        table += data
+    table += bytes(-(HEADER.size + len(table)) % 8)
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, ORDERS.index(order), len(codes), count))
+        file.write(table)
+        file.write(records)
+    os.replace(temporary, path)
+    return count
+
+
+class MappedSnapshot:
+    __slots__ = ('buffer', 'strings', 'order', 'count', 'offset')
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            validate('snapshot size', os.fstat(file.fileno()).st_size, min_value=HEADER.size)
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.__read_header()
+        except BaseException:
+            self.close()
+            raise
+
+    def __read_header(self) -> None:
+        magic, version, record_size, order, string_count, self.count = HEADER.unpack_from(self.buffer)
+        validate('magic', magic, equals=MAGIC)
+        validate('version', version, equals=VERSION)
+        validate('record_size', record_size, equals=RECORD.size)
+        validate('order', order, max_value=len(ORDERS) - 1)
+        self.order = ORDERS[order]
+        offset, self.strings = HEADER.size, []
+        for _ in range(string_count):
+            validate('snapshot size', len(self.buffer), min_value=offset + STRING.size)
+            length, = STRING.unpack_from(self.buffer, offset)
+            offset += STRING.size
+            self.strings.append(self.buffer[offset:offset + length].decode('utf-8'))
+            offset += length
+        self.offset = offset + -offset % 8
+        validate('snapshot size', len(self.buffer), equals=self.offset + self.count * RECORD.size)
+
+    def records(self) -> List['MappedTicket']:
+        strings, offset, res = self.strings, self.offset, []
+        with memoryview(self.buffer) as view, view[offset:] as region:
+            for id, name, surname, departure, destination, price, departure_date_time in KEYS.iter_unpack(region):
+                if max(name, surname, departure, destination) >= len(strings):
+                    validate('string code', max(name, surname, departure, destination), max_value=len(strings) - 1)
+                res.append(MappedTicket(self, offset, id, price, departure_date_time,
+                                        (strings[name], strings[surname], strings[departure], strings[destination])))
+                offset += RECORD.size
+        return res
+
+    def close(self) -> None:
+        self.buffer.close()
+
+    def __enter__(self) -> 'MappedSnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+
+class MappedTicket(TicketRecord):
+    __slots__ = ('snapshot', 'offset')
+
+    def __init__(self, snapshot: MappedSnapshot, offset: int, id: int, price_in_cents: int,
+                 departure_in_microseconds: int, texts: Tuple[str, str, str, str]):
+        super().__init__(id, price_in_cents, departure_in_microseconds, texts)
+        self.snapshot = snapshot
+        self.offset = offset
+
+    def primitives(self) -> Primitives:
+        id, author, _, _, _, _, price, departure_date_time, time_flight = \
+            RECORD.unpack_from(self.snapshot.buffer, self.offset)
+        return (id, author, *self.texts, price, departure_date_time, time_flight)
+
+    def materialize(self) -> Ticket:
+        id, author, name, surname, departure, destination, price, departure_date_time, time_flight = \
+            self.primitives()
+        return trusted(Ticket, id=id, author=trusted(Author, value=author), name=intern_name(name),
+                       surname=intern_surname(surname), departure=intern_departure(departure),
+                       destination=intern_destination(destination), price=trusted(Price, value_in_cents=price),
+                       departureDateTime=trusted(DepartureDateTime, value=from_microseconds(departure_date_time)),
+                       timeFlight=trusted(TimeFlight, value=from_seconds(time_flight)))
+
+
+def read_snapshot(path: str) -> MappedSnapshot:
+    return MappedSnapshot(path)
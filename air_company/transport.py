@@ -0,0 +1,72 @@
+from typing import Optional
+
+import requests as requests
+from requests.adapters import HTTPAdapter
+from typeguard import typechecked
+from valid8 import validate
+
+from air_company.instrumentation import Instrumentation, DISABLED, route
+
+
+@typechecked
+class Transport:
+    def __init__(self, base_url: str, pool_size: int = 10, timeout: float = 10.0,
+                 instrumentation: Instrumentation = DISABLED):
+        validate('base_url', base_url, min_len=1)
+        validate('pool_size', pool_size, min_value=1)
+        validate('timeout', timeout, min_value=0, min_strict=True)
+        self.__base_url = base_url.rstrip('/')
+        self.__timeout = timeout
+        self.__instrumentation = instrumentation
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+
+    @property
+    def base_url(self) -> str:
+        return self.__base_url
+
+    @property
+    def timeout(self) -> float:
+        return self.__timeout
+
+    def url(self, path: str) -> str:
+        return f'{self.__base_url}/{path.lstrip("/")}'
+
+    def authorize(self, key: str) -> None:
+        self.__session.headers['Authorization'] = f'Token {key}'
+
+    def deauthorize(self) -> None:
+        self.__session.headers.pop('Authorization', None)
+
+    def is_authorized(self) -> bool:
+        return 'Authorization' in self.__session.headers
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return self.__instrumentation
+
+    def __send(self, method: str, path: str, timeout: Optional[float], kwargs: dict):
+        send = getattr(self.__session, method)
+        if not self.__instrumentation.enabled:
+            return send(url=self.url(path), timeout=timeout or self.__timeout, **kwargs)
+        with self.__instrumentation.span('http', f'{method.upper()} {route(path)}') as span:
+            res = send(url=self.url(path), timeout=timeout or self.__timeout, **kwargs)
+            span.response(res, kwargs.get('stream', False))
+            return res
+
+    def get(self, path: str, timeout: Optional[float] = None, **kwargs):
+        return self.__send('get', path, timeout, kwargs)
+
+    def post(self, path: str, timeout: Optional[float] = None, **kwargs):
+        return self.__send('post', path, timeout, kwargs)
+
+    def put(self, path: str, timeout: Optional[float] = None, **kwargs):
+        return self.__send('put', path, timeout, kwargs)
+
+    def delete(self, path: str, timeout: Optional[float] = None, **kwargs):
+        return self.__send('delete', path, timeout, kwargs)
+
+    def close(self) -> None:
+        self.__session.close()
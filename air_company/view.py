@@ -0,0 +1,86 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+from typeguard import typechecked
+from valid8 import validate
+
+from air_company.columnar import TicketStore, TicketView
+from air_company.domain import Ticket
+
+SEPARATOR = '-' * 140
+HEADER = '%1s %4s %10s %15s %20s %20s %9s %25s %15s' % (
+    '#', 'AUTHOR', 'NAME', 'SURNAME', 'DEPARTURE', 'DESTINATION', 'PRICE', 'DEPARTURE_DATE_TIME', 'TIME_FLIGHT')
+ROW = '%4s %14s %15s %20s %15s %12s %25s %13s'
+
+
+def _source(ticket: Ticket) -> Tuple[Any, int]:
+    return ticket.location if isinstance(ticket, TicketView) else (ticket, -1)
+
+
+def _row(ticket: Ticket) -> str:
+    return ROW % (ticket.author.value, ticket.name.value, ticket.surname.value, ticket.departure.value,
+                  ticket.destination.value, ticket.price, ticket.departureDateTime.value, ticket.timeFlight.value)
+
+
+@typechecked
+class TicketTable:
+    def __init__(self, air_company: TicketStore, page_size: int = 20):
+        validate('page_size', page_size, min_value=1)
+        self.__air_company = air_company
+        self.__page_size = page_size
+        self.__page = 0
+        self.__rows: Dict[int, Tuple[Any, int, str]] = {}
+
+    @property
+    def page_size(self) -> int:
+        return self.__page_size
+
+    @property
+    def page(self) -> int:
+        return self.__current() + 1
+
+    def pages(self) -> int:
+        return max(1, -(-self.__air_company.tickets() // self.__page_size))
+
+    def set_page_size(self, page_size: int) -> None:
+        validate('page_size', page_size, min_value=1)
+        first = self.__current() * self.__page_size
+        self.__page_size = page_size
+        self.__page = first // page_size
+
+    def next_page(self) -> None:
+        self.__page = min(self.__current() + 1, self.pages() - 1)
+
+    def previous_page(self) -> None:
+        self.__page = max(self.__current() - 1, 0)
+
+    def go_to_page(self, page: int) -> None:
+        validate('page', page, min_value=1, max_value=self.pages())
+        self.__page = page - 1
+
+    def invalidate(self) -> None:
+        self.__rows.clear()
+
+    def __current(self) -> int:
+        return min(self.__page, self.pages() - 1)
+
+    def render(self) -> str:
+        first = self.__current() * self.__page_size
+        lines = self.__lines(enumerate(self.__air_company.page(first, self.__page_size), start=first))
+        lines.append(f'Page {self.page}/{self.pages()} - {self.__air_company.tickets()} tickets')
+        return '\n'.join(lines)
+
+    def render_tickets(self, tickets: Iterable[Ticket]) -> str:
+        return '\n'.join(self.__lines(enumerate(tickets)))
+
+    def __lines(self, rows: Iterable[Tuple[int, Ticket]]) -> List[str]:
+        lines, previous, cache = [SEPARATOR, HEADER, SEPARATOR], self.__rows, {}
+        for index, ticket in rows:
+            id, (source, position) = ticket.id, _source(ticket)
+            cached = previous.get(id)
+            if cached is None or cached[0] is not source or cached[1] != position:
+                cached = source, position, _row(ticket)
+            cache[id] = cached
+            lines.append(f'{index + 1} {cached[2]}')
+        lines.append(SEPARATOR)
+        self.__rows = cache
+        return lines
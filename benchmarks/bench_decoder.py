@@ -0,0 +1,43 @@
+import argparse
+import datetime
+import json
+import time
+
+from air_company.decoder import decode_payload
+from air_company.domain import Ticket, Author, Name, Surname, Departure, Destination, Price, DepartureDateTime, \
+    TimeFlight
+from benchmarks.payloads import ticket_payload
+
+
+def decode_with_strptime(payload: bytes) -> list:
+    tickets = []
+    for item in json.loads(payload):
+        tickets.append(Ticket(int(item['id']), Author(item['author']), Name(item['name']), Surname(item['surname']),
+                              Departure(item['departure']), Destination(item['destination']),
+                              Price.parse(item['price']),
+                              DepartureDateTime(datetime.datetime.strptime(item['departureDateTime'],
+                                                                           '%Y-%m-%dT%H:%M:%SZ')),
+                              TimeFlight(datetime.datetime.strptime(item['timeFlight'], '%H:%M:%S').time())))
+    return tickets
+
+
+def throughput(decode, payload: bytes, count: int) -> float:
+    start = time.perf_counter()
+    decode(payload)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tickets decoded per second by App.fetch_tickets')
+    parser.add_argument('sizes', nargs='*', type=int, default=[10000, 100000])
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        payload = ticket_payload(count)
+        before = throughput(decode_with_strptime, payload, count)
+        after = throughput(decode_payload, payload, count)
+        print(f'{count:>7} tickets   strptime+regex {before:10.0f}/s   decoder {after:10.0f}/s   x{after / before:.2f}')
+
+
+if __name__ == '__main__':
+    main()
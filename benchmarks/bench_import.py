@@ -0,0 +1,44 @@
+import argparse
+import datetime
+import time
+
+from air_company.bulk import import_tickets
+from air_company.transport import Transport
+from stand_in.server import Faults, StandInServer, StandInState
+
+
+def rows(count: int):
+    departure = (datetime.datetime.now() + datetime.timedelta(days=2)).strftime('%d/%m/%Y %H:%M')
+    for number in range(1, count + 1):
+        yield number, {'name': 'Santino', 'surname': 'Locanto', 'departure': 'Crotone', 'destination': 'Torino',
+                       'price': f'{number % 900 + 20}.00', 'departureDateTime': departure, 'timeFlight': '01:30'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import throughput against the stand-in server')
+    parser.add_argument('-n', '--rows', type=int, default=300)
+    parser.add_argument('--latency', type=float, default=20.0, help='server latency per request, in ms')
+    parser.add_argument('--concurrency', type=int, nargs='*', default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    state = StandInState()
+    state.add_user('bench', 'bench')
+    server = StandInServer(('127.0.0.1', 0), state, Faults(latency=args.latency / 1000))
+    server.start()
+    try:
+        transport = Transport(server.base_url, pool_size=max(args.concurrency))
+        transport.authorize(state.login('bench', 'bench'))
+        sequential = None
+        for concurrency in args.concurrency:
+            start = time.perf_counter()
+            report = import_tickets(transport, 1, rows(args.rows), concurrency)
+            elapsed = time.perf_counter() - start
+            throughput = report.counts()['created'] / elapsed
+            sequential = sequential or throughput
+            print(f'concurrency {concurrency:>3}   {throughput:9.1f} rows/s   x{throughput / sequential:.1f}')
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
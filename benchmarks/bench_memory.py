@@ -0,0 +1,67 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from air_company.columnar import ColumnarAirCompany
+from air_company.decoder import decode_payload
+from air_company.domain import AirCompany
+from stand_in.generator import generate_tickets
+
+BACKENDS = {'objects': AirCompany, 'columnar': ColumnarAirCompany}
+
+
+def chunks(count: int, chunk: int):
+    for first in range(0, count, chunk):
+        yield json.dumps(generate_tickets(min(chunk, count - first), seed=first, first_id=first + 1)).encode()
+
+
+def measure(backend: str, count: int, chunk: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = BACKENDS[backend]()
+    for payload in chunks(count, chunk):
+        store.add_tickets(decode_payload(payload))
+        del payload
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert store.tickets() == count
+    return {'retained': retained, 'peak': peak, 'seconds': elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory retained by AirCompany and ColumnarAirCompany, '
+                                                 'measured with tracemalloc')
+    parser.add_argument('sizes', nargs='*', type=int, default=[1000000])
+    parser.add_argument('--chunk', type=int, default=50000, help='tickets decoded per payload')
+    parser.add_argument('-b', '--backend', dest='backends', action='append', choices=sorted(BACKENDS),
+                        help='backends to measure, each in its own process (default: all)')
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        report(count, {backend: isolated(backend, count, args.chunk) for backend in args.backends or BACKENDS})
+
+
+def isolated(backend: str, count: int, chunk: int) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(measure, backend, count, chunk).result()
+
+
+def report(count: int, results: dict) -> None:
+    for backend, result in results.items():
+        print(f'{count:>8} tickets  {backend:<9} retained {result["retained"] / 2 ** 20:8.1f} MiB '
+              f'({result["retained"] / count:6.1f} B/ticket)   peak {result["peak"] / 2 ** 20:8.1f} MiB   '
+              f'build {result["seconds"]:6.1f} s')
+    if len(results) == len(BACKENDS):
+        ratio = results['objects']['retained'] / results['columnar']['retained']
+        print(f'{count:>8} tickets  columnar retains x{ratio:.1f} less memory')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import json
+import os
+import time
+
+from air_company.decoder import decode_records, decode_tickets
+from air_company.domain import AirCompany
+from air_company.parallel import ParallelDecoder, PARALLEL_CHUNK
+from benchmarks.payloads import ticket_payload
+
+
+def fill(add, payload: bytes) -> float:
+    start = time.perf_counter()
+    add(AirCompany(), json.loads(payload))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tickets validated per second by ParallelDecoder with 1 to N '
+                                                 'worker processes')
+    parser.add_argument('sizes', nargs='*', type=int, default=[200000])
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help='largest pool to measure')
+    parser.add_argument('--chunk', type=int, default=PARALLEL_CHUNK, help='tickets sent to a worker at a time')
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        payload = ticket_payload(count)
+        serial = fill(lambda airCompany, items: airCompany.add_tickets(decode_tickets(items)), payload)
+        print(f'{count:>8} tickets  serial decode_tickets {count / serial:10.0f}/s')
+        serial = fill(lambda airCompany, items: airCompany.add_records(decode_records(items)), payload)
+        print(f'{count:>8} tickets  serial decode_records {count / serial:10.0f}/s')
+        for workers in range(1, args.workers + 1):
+            decoder = ParallelDecoder(workers, args.chunk)
+            add = lambda airCompany, items: airCompany.add_records(decoder.decode(items))
+            try:
+                fill(add, ticket_payload(args.chunk * workers, seed=1))
+                elapsed = fill(add, payload)
+            finally:
+                decoder.close()
+            print(f'{count:>8} tickets  {workers:>2} workers {count / elapsed:10.0f}/s   x{serial / elapsed:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from air_company.decoder import decode_records, decode_tickets
+from air_company.domain import AirCompany
+from benchmarks.payloads import ticket_payload
+
+
+def from_json(payload: bytes, lazy: bool) -> AirCompany:
+    res = AirCompany()
+    items = json.loads(payload)
+    if lazy:
+        res.add_records(decode_records(items))
+    else:
+        res.add_tickets(decode_tickets(items))
+    return res
+
+
+def timed(load) -> float:
+    start = time.perf_counter()
+    airCompany = load()
+    airCompany.ticket(0)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seconds to the first ticket from a JSON payload and from a '
+                                                 'memory-mapped AirCompany snapshot')
+    parser.add_argument('sizes', nargs='*', type=int, default=[10000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'tickets.snap')
+        for count in args.sizes:
+            payload = ticket_payload(count)
+            airCompany = AirCompany()
+            airCompany.add_tickets(decode_tickets(json.loads(payload)))
+            airCompany.save(path)
+            eager = timed(lambda: from_json(payload, lazy=False))
+            lazy = timed(lambda: from_json(payload, lazy=True))
+            mapped = timed(lambda: AirCompany.load(path))
+            print(f'{count:>8} tickets  json {len(payload) / 2 ** 20:7.1f} MiB  snapshot '
+                  f'{os.path.getsize(path) / 2 ** 20:7.1f} MiB   eager {eager * 1000:8.1f} ms   '
+                  f'lazy {lazy * 1000:8.1f} ms   mapped {mapped * 1000:8.1f} ms   x{eager / mapped:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    times = {}
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(own), int(cumulative)
+    return times
+
+
+def launch_ms() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'air_company'], cwd=ROOT, input='0\n', capture_output=True, text=True,
+                   check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Import time and launch-to-exit time of the TUI')
+    parser.add_argument('-n', '--runs', type=int, default=5)
+    parser.add_argument('--module', default='air_company.app')
+    parser.add_argument('--budget-ms', type=float, default=400.0,
+                        help='fail when the median cumulative import time of --module exceeds this')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    runs: List[Dict[str, Tuple[int, int]]] = [import_times(args.module) for _ in range(args.runs)]
+    imported = statistics.median(run[args.module][1] for run in runs) / 1000
+    launched = statistics.median(launch_ms() for _ in range(args.runs))
+
+    last = runs[-1]
+    print(f'{"module":<48} {"self ms":>9} {"cumulative ms":>14}')
+    for name, (own, cumulative) in sorted(last.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f'{name:<48} {own / 1000:9.1f} {cumulative / 1000:14.1f}')
+    print()
+    print(f'import {args.module:<30} {imported:9.1f} ms (median of {args.runs}, budget {args.budget_ms:.0f} ms)')
+    print(f'{"launch and exit":<37} {launched:9.1f} ms')
+    if imported > args.budget_ms:
+        print(f'over budget by {imported - args.budget_ms:.1f} ms', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
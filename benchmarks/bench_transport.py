@@ -0,0 +1,69 @@
+import argparse
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List
+
+import requests as requests
+
+from air_company.transport import Transport
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    body = b'[]'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(call: Callable[[], object], requests_count: int) -> List[float]:
+    samples = []
+    for _ in range(requests_count):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: List[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f'{label:<22} mean {statistics.mean(samples):8.3f} ms   p50 {statistics.median(samples):8.3f} ms   '
+          f'p95 {p95:8.3f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Latency of per-call connections vs the pooled Transport')
+    parser.add_argument('-n', '--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}/api/v1'
+    headers = {'Authorization': 'Token bench'}
+
+    try:
+        transport = Transport(base_url)
+        transport.authorize('bench')
+        transport.get('tickets/')
+
+        report('requests.get', measure(lambda: requests.get(url=f'{base_url}/tickets/', headers=headers),
+                                       args.requests))
+        report('Transport.get (pooled)', measure(lambda: transport.get('tickets/'), args.requests))
+        transport.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
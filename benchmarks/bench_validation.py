@@ -0,0 +1,127 @@
+import argparse
+import datetime
+import timeit
+from dataclasses import dataclass, InitVar, field
+from typing import Any
+
+from typeguard import typechecked
+from valid8 import validate
+
+from air_company.domain import Ticket, Author, Name, Surname, Departure, Destination, Price, DepartureDateTime, \
+    TimeFlight
+from validation import engine
+from validation.dataclasses import validate_dataclass
+from validation.regex import pattern
+
+DEPARTURE = datetime.datetime.now() + datetime.timedelta(days=30)
+
+
+def build_ticket() -> Ticket:
+    return Ticket(1, Author(1), Name('Santino'), Surname('Locanto'), Departure('Crotone'),
+                  Destination('Lamezia Terme'), Price.create(15, 20), DepartureDateTime(DEPARTURE),
+                  TimeFlight(datetime.time(0, 40)))
+
+
+@typechecked
+@dataclass(frozen=True, order=True)
+class LegacyAuthor:
+    value: int
+
+    def __post_init__(self):
+        validate_dataclass(self)
+        validate('value', self.value)
+
+
+@typechecked
+@dataclass(frozen=True, order=True)
+class LegacyText:
+    value: str
+
+    def __post_init__(self):
+        validate_dataclass(self)
+        validate('value', self.value, min_len=1, max_len=50, custom=pattern(r'^[A-Z][a-z]*(?:\s[A-Z][a-z]*)*$'))
+
+
+@typechecked
+@dataclass(frozen=True, order=True)
+class LegacyPrice:
+    value_in_cents: int
+    create_key: InitVar[Any] = field(default=None)
+    __create_key = object()
+    __max_value = 100000000000 - 1
+
+    def __post_init__(self, create_key):
+        validate('create_key', create_key, equals=self.__create_key)
+        validate_dataclass(self)
+        validate('value_in_cents', self.value_in_cents, min_value=0, max_value=self.__max_value)
+
+    @staticmethod
+    def create(euro: int, cents: int = 0) -> 'LegacyPrice':
+        validate('euro', euro, min_value=0, max_value=LegacyPrice.__max_value // 100)
+        validate('cents', cents, min_value=0, max_value=99)
+        return LegacyPrice(euro * 100 + cents, LegacyPrice.__create_key)
+
+
+@typechecked
+@dataclass(frozen=True, order=True)
+class LegacyDepartureDateTime:
+    value: datetime.datetime
+
+    def __post_init__(self):
+        validate_dataclass(self)
+        validate('value', self.value, min_value=datetime.datetime.now())
+
+
+@typechecked
+@dataclass(frozen=True, order=True)
+class LegacyTimeFlight:
+    value: datetime.time
+
+    def __post_init__(self):
+        validate_dataclass(self)
+        validate('value', self.value, min_value=datetime.time(0, 30))
+
+
+@typechecked
+@dataclass(frozen=True, order=True)
+class LegacyTicket:
+    id: int
+    author: LegacyAuthor
+    name: LegacyText
+    surname: LegacyText
+    departure: LegacyText
+    destination: LegacyText
+    price: LegacyPrice
+    departureDateTime: LegacyDepartureDateTime
+    timeFlight: LegacyTimeFlight
+
+    def __post_init__(self):
+        validate_dataclass(self)
+
+
+def build_legacy_ticket() -> LegacyTicket:
+    return LegacyTicket(1, LegacyAuthor(1), LegacyText('Santino'), LegacyText('Locanto'), LegacyText('Crotone'),
+                        LegacyText('Lamezia Terme'), LegacyPrice.create(15, 20), LegacyDepartureDateTime(DEPARTURE),
+                        LegacyTimeFlight(datetime.time(0, 40)))
+
+
+def per_call_us(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cost of a fully validated Ticket construction')
+    parser.add_argument('-n', '--number', type=int, default=2000)
+    args = parser.parse_args()
+
+    legacy = per_call_us(build_legacy_ticket, args.number)
+    print(f'{"legacy checks":<16} {legacy:9.1f} us/ticket')
+    for mode in engine.MODES:
+        engine.set_mode(mode)
+        compiled = per_call_us(build_ticket, args.number)
+        print(f'{mode:<16} {compiled:9.1f} us/ticket   x{legacy / compiled:.1f}')
+    engine.set_mode(engine.STRICT)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+import json
+from typing import List
+
+from stand_in.generator import generate_tickets
+
+
+def ticket_items(count: int, seed: int = 0) -> List[dict]:
+    return generate_tickets(count, seed)
+
+
+def ticket_payload(count: int, seed: int = 0) -> bytes:
+    return json.dumps(ticket_items(count, seed)).encode()
@@ -0,0 +1,189 @@
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from air_company.app import App
+from air_company.decoder import decode_tickets
+from air_company.domain import AirCompany, Ticket, Author, Name, Surname, Departure, Destination, Price, \
+    DepartureDateTime, TimeFlight
+from air_company.menu import Menu, Description, Entry
+from air_company.view import TicketTable
+from benchmarks.payloads import ticket_items
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    run: Callable[[], object]
+    items: int = 1
+    repeat: int = 5
+
+
+class PayloadResponse:
+    status_code = 200
+    content = b''
+    headers: Dict[str, str] = {}
+
+    def __init__(self, items: List[dict]):
+        self.__items = items
+
+    def json(self) -> List[dict]:
+        return self.__items
+
+
+class PayloadTransport:
+    def __init__(self, items: List[dict]):
+        self.__response = PayloadResponse(items)
+
+    def get(self, path: str, **kwargs) -> PayloadResponse:
+        return self.__response
+
+
+def measure(case: Case) -> Dict[str, float]:
+    case.run()
+    samples = []
+    for _ in range(case.repeat):
+        start = time.perf_counter()
+        case.run()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        'items': case.items,
+        'repeat': case.repeat,
+        'mean_ms': statistics.mean(samples) * 1000,
+        'p50_ms': statistics.median(samples) * 1000,
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        'max_ms': samples[-1] * 1000,
+        'throughput_per_s': case.items / statistics.median(samples),
+    }
+
+
+def filled_air_company(tickets: List[Ticket]) -> AirCompany:
+    res = AirCompany()
+    for ticket in tickets:
+        res.add_ticket(ticket)
+    return res
+
+
+def fetch_tickets(items: List[dict]) -> Callable[[], object]:
+    app = App(transport=PayloadTransport(items))
+    return app.fetch_tickets
+
+
+def sorted_page(air_company: AirCompany, sort: Callable[[], None], count: int) -> Callable[[], object]:
+    def run() -> List[Ticket]:
+        sort()
+        return air_company.page(0, count)
+
+    return run
+
+
+def menu_with_entries(count: int) -> Menu:
+    builder = Menu.Builder(Description('Benchmark menu'))
+    for index in range(1, count):
+        builder.with_entry(Entry.create(str(index), f'Entry {index}'))
+    return builder.with_entry(Entry.create('0', 'Exit', is_exit=True)).build()
+
+
+def cases(sizes: List[int]) -> List[Case]:
+    departure = datetime.datetime.now() + datetime.timedelta(days=30)
+    res = [
+        Case('construct.Name', lambda: [Name('Massimo Pio') for _ in range(1000)], items=1000),
+        Case('construct.Price.parse', lambda: [Price.parse('46.78') for _ in range(1000)], items=1000),
+        Case('construct.DepartureDateTime', lambda: [DepartureDateTime(departure) for _ in range(1000)], items=1000),
+        Case('construct.Ticket', lambda: [Ticket(1, Author(1), Name('Santino'), Surname('Locanto'),
+                                                 Departure('Crotone'), Destination('Lamezia Terme'),
+                                                 Price.create(15, 20), DepartureDateTime(departure),
+                                                 TimeFlight(datetime.time(0, 40))) for _ in range(1000)],
+             items=1000),
+        Case('menu.build', lambda: menu_with_entries(10), items=1, repeat=50),
+    ]
+    menu = menu_with_entries(10)
+    res.append(Case('menu.dispatch', lambda: [menu.dispatch('5') for _ in range(1000)], items=1000))
+
+    for size in sizes:
+        items = ticket_items(size)
+        repeat = 1 if size >= 100000 else 3
+        res.append(Case(f'fetch_tickets.{size}', fetch_tickets(items), items=size, repeat=repeat))
+
+        tickets = decode_tickets(items)
+        air_company = filled_air_company(tickets)
+        res.append(Case(f'air_company.add_tickets.{size}', lambda t=tickets: filled_air_company(t), items=size,
+                        repeat=repeat))
+
+        table = TicketTable(air_company)
+        res.append(Case(f'sorted_page.price.{size}',
+                        sorted_page(air_company, air_company.sort_by_price, table.page_size), items=table.page_size,
+                        repeat=50))
+        res.append(Case(f'sorted_page.departure_date.{size}',
+                        sorted_page(air_company, air_company.sort_by_departure_date, table.page_size),
+                        items=table.page_size, repeat=50))
+        res.append(Case(f'render.page.{size}', table.render, items=table.page_size, repeat=20))
+        res.append(Case(f'render.all.{size}', lambda a=air_company, t=table: t.render_tickets(
+            a.ticket(index) for index in range(a.tickets())), items=size, repeat=repeat))
+    return res
+
+
+def compare(before: dict, after: dict, threshold: float) -> List[str]:
+    regressions = []
+    print(f'{"benchmark":<42} {"before ms":>12} {"after ms":>12} {"ratio":>8}')
+    for name, result in after['results'].items():
+        previous = before['results'].get(name)
+        if previous is None:
+            print(f'{name:<42} {"-":>12} {result["p50_ms"]:12.3f} {"new":>8}')
+            continue
+        ratio = result['p50_ms'] / previous['p50_ms'] if previous['p50_ms'] else float('inf')
+        flag = '  REGRESSION' if ratio > threshold else ''
+        print(f'{name:<42} {previous["p50_ms"]:12.3f} {result["p50_ms"]:12.3f} {ratio:8.2f}{flag}')
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='ReservationFlights TUI benchmark suite')
+    parser.add_argument('-o', '--output', help='write results as JSON to this file')
+    parser.add_argument('-c', '--compare', help='JSON results of a previous run to compare against')
+    parser.add_argument('-k', '--filter', default='', help='only run benchmarks whose name contains this text')
+    parser.add_argument('--sizes', nargs='*', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('-q', '--quick', action='store_true', help='only run the smallest payload size')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='p50 ratio above which a benchmark is reported as a regression')
+    args = parser.parse_args(argv)
+    sizes = sorted(args.sizes)[:1] if args.quick else args.sizes
+
+    results = {}
+    for case in cases(sizes):
+        if args.filter not in case.name:
+            continue
+        results[case.name] = measure(case)
+        print(f'{case.name:<42} p50 {results[case.name]["p50_ms"]:10.3f} ms   '
+              f'{results[case.name]["throughput_per_s"]:12.0f}/s', file=sys.stderr)
+
+    report = {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            return 1 if compare(json.load(file), report, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import argparse
+
+from stand_in.server import Faults, StandInServer, StandInState
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline stand-in for the ReservationFlights API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('-u', '--user', action='append', metavar='USERNAME:PASSWORD',
+                        help='account to create at startup (default demo:demo), can be repeated')
+    parser.add_argument('-n', '--tickets', type=int, default=100, help='number of synthetic tickets to seed')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the ticket generator and fault injection')
+    parser.add_argument('--latency', type=float, default=0.0, help='delay added to every response, in ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra delay up to this many ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests failing on purpose')
+    parser.add_argument('--error-status', type=int, default=503, help='status code of injected failures')
+    parser.add_argument('-v', '--verbose', action='store_true', help='log every request')
+    args = parser.parse_args()
+
+    state = StandInState()
+    for user in args.user or ['demo:demo']:
+        username, _, password = user.partition(':')
+        state.add_user(username, password)
+    state.seed_tickets(args.tickets, args.seed)
+
+    faults = Faults(args.latency / 1000, args.jitter / 1000, args.error_rate, args.error_status, args.seed)
+    server = StandInServer((args.host, args.port), state, faults, args.verbose)
+    print(f'Serving {state.tickets_count()} tickets on {server.base_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+import datetime
+import random
+from typing import List, Sequence
+
+from air_company.decoder import DEPARTURE_DATE_TIME_FORMAT
+
+NAMES = ['Marco', 'Giulia', 'Santino', 'Massimo Pio', 'Giovanni', 'Francesca', 'Luca', 'Chiara']
+SURNAMES = ['Bianchi', 'Rossi', 'Locanto', 'Iorio', 'Rotondaro', 'De Tursi', 'Esposito', 'Romano']
+CITIES = ['Torino', 'Ancona', 'Crotone', 'Lamezia Terme', 'Cosenza', 'Vibo Valentia', 'Roma', 'Milano', 'Napoli',
+          'Bologna', 'Genova', 'Verona', 'Palermo', 'Bari', 'Catania', 'Firenze']
+
+
+def generate_tickets(count: int, seed: int = 0, authors: Sequence[int] = range(1, 50), first_id: int = 1) \
+        -> List[dict]:
+    rnd = random.Random(seed)
+    start = datetime.datetime.now().replace(microsecond=0) + datetime.timedelta(days=1)
+    items = []
+    for id in range(first_id, first_id + count):
+        departure = start + datetime.timedelta(minutes=rnd.randrange(0, 60 * 24 * 365))
+        origin, destination = rnd.sample(CITIES, 2)
+        items.append({
+            'id': id,
+            'author': rnd.choice(authors),
+            'name': rnd.choice(NAMES),
+            'surname': rnd.choice(SURNAMES),
+            'departure': origin,
+            'destination': destination,
+            'price': f'{rnd.randrange(20, 900)}.{rnd.randrange(0, 100):02}',
+            'departureDateTime': departure.strftime(DEPARTURE_DATE_TIME_FORMAT),
+            'timeFlight': f'{rnd.randrange(0, 12):02}:{rnd.choice([30, 45, 50]):02}:00',
+        })
+    return items
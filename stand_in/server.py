@@ -0,0 +1,354 @@
+import datetime
+import json
+import random
+import re
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from typeguard import typechecked
+from valid8 import ValidationError, validate
+
+from air_company.decoder import DEPARTURE_DATE_TIME_FORMAT, TIME_FLIGHT_FORMAT, decode_ticket
+from stand_in.generator import generate_tickets
+
+API_PREFIX = '/api/v1/'
+TICKET_FIELDS = ('name', 'surname', 'departure', 'destination', 'price', 'departureDateTime', 'timeFlight')
+
+
+@typechecked
+@dataclass(frozen=True)
+class Faults:
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        validate('latency', self.latency, min_value=0.0)
+        validate('jitter', self.jitter, min_value=0.0)
+        validate('error_rate', self.error_rate, min_value=0.0, max_value=1.0)
+        validate('error_status', self.error_status, min_value=400, max_value=599)
+
+
+@dataclass
+class User:
+    id: int
+    username: str
+    email: str
+    password: str
+
+
+def normalize_ticket(body: dict, id: int, author: int) -> dict:
+    item = {key: str(body[key]).strip() for key in TICKET_FIELDS}
+    departure = datetime.datetime.fromisoformat(item['departureDateTime'].rstrip('Z'))
+    item['departureDateTime'] = departure.replace(tzinfo=None).strftime(DEPARTURE_DATE_TIME_FORMAT)
+    item['timeFlight'] = datetime.time.fromisoformat(item['timeFlight']).strftime(TIME_FLIGHT_FORMAT)
+    item['id'] = id
+    item['author'] = author
+    decode_ticket(item)
+    return item
+
+
+@typechecked
+class StandInState:
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__users: Dict[str, User] = {}
+        self.__tokens: Dict[str, str] = {}
+        self.__tickets: Dict[int, dict] = {}
+        self.__next_id = 1
+        self.__version = 0
+        self.__payload: Optional[bytes] = None
+
+    def add_user(self, username: str, password: str, email: str = '') -> User:
+        with self.__lock:
+            validate('username', username, min_len=1, custom=lambda v: v not in self.__users)
+            user = User(len(self.__users) + 1, username, email or f'{username}@example.com', password)
+            self.__users[username] = user
+            return user
+
+    def seed_tickets(self, count: int, seed: int = 0) -> None:
+        with self.__lock:
+            authors = [user.id for user in self.__users.values()] or [1]
+            for item in generate_tickets(count, seed, authors, self.__next_id):
+                self.__tickets[item['id']] = item
+            self.__next_id += count
+            self.__changed()
+
+    def login(self, username: str, password: str) -> Optional[str]:
+        with self.__lock:
+            user = self.__users.get(username)
+            if user is None or user.password != password:
+                return None
+            key = secrets.token_hex(20)
+            self.__tokens[key] = username
+            return key
+
+    def logout(self, key: str) -> None:
+        with self.__lock:
+            self.__tokens.pop(key, None)
+
+    def user_of(self, key: Optional[str]) -> Optional[User]:
+        with self.__lock:
+            username = self.__tokens.get(key) if key is not None else None
+            return self.__users.get(username) if username is not None else None
+
+    def user(self, username: str) -> Optional[User]:
+        with self.__lock:
+            return self.__users.get(username)
+
+    def tickets(self) -> Tuple[bytes, str]:
+        with self.__lock:
+            if self.__payload is None:
+                self.__payload = json.dumps(list(self.__tickets.values())).encode()
+            return self.__payload, f'"{self.__version}"'
+
+    def ticket(self, id: int) -> Optional[dict]:
+        with self.__lock:
+            return self.__tickets.get(id)
+
+    def tickets_count(self) -> int:
+        with self.__lock:
+            return len(self.__tickets)
+
+    def create_ticket(self, body: dict, author: int) -> dict:
+        with self.__lock:
+            item = normalize_ticket(body, self.__next_id, author)
+            self.__tickets[item['id']] = item
+            self.__next_id += 1
+            self.__changed()
+            return item
+
+    def update_ticket(self, id: int, body: dict) -> dict:
+        with self.__lock:
+            item = normalize_ticket(body, id, self.__tickets[id]['author'])
+            self.__tickets[id] = item
+            self.__changed()
+            return item
+
+    def delete_ticket(self, id: int) -> None:
+        with self.__lock:
+            del self.__tickets[id]
+            self.__changed()
+
+    def __changed(self) -> None:
+        self.__version += 1
+        self.__payload = None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server: 'StandInServer'
+
+    def do_GET(self):
+        self.__handle('GET')
+
+    def do_POST(self):
+        self.__handle('POST')
+
+    def do_PUT(self):
+        self.__handle('PUT')
+
+    def do_DELETE(self):
+        self.__handle('DELETE')
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def __handle(self, method: str) -> None:
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        status = self.server.inject_fault()
+        if status is not None:
+            self.__send_json(status, {'detail': 'Injected failure.'})
+            return
+        path = self.path.split('?', 1)[0]
+        if not path.startswith(API_PREFIX):
+            self.__send_json(404, {'detail': 'Not found.'})
+            return
+        for route_method, route, handler in ROUTES:
+            match = route.fullmatch(path[len(API_PREFIX):])
+            if match is not None and route_method == method:
+                handler(self, self.__parse_body(body), *match.groups())
+                return
+        self.__send_json(404, {'detail': 'Not found.'})
+
+    def __parse_body(self, body: bytes) -> dict:
+        if not body:
+            return {}
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            try:
+                res = json.loads(body)
+            except ValueError:
+                return {}
+            return res if isinstance(res, dict) else {}
+        return dict(parse_qsl(body.decode('utf-8', 'replace')))
+
+    def __token(self) -> Optional[str]:
+        scheme, _, key = self.headers.get('Authorization', '').partition(' ')
+        return key if scheme == 'Token' and key else None
+
+    def __authenticated(self) -> Optional[User]:
+        user = self.server.state.user_of(self.__token())
+        if user is None:
+            self.__send_json(401, {'detail': 'Authentication credentials were not provided.'})
+        return user
+
+    def __send_json(self, status: int, obj, headers: Optional[Dict[str, str]] = None) -> None:
+        self.__send(status, json.dumps(obj).encode() if obj is not None else b'', headers)
+
+    def __send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        if body:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def login(self, body: dict) -> None:
+        key = self.server.state.login(body.get('username', ''), body.get('password', ''))
+        if key is None:
+            self.__send_json(400, {'non_field_errors': ['Unable to log in with provided credentials.']})
+        else:
+            self.__send_json(200, {'key': key})
+
+    def registration(self, body: dict) -> None:
+        username, password = body.get('username', ''), body.get('password1', '')
+        if not password or password != body.get('password2'):
+            self.__send_json(400, {'password2': ["The two password fields didn't match."]})
+            return
+        try:
+            self.server.state.add_user(username, password, body.get('email', ''))
+        except ValidationError:
+            self.__send_json(400, {'username': ['A user with that username already exists.']})
+            return
+        self.__send_json(201, {'key': self.server.state.login(username, password)})
+
+    def logout(self, body: dict) -> None:
+        token = self.__token()
+        if token is not None:
+            self.server.state.logout(token)
+        self.__send_json(200, {'detail': 'Successfully logged out.'})
+
+    def user_id(self, body: dict, username: str) -> None:
+        if self.__authenticated() is None:
+            return
+        user = self.server.state.user(username)
+        if user is None:
+            self.__send_json(404, {'detail': 'Not found.'})
+        else:
+            self.__send_json(200, {'id': user.id})
+
+    def tickets(self, body: dict) -> None:
+        if self.__authenticated() is None:
+            return
+        payload, etag = self.server.state.tickets()
+        if self.headers.get('If-None-Match') == etag:
+            self.__send(304, b'', {'ETag': etag})
+        else:
+            self.__send(200, payload, {'ETag': etag})
+
+    def create_ticket(self, body: dict) -> None:
+        user = self.__authenticated()
+        if user is None:
+            return
+        try:
+            self.__send_json(201, self.server.state.create_ticket(body, user.id))
+        except (KeyError, TypeError, ValueError, ValidationError) as e:
+            self.__send_json(400, {'detail': str(e)})
+
+    def ticket(self, body: dict, id: str) -> None:
+        if self.__authenticated() is None:
+            return
+        item = self.server.state.ticket(int(id))
+        if item is None:
+            self.__send_json(404, {'detail': 'Not found.'})
+        else:
+            self.__send_json(200, item)
+
+    def update_ticket(self, body: dict, id: str) -> None:
+        if self.__owned(int(id)):
+            try:
+                self.__send_json(200, self.server.state.update_ticket(int(id), body))
+            except (KeyError, TypeError, ValueError, ValidationError) as e:
+                self.__send_json(400, {'detail': str(e)})
+
+    def delete_ticket(self, body: dict, id: str) -> None:
+        if self.__owned(int(id)):
+            try:
+                self.server.state.delete_ticket(int(id))
+            except KeyError:
+                self.__send_json(404, {'detail': 'Not found.'})
+                return
+            self.__send_json(204, None)
+
+    def __owned(self, id: int) -> bool:
+        user = self.__authenticated()
+        if user is None:
+            return False
+        item = self.server.state.ticket(id)
+        if item is None:
+            self.__send_json(404, {'detail': 'Not found.'})
+            return False
+        if item['author'] != user.id:
+            self.__send_json(403, {'detail': 'You do not have permission to perform this action.'})
+            return False
+        return True
+
+
+ROUTES = [
+    ('POST', re.compile(r'auth/login/?'), StandInHandler.login),
+    ('POST', re.compile(r'auth/registration/?'), StandInHandler.registration),
+    ('POST', re.compile(r'auth/logout/?'), StandInHandler.logout),
+    ('GET', re.compile(r'tickets/idUserLogged/([^/]+)/?'), StandInHandler.user_id),
+    ('GET', re.compile(r'tickets/?'), StandInHandler.tickets),
+    ('POST', re.compile(r'tickets/?'), StandInHandler.create_ticket),
+    ('GET', re.compile(r'tickets/(\d+)/?'), StandInHandler.ticket),
+    ('PUT', re.compile(r'tickets/(\d+)/?'), StandInHandler.update_ticket),
+    ('DELETE', re.compile(r'tickets/(\d+)/?'), StandInHandler.delete_ticket),
+]
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int] = ('127.0.0.1', 8000), state: Optional[StandInState] = None,
+                 faults: Faults = Faults(), verbose: bool = False):
+        super().__init__(address, StandInHandler)
+        self.state = state if state is not None else StandInState()
+        self.faults = faults
+        self.verbose = verbose
+        self.__random = random.Random(faults.seed)
+        self.__lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}{API_PREFIX.rstrip("/")}'
+
+    def inject_fault(self) -> Optional[int]:
+        with self.__lock:
+            delay = self.faults.latency + self.__random.uniform(0, self.faults.jitter) if self.faults.jitter \
+                else self.faults.latency
+            failed = self.faults.error_rate > 0 and self.__random.random() < self.faults.error_rate
+        if delay:
+            time.sleep(delay)
+        return self.faults.error_status if failed else None
+
+    def start(self, poll_interval: float = 0.05) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, args=(poll_interval,), daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,152 @@
+import datetime
+import json
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.app import App
+from air_company.bulk import read_rows, parse_row, parse_selection, import_tickets, delete_tickets, CREATED, INVALID, \
+    REMOVED, FORBIDDEN, NOT_FOUND, FAILED
+from air_company.decoder import decode_tickets
+from air_company.transport import Transport
+from stand_in.server import Faults, StandInServer
+
+
+def row(**overrides) -> dict:
+    departure = datetime.datetime.now() + datetime.timedelta(days=2)
+    res = {'name': 'Santino', 'surname': 'Locanto', 'departure': 'Crotone', 'destination': 'Torino',
+           'price': '46.78', 'departureDateTime': departure.strftime('%d/%m/%Y %H:%M'), 'timeFlight': '01:30'}
+    res.update(overrides)
+    return res
+
+
+def logged_in(server: StandInServer) -> Transport:
+    transport = Transport(server.base_url)
+    transport.authorize(transport.post('auth/login/', data={'username': 'mario', 'password': 'secret'}).json()['key'])
+    return transport
+
+
+def test_read_rows(tmp_path):
+    path = tmp_path / 'tickets.csv'
+    path.write_text('name,surname,departure,destination,price,departureDateTime,timeFlight\n'
+                    'Santino,Locanto,Crotone,Torino,46.78,01/01/2100 10:00,01:30\n'
+                    'Marco,Rossi\n')
+    rows = list(read_rows(str(path)))
+    assert [number for number, _ in rows] == [1, 2]
+    assert rows[0][1]['price'] == '46.78'
+    assert rows[1][1]['price'] is None
+
+    path = tmp_path / 'tickets.json'
+    path.write_text(json.dumps([row(), row(name='Marco')]))
+    assert [item['name'] for _, item in read_rows(str(path))] == ['Santino', 'Marco']
+
+    with patch('air_company.bulk.CHUNK_SIZE', 7):
+        assert [(number, item['name']) for number, item in read_rows(str(path))] == [(1, 'Santino'), (2, 'Marco')]
+    path.write_text(json.dumps([row(), row(name='Marco')])[:-40])
+    rows = read_rows(str(path))
+    assert next(rows)[0] == 1
+    with pytest.raises(ValueError):
+        next(rows)
+    path.write_text('{}')
+    with pytest.raises(ValueError):
+        list(read_rows(str(path)))
+
+    path = tmp_path / 'tickets.jsonl'
+    path.write_text(json.dumps(row()) + '\n\n{broken\n')
+    assert [number for number, _ in read_rows(str(path))] == [1, 2]
+
+    with pytest.raises(ValidationError):
+        list(read_rows(str(tmp_path / 'tickets.xml')))
+
+
+def test_parse_row():
+    name, surname, departure, destination, price, departureDateTime, timeFlight = parse_row(row(price=46))
+    assert str(price) == '46.00'
+    assert timeFlight.value == datetime.time(1, 30)
+    assert parse_row(row(departureDateTime='2100-01-01T10:00:00Z'))[5].value == datetime.datetime(2100, 1, 1, 10)
+    with pytest.raises(KeyError):
+        parse_row({'name': 'Santino'})
+    with pytest.raises(ValidationError):
+        parse_row(row(name='santino'))
+    with pytest.raises(ValueError):
+        parse_row(row(timeFlight='soon'))
+    with pytest.raises(ValueError):
+        parse_row('{broken')
+
+
+def test_import_tickets(server):
+    rows = [(1, row()), (2, row(name='marco')), (3, {'name': 'Marco'})] + \
+           [(number, row(price=f'{number}.00')) for number in range(4, 40)]
+    report = import_tickets(logged_in(server), 1, iter(rows), concurrency=4)
+
+    assert report.counts() == {CREATED: 37, INVALID: 2, FAILED: 0}
+    assert [result.row for result in report.results] == list(range(1, 40))
+    assert report.results[2].error == "missing field 'surname'"
+    assert sorted(ticket.id for ticket in report.tickets) == list(range(1, 38))
+    assert server.state.tickets_count() == 37
+    assert not report.is_complete()
+    assert report.render().endswith('37 created, 2 invalid, 0 failed (39 rows)')
+
+
+def test_import_tickets_reports_http_failures(server):
+    transport = logged_in(server)
+    server.faults = Faults(error_rate=1.0, error_status=503)
+    report = import_tickets(transport, 1, iter([(1, row()), (2, row())]), concurrency=2)
+    assert report.counts() == {CREATED: 0, INVALID: 0, FAILED: 2}
+    assert report.results[0].error.startswith('HTTP 503')
+
+
+def test_run_import(server, tmp_path):
+    path = tmp_path / 'tickets.jsonl'
+    path.write_text('\n'.join(json.dumps(row(price=f'{number}.50')) for number in range(1, 11)))
+    report_path = tmp_path / 'report.json'
+    with patch('builtins.print'):
+        app = App(transport=Transport(server.base_url), concurrency=3)
+        assert app.run_import(str(path), 'mario', 'secret', str(report_path))
+        assert not app.run_import(str(path), 'mario', 'wrong')
+    assert json.loads(report_path.read_text())['counts'] == {CREATED: 10, INVALID: 0, FAILED: 0}
+    assert server.state.tickets_count() == 10
+
+
+def test_import_menu_entry(server, tmp_path):
+    path = tmp_path / 'tickets.json'
+    path.write_text(json.dumps([row(), row(name='Marco')]))
+    with patch('builtins.print') as mocked_print, \
+            patch('builtins.input', side_effect=['1', 'mario', 'secret', 'i', str(tmp_path / 'missing.csv'),
+                                                 str(path), '0', '0']):
+        App(transport=Transport(server.base_url)).run()
+    mocked_print.assert_any_call('2 created, 0 invalid, 0 failed (2 rows)')
+    printed = [str(args[0]) for args, _ in mocked_print.call_args_list if args]
+    assert any(line.endswith('Page 1/1 - 2 tickets') for line in printed)
+
+
+def test_parse_selection():
+    assert parse_selection('1,4,7-9', 10) == [1, 4, 7, 8, 9]
+    assert parse_selection(' 3 - 4 , 4,1 ', 10) == [1, 3, 4]
+    with pytest.raises(ValidationError):
+        parse_selection('0', 10)
+    with pytest.raises(ValidationError):
+        parse_selection('5-11', 10)
+    with pytest.raises(ValidationError):
+        parse_selection('5-4', 10)
+    with pytest.raises(ValueError):
+        parse_selection('1,,2', 10)
+
+
+def test_delete_tickets(server):
+    state = server.state
+    state.add_user('luigi', 'secret')
+    state.seed_tickets(6, seed=4)
+    transport = logged_in(server)
+    tickets = decode_tickets(transport.get('tickets/').json())
+    own = [ticket for ticket in tickets if ticket.author.value == 1]
+    others = [ticket for ticket in tickets if ticket.author.value != 1]
+    assert own and others
+    transport.delete(f'tickets/{own[0].id}/')
+
+    report = delete_tickets(transport, enumerate(tickets, start=1), concurrency=3)
+    counts = report.counts()
+    assert counts == {REMOVED: len(own) - 1, FORBIDDEN: len(others), NOT_FOUND: 1, FAILED: 0}
+    assert [result.ticket_id for result in report.results] == [ticket.id for ticket in tickets]
+    assert state.tickets_count() == len(others)
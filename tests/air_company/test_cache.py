@@ -0,0 +1,41 @@
+import pytest
+from valid8 import ValidationError
+
+from air_company.cache import TicketCache, CachedTickets
+
+
+def test_cache_path_cannot_be_empty():
+    with pytest.raises(ValidationError):
+        TicketCache('')
+
+
+def test_cache_default_path_honours_xdg(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert TicketCache.default_path() == str(tmp_path / 'reservation-flights' / 'tickets.sqlite3')
+
+
+def test_cache_store_and_load(tmp_path):
+    cache = TicketCache(str(tmp_path / 'nested' / 'tickets.sqlite3'))
+    assert cache.load('Iorio') is None
+
+    cache.store('Iorio', CachedTickets(b'[]', '"v1"', 'Wed, 21 Oct 2026 07:28:00 GMT'))
+    cache.store('Locanto', CachedTickets(b'[{}]'))
+    assert cache.load('Iorio') == CachedTickets(b'[]', '"v1"', 'Wed, 21 Oct 2026 07:28:00 GMT')
+    assert cache.load('Locanto') == CachedTickets(b'[{}]')
+
+    cache.store('Iorio', CachedTickets(b'[1]', '"v2"'))
+    cache.close()
+    assert TicketCache(cache.path).load('Iorio') == CachedTickets(b'[1]', '"v2"')
+
+
+def test_cache_remove():
+    cache = TicketCache(':memory:')
+    cache.store('Iorio', CachedTickets(b'[]'))
+    cache.remove('Iorio')
+    assert cache.load('Iorio') is None
+
+
+def test_conditional_headers():
+    assert CachedTickets(b'[]').conditional_headers() == {}
+    assert CachedTickets(b'[]', '"v1"', 'Wed, 21 Oct 2026 07:28:00 GMT').conditional_headers() == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 21 Oct 2026 07:28:00 GMT'}
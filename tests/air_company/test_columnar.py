@@ -0,0 +1,117 @@
+import dataclasses
+import datetime
+import io
+import json
+import random
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.app import App
+from air_company.columnar import ColumnarAirCompany, TicketView
+from air_company.decoder import decode_tickets
+from air_company.domain import AirCompany, Price, Ticket
+from air_company.export import ticket_record
+from air_company.transport import Transport
+from air_company.view import TicketTable
+from stand_in.generator import generate_tickets
+
+
+def tickets(count: int, seed: int = 5):
+    return decode_tickets(generate_tickets(count, seed=seed))
+
+
+def assert_same(objects: AirCompany, columnar: ColumnarAirCompany):
+    assert columnar.tickets() == objects.tickets()
+    for sort in (None, 'sort_by_price', 'sort_by_departure_date'):
+        if sort is not None:
+            getattr(objects, sort)()
+            getattr(columnar, sort)()
+        assert list(columnar.iter_tickets()) == list(objects.iter_tickets())
+        for query in ('ro', 'roma', 'lamezia t', 'marco', 'zzz'):
+            assert columnar.search(query) == objects.search(query)
+            assert columnar.search(query, prefix=False) == objects.search(query, prefix=False)
+    low, high = Price.create(100), Price.create(300)
+    assert columnar.tickets_in_price_range(low, high) == objects.tickets_in_price_range(low, high)
+    start = datetime.datetime.now() + datetime.timedelta(days=30)
+    end = start + datetime.timedelta(days=60)
+    assert columnar.tickets_departing_between(start, end) == objects.tickets_departing_between(start, end)
+
+
+def test_columnar_matches_air_company():
+    items = tickets(3000)
+    objects, columnar = AirCompany(), ColumnarAirCompany()
+    for store in (objects, columnar):
+        store.add_tickets(items[:1000])
+        for ticket in items[1000:2000]:
+            store.add_ticket(ticket)
+    assert_same(objects, columnar)
+
+    ids = [ticket.id for ticket in items[:2000]]
+    random.Random(1).shuffle(ids)
+    replacements = [dataclasses.replace(objects.get_by_id(id), price=items[2200].price) for id in ids[1200:1300]]
+    for store in (objects, columnar):
+        for id in ids[:300]:
+            store.remove_by_id(id)
+        store.remove_by_ids(ids[300:1200])
+        store.add_tickets(items[2000:2100])
+        for ticket in replacements:
+            store.replace_by_id(ticket)
+        for _ in range(50):
+            store.remove_ticket(0)
+    assert_same(objects, columnar)
+
+
+def test_columnar_validation():
+    columnar = ColumnarAirCompany()
+    items = tickets(3)
+    columnar.add_tickets(items[:2])
+    with pytest.raises(ValidationError):
+        columnar.add_ticket(items[0])
+    with pytest.raises(ValidationError):
+        columnar.add_tickets([items[2], items[2]])
+    with pytest.raises(ValidationError):
+        columnar.remove_by_ids([items[0].id, 99])
+    with pytest.raises(ValidationError):
+        columnar.ticket(2)
+    assert columnar.tickets() == 2
+    columnar.clear()
+    assert columnar.tickets() == 0 and list(columnar.iter_tickets()) == []
+
+
+def test_ticket_view():
+    ticket = tickets(1)[0]
+    columnar = ColumnarAirCompany()
+    columnar.add_ticket(ticket)
+    view = columnar.ticket(0)
+    assert isinstance(view, TicketView) and isinstance(view, Ticket)
+    assert view == ticket and ticket == view and hash(view) == hash(ticket)
+    assert type(view.materialize()) is Ticket and view.materialize() == ticket
+    assert str(view) == str(ticket) and ticket_record(view) == ticket_record(ticket)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        view.id = 3
+    columnar.replace_by_id(dataclasses.replace(ticket, price=Price.create(1)))
+    assert view == ticket and columnar.ticket(0).price == Price.create(1)
+
+
+def test_columnar_table_and_swap():
+    columnar, fresh = ColumnarAirCompany(), ColumnarAirCompany()
+    columnar.add_tickets(tickets(5))
+    fresh.add_tickets(tickets(3, seed=9))
+    objects = AirCompany()
+    objects.add_tickets(tickets(5))
+    assert TicketTable(columnar).render() == TicketTable(objects).render()
+    columnar.sort_by_price()
+    columnar.swap(fresh)
+    assert columnar.order == 'price' and columnar.tickets() == 3 and fresh.tickets() == 5
+
+
+def test_app_with_columnar_store(stand_in):
+    server = stand_in(30)
+    state = server.state
+    out = io.StringIO()
+    app = App(transport=Transport(server.base_url), columnar=True)
+    assert app.run_script(['1 mario secret', '5', 'n', '2 1,3-4', '7 Roma', '0', '0'], out)
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert results[3]['output'][-1] == '3 removed, 0 forbidden, 0 not found, 0 failed (3 tickets)'
+    assert state.tickets_count() == 27
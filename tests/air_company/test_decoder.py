@@ -0,0 +1,137 @@
+import datetime
+import json
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.decoder import parse_departure_date_time, parse_time_flight, parse_price, decode_ticket, Interner, \
+    decode_payload, decode_records, RawTicket
+from air_company.domain import Name, Price, AirCompany
+
+
+def test_parse_departure_date_time():
+    assert parse_departure_date_time('2030-12-26T12:05:09Z') == datetime.datetime(2030, 12, 26, 12, 5, 9)
+
+
+def test_parse_departure_date_time_matches_strptime_errors():
+    for value in ['"23-12-26T12:12:12Z', '2030-12-26 12:05:09', '2030-13-26T12:05:09Z', '2030-12-26T12:05:09',
+                  '2030-1a-26T12:05:09Z', '']:
+        with pytest.raises(ValueError):
+            parse_departure_date_time(value)
+
+
+def test_parse_time_flight():
+    assert parse_time_flight('01:30:00') == datetime.time(1, 30)
+    assert parse_time_flight('1:30:00') == datetime.time(1, 30)
+    for value in ['25:00:00', '01:30', '0a:30:00']:
+        with pytest.raises(ValueError):
+            parse_time_flight(value)
+
+
+def test_parse_price():
+    assert parse_price('46.78') == Price.create(46, 78)
+    assert parse_price('46') == Price.create(46)
+    assert parse_price('0.05') == Price.create(0, 5)
+
+
+def test_parse_price_wrong_values():
+    for value in ['-1', '1.2', '1.234', 'a', '1' * 12]:
+        with pytest.raises((ValueError, ValidationError)):
+            parse_price(value)
+
+
+def ticket_dict(id):
+    departure = datetime.datetime.now() + datetime.timedelta(days=10)
+    return {'id': id, 'author': 2, 'name': 'Marco', 'surname': 'Bianchi', 'departure': 'Torino',
+            'destination': 'Ancona', 'price': '46.78', 'departureDateTime': departure.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'timeFlight': '01:00:00'}
+
+
+def test_decode_ticket():
+    item = ticket_dict(7)
+    ticket = decode_ticket(item)
+    assert ticket.id == 7
+    assert ticket.author.value == 2
+    assert ticket.name.value == 'Marco'
+    assert ticket.price == Price.create(46, 78)
+    assert ticket.departureDateTime.value == datetime.datetime.strptime(item['departureDateTime'], '%Y-%m-%dT%H:%M:%SZ')
+    assert ticket.timeFlight.value == datetime.time(1, 0)
+
+
+def test_decode_payload():
+    tickets = decode_payload(json.dumps([ticket_dict(1), ticket_dict(2)]))
+    assert [ticket.id for ticket in tickets] == [1, 2]
+
+
+def test_decoded_values_are_interned():
+    first, second = decode_payload(json.dumps([ticket_dict(1), ticket_dict(2)]))
+    assert first.name is second.name and first.departure is second.departure
+    assert first.destination is second.destination and first.surname is second.surname
+
+
+def test_interner_evicts_least_recently_used():
+    interner = Interner(Name, max_size=2)
+    marco = interner('Marco')
+    interner('Luca')
+    assert interner('Marco') is marco
+    interner('Chiara')
+    assert len(interner) == 2 and interner('Marco') is marco
+    assert (interner.hits, interner.misses) == (2, 3)
+    interner('Luca')
+    assert interner.misses == 4
+    with pytest.raises(ValidationError):
+        interner('marco')
+    assert len(interner) == 2
+    interner.clear()
+    assert len(interner) == 0 and interner.hits == 0
+    with pytest.raises(ValidationError):
+        Interner(Name, max_size=0)
+
+
+def test_raw_ticket_keys():
+    item = dict(ticket_dict(3), price='1234.05')
+    record = RawTicket(item)
+    assert (record.id, record.price_in_cents) == (3, 123405)
+    assert record.texts == ('Marco', 'Bianchi', 'Torino', 'Ancona')
+    assert record.materialize() == decode_ticket(item)
+    for key, value in [('price', 'abc'), ('departureDateTime', 'tomorrow'), ('name', 7), ('name', 'marco'),
+                       ('departureDateTime', '2020-01-01T00:00:00Z'), ('timeFlight', '00:10:00')]:
+        with pytest.raises((TypeError, ValueError, ValidationError)):
+            RawTicket(dict(item, **{key: value}))
+    with pytest.raises(KeyError):
+        RawTicket({'id': 1})
+
+
+def test_airCompany_materializes_records_on_access():
+    items = [dict(ticket_dict(1), price='30.00', name='Luca'), dict(ticket_dict(2), price='10.00'),
+             dict(ticket_dict(3), price='20.00')]
+    dropped = []
+    airCompany = AirCompany(on_drop=dropped.append)
+    airCompany.add_records(decode_records(items))
+    items[2]['name'] = 'marco'
+    airCompany.sort_by_price()
+    assert not any(airCompany.is_materialized(id) for id in (1, 2, 3))
+    assert airCompany.ticket(0).id == 1
+    assert airCompany.is_materialized(1) and not airCompany.is_materialized(2)
+    assert [ticket.id for ticket in airCompany.search('luc')] == [1] and not airCompany.is_materialized(2)
+    assert airCompany.get_by_id(1) is airCompany.ticket(0)
+    assert airCompany.ticket(1).id == 2 and dropped == [3] and not airCompany.has_id(3)
+    assert [ticket.id for ticket in airCompany.iter_tickets()] == [1, 2]
+    airCompany.sort_by_departure_date()
+    assert airCompany.tickets() == 2 and airCompany.get_by_id(2).id == 2 and airCompany.is_materialized(2)
+
+
+def test_airCompany_drops_records_that_fail_to_materialize():
+    items = [dict(ticket_dict(id), price=f'{id}0.00') for id in range(1, 6)]
+    dropped = []
+    airCompany = AirCompany(on_drop=dropped.append)
+    airCompany.add_records(decode_records(items))
+    for id in (2, 4, 5):
+        items[id - 1]['departureDateTime'] = '2020-01-01T00:00:00Z'
+    assert [ticket.id for ticket in airCompany.search('marco')] == [1, 3] and dropped == [2, 4, 5]
+    with pytest.raises(ValidationError):
+        airCompany.get_by_id(2)
+    items[2]['name'] = 'marco'
+    assert airCompany.tickets_in_price_range(Price.create(0), Price.create(100)) == [airCompany.ticket(0)]
+    assert [ticket.id for ticket in airCompany.iter_tickets()] == [1]
+    assert dropped == [2, 4, 5, 3] and airCompany.tickets() == 1
@@ -211,4 +211,193 @@ def test_sort_price():
                      TimeFlight(datetime.time(0, 50)))
     airCompany.add_ticket(ticket2)
     airCompany.sort_by_price()
-    assert airCompany.ticket(0) == ticket2
\ No newline at end of file
+    assert airCompany.ticket(0) == ticket2
+
+def make_ticket(id: int, euro: int = 15, days: int = 1) -> Ticket:
+    return Ticket(id, Author(id), Name("Santino"), Surname("Locanto"), Departure("Crotone"), Destination("Lamezia Terme"),
+                  Price.create(euro), DepartureDateTime(datetime.datetime.now() + timedelta(days=days)),
+                  TimeFlight(datetime.time(0, 40)))
+
+
+def test_airCompany_replace_by_id():
+    airCompany = AirCompany()
+    for id in range(1, 4):
+        airCompany.add_ticket(make_ticket(id))
+
+    updated = make_ticket(2, euro=99)
+    airCompany.replace_by_id(updated)
+    assert airCompany.tickets() == 3
+    assert airCompany.ticket(1) == updated
+
+    with pytest.raises(ValidationError):
+        airCompany.replace_by_id(make_ticket(4))
+
+
+def test_airCompany_remove_by_id():
+    airCompany = AirCompany()
+    tickets = [make_ticket(id) for id in range(1, 4)]
+    for ticket in tickets:
+        airCompany.add_ticket(ticket)
+
+    airCompany.remove_by_id(2)
+    assert airCompany.tickets() == 2
+    assert airCompany.ticket(1) == tickets[2]
+
+    with pytest.raises(ValidationError):
+        airCompany.remove_by_id(2)
+
+
+def test_airCompany_remove_by_ids():
+    airCompany = AirCompany()
+    for id, euro in enumerate([10, 30, 20, 40], start=1):
+        airCompany.add_ticket(make_ticket(id, euro=euro))
+    airCompany.sort_by_price()
+
+    with pytest.raises(ValidationError):
+        airCompany.remove_by_ids([1, 5])
+    assert airCompany.tickets() == 4
+
+    airCompany.remove_by_ids(iter([1, 4]))
+    assert [airCompany.ticket(i).id for i in range(airCompany.tickets())] == [2, 3]
+    assert not airCompany.has_id(4)
+    assert [ticket.id for ticket in airCompany.search('lamezia')] == [2, 3]
+    airCompany.remove_by_ids([2, 3])
+    assert airCompany.search('lamezia') == []
+
+
+def test_airCompany_sorted_views_match_descending_sorts():
+    tickets = [make_ticket(id, euro=euro, days=days)
+               for id, (euro, days) in enumerate([(30, 5), (10, 9), (30, 2), (50, 9), (20, 1)], start=1)]
+    airCompany = AirCompany()
+    for ticket in tickets:
+        airCompany.add_ticket(ticket)
+
+    airCompany.sort_by_price()
+    assert [airCompany.ticket(i) for i in range(airCompany.tickets())] == \
+           sorted(tickets, key=lambda x: x.price, reverse=True)
+
+    airCompany.sort_by_departure_date()
+    assert [airCompany.ticket(i) for i in range(airCompany.tickets())] == \
+           sorted(tickets, key=lambda x: x.departureDateTime, reverse=True)
+
+
+def test_airCompany_add_and_remove_keep_sort_order():
+    airCompany = AirCompany()
+    for id, euro in enumerate([10, 30, 20], start=1):
+        airCompany.add_ticket(make_ticket(id, euro=euro))
+    airCompany.sort_by_price()
+
+    airCompany.add_ticket(make_ticket(4, euro=25))
+    assert [airCompany.ticket(i).id for i in range(airCompany.tickets())] == [2, 4, 3, 1]
+
+    airCompany.remove_ticket(1)
+    assert [airCompany.ticket(i).id for i in range(airCompany.tickets())] == [2, 3, 1]
+
+    airCompany.replace_by_id(make_ticket(1, euro=99))
+    assert [airCompany.ticket(i).id for i in range(airCompany.tickets())] == [1, 2, 3]
+
+
+def test_airCompany_get_by_id():
+    airCompany = AirCompany()
+    tickets = [make_ticket(id) for id in range(1, 4)]
+    for ticket in tickets:
+        airCompany.add_ticket(ticket)
+
+    assert airCompany.get_by_id(2) == tickets[1]
+    assert airCompany.has_id(3)
+    assert not airCompany.has_id(4)
+    with pytest.raises(ValidationError):
+        airCompany.get_by_id(4)
+
+    airCompany.remove_ticket(0)
+    assert not airCompany.has_id(1)
+    airCompany.clear()
+    assert not airCompany.has_id(2)
+
+
+def test_airCompany_rejects_duplicate_ids():
+    airCompany = AirCompany()
+    airCompany.add_ticket(make_ticket(1))
+    with pytest.raises(ValidationError):
+        airCompany.add_ticket(make_ticket(1, euro=20))
+
+
+def test_airCompany_search():
+    airCompany = AirCompany()
+    airCompany.add_ticket(make_ticket(1, euro=10))
+    airCompany.add_ticket(Ticket(2, Author(2), Name("Massimo Pio"), Surname("Iorio"), Departure("Ciampino"),
+                                 Destination("Lamezia Terme"), Price.create(20),
+                                 DepartureDateTime(datetime.datetime.now() + timedelta(days=1)),
+                                 TimeFlight(datetime.time(0, 40))))
+    airCompany.sort_by_price()
+
+    assert [t.id for t in airCompany.search('lamezia terme', prefix=False)] == [2, 1]
+    assert [t.id for t in airCompany.search('Terme')] == [2, 1]
+    assert [t.id for t in airCompany.search('cia')] == [2]
+    assert [t.id for t in airCompany.search('pio', prefix=False)] == [2]
+    assert airCompany.search('cia', prefix=False) == []
+    with pytest.raises(ValidationError):
+        airCompany.search('  ')
+
+
+def test_airCompany_search_index_follows_mutations():
+    airCompany = AirCompany()
+    airCompany.add_ticket(make_ticket(1))
+    assert [t.id for t in airCompany.search('crot')] == [1]
+
+    updated = Ticket(1, Author(1), Name("Santino"), Surname("Locanto"), Departure("Scalea"), Destination("Cosenza"),
+                     Price.create(15), DepartureDateTime(datetime.datetime.now() + timedelta(days=1)),
+                     TimeFlight(datetime.time(0, 40)))
+    airCompany.replace_by_id(updated)
+    assert airCompany.search('crot') == []
+    assert airCompany.search('scalea') == [updated]
+
+    airCompany.remove_by_id(1)
+    assert airCompany.search('s') == []
+
+
+def test_airCompany_price_range():
+    airCompany = AirCompany()
+    for id, euro in enumerate([50, 120, 30, 80, 121, 50], start=1):
+        airCompany.add_ticket(make_ticket(id, euro=euro))
+
+    assert [t.id for t in airCompany.tickets_in_price_range(Price.create(50), Price.create(120))] == [2, 4, 1, 6]
+    assert airCompany.tickets_in_price_range(Price.create(200), Price.create(300)) == []
+    with pytest.raises(ValidationError):
+        airCompany.tickets_in_price_range(Price.create(120), Price.create(50))
+
+
+def test_airCompany_departure_range():
+    airCompany = AirCompany()
+    for id, days in enumerate([1, 5, 10, 20], start=1):
+        airCompany.add_ticket(make_ticket(id, days=days))
+
+    now = datetime.datetime.now()
+    assert [t.id for t in airCompany.tickets_departing_between(now + timedelta(days=2), now + timedelta(days=15))] \
+           == [3, 2]
+    assert airCompany.tickets_departing_between(now + timedelta(days=30), now + timedelta(days=40)) == []
+    with pytest.raises(ValidationError):
+        airCompany.tickets_departing_between(now + timedelta(days=2), now)
+
+
+def test_airCompany_iter_tickets_follows_order():
+    airCompany = AirCompany()
+    for id, euro in enumerate([10, 30, 20], start=1):
+        airCompany.add_ticket(make_ticket(id, euro=euro))
+    assert [ticket.id for ticket in airCompany.iter_tickets()] == [1, 2, 3]
+    airCompany.sort_by_price()
+    assert [ticket.id for ticket in airCompany.iter_tickets()] == [2, 3, 1]
+
+
+def test_airCompany_swap_keeps_order():
+    airCompany, fresh = AirCompany(), AirCompany()
+    airCompany.add_ticket(make_ticket(1, euro=10))
+    for id, euro in enumerate([20, 40, 30], start=2):
+        fresh.add_ticket(make_ticket(id, euro=euro))
+    airCompany.sort_by_price()
+    airCompany.swap(fresh)
+    assert [ticket.id for ticket in airCompany.iter_tickets()] == [3, 4, 2]
+    assert [ticket.id for ticket in fresh.iter_tickets()] == [1]
+    assert not airCompany.has_id(1) and airCompany.search('lamezia')
+    airCompany.add_ticket(make_ticket(1, euro=50))
+    assert airCompany.ticket(0).id == 1
@@ -0,0 +1,129 @@
+import json
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.app import App
+from air_company.bulk import read_rows, parse_row
+from air_company.decoder import decode_ticket
+from air_company.export import export, iter_json_array, ticket_records, csv_lines, jsonl_lines, RECORD_FIELDS
+from air_company.transport import Transport
+from stand_in.generator import generate_tickets
+
+
+@pytest.fixture
+def server(stand_in):
+    return stand_in(25, seed=3)
+
+
+def tickets(count: int = 5):
+    return [decode_ticket(obj) for obj in generate_tickets(count, seed=1)]
+
+
+@pytest.mark.parametrize('extension', ['.csv', '.jsonl'])
+def test_export_round_trip(tmp_path, extension):
+    path = tmp_path / f'tickets{extension}'
+    expected = tickets()
+    assert export(ticket_records(expected), str(path)) == 5
+    rows = list(read_rows(str(path)))
+    assert [number for number, _ in rows] == [1, 2, 3, 4, 5]
+    for (_, row), ticket in zip(rows, expected):
+        assert parse_row(row) == (ticket.name, ticket.surname, ticket.departure, ticket.destination, ticket.price,
+                                  ticket.departureDateTime, ticket.timeFlight)
+        assert int(row['id']) == ticket.id
+
+
+def test_export_empty_and_invalid(tmp_path):
+    path = tmp_path / 'empty.csv'
+    assert export([], str(path)) == 0
+    assert path.read_text() == ','.join(RECORD_FIELDS) + '\n'
+    assert list(jsonl_lines([])) == []
+    with pytest.raises(ValidationError):
+        export([], str(tmp_path / 'tickets.json'))
+
+
+def test_lines_are_lazy():
+    records = iter([{'id': 1}, {'id': 2}, {'id': 3}])
+    lines = csv_lines(records)
+    next(lines)
+    assert next(records) == {'id': 2}
+    assert json.loads(next(jsonl_lines([{'id': 4, 'extra': True}]))) == dict(dict.fromkeys(RECORD_FIELDS), id=4)
+
+
+def test_iter_json_array_chunks():
+    items = [{'name': 'Niccolò', 'price': 1.5}, 12, 'é', [1, 2], None, 3.25]
+    data = json.dumps(items, ensure_ascii=False).encode()
+    assert list(iter_json_array([data])) == items
+    assert list(iter_json_array(data[i:i + 1] for i in range(len(data)))) == items
+    assert list(iter_json_array([b' [ ', b'] '])) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array([data[:-1]]))
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"detail": "error"}']))
+
+
+
+@pytest.mark.parametrize('data', [b'[1 2]', b'[,1]', b'[1,,2]', b'[1,]', b'[{"a": 1}{"b": 2}]', b'[{"a" 1}]', b'[x]'])
+def test_iter_json_array_rejects_malformed_arrays(data):
+    for size in (1, 3, len(data)):
+        with pytest.raises(ValueError, match='at character'):
+            list(iter_json_array(data[i:i + size] for i in range(0, len(data), size)))
+
+
+def test_iter_json_array_fails_fast_on_malformed_streams():
+    chunks = []
+
+    def stream():
+        yield b'[1, 2 3'
+        while True:
+            chunks.append(None)
+            yield b', 4' * 1000
+
+    with pytest.raises(ValueError, match='at character 6'):
+        list(iter_json_array(stream()))
+    assert len(chunks) <= 1
+
+
+def test_iter_json_array_keeps_memory_flat():
+    item = json.dumps(generate_tickets(1)[0]).encode()
+
+    def chunks(count: int):
+        yield b'['
+        for number in range(count):
+            yield (b',' if number else b'') + item
+        yield b']'
+
+    def peak(count: int) -> int:
+        tracemalloc.start()
+        try:
+            assert sum(1 for _ in iter_json_array(chunks(count))) == count
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert peak(20000) < 2 * peak(2000)
+
+
+def test_run_export(server, tmp_path):
+    path = tmp_path / 'tickets.jsonl'
+    with patch('builtins.print'):
+        app = App(transport=Transport(server.base_url))
+        assert app.run_export(str(path), 'mario', 'secret')
+        assert not app.run_export(str(path), 'mario', 'wrong')
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row['id'] for row in rows] == list(range(1, 26))
+
+
+def test_export_menu_entry(server, tmp_path):
+    path = tmp_path / 'tickets.csv'
+    query = generate_tickets(25, 3, [1])[0]['destination']
+    expected = sum(query.lower() in (ticket['departure'] + ticket['destination']).lower()
+                   for ticket in generate_tickets(25, 3, [1]))
+    with patch('builtins.print') as mocked_print, \
+            patch('builtins.input', side_effect=['1', 'mario', 'secret', 'e', str(tmp_path / 'tickets.txt'),
+                                                 str(path), query, '0', '0']):
+        App(transport=Transport(server.base_url)).run()
+    mocked_print.assert_any_call(f'{expected} tickets exported to {path}')
+    assert len(list(read_rows(str(path)))) == expected
@@ -0,0 +1,113 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.app import App
+from air_company.instrumentation import Instrumentation, MetricsProbe, Probe, DISABLED, route, bucket_quantile, \
+    LATENCY_BUCKETS
+from air_company.menu import Menu, Description, Entry
+from air_company.transport import Transport
+
+
+def test_route_hides_ids_and_usernames():
+    assert route('tickets/') == 'tickets/'
+    assert route('tickets/42/') == 'tickets/{id}/'
+    assert route('/tickets/42') == 'tickets/{id}'
+    assert route('tickets/idUserLogged/mario') == 'tickets/idUserLogged/{username}'
+
+
+def test_bucket_quantile():
+    buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+    assert bucket_quantile(buckets, 0.5, 0.0) == 0.0
+    buckets[LATENCY_BUCKETS.index(0.01)] = 100
+    assert bucket_quantile(buckets, 0.5, 0.01) == pytest.approx(0.0075)
+    assert bucket_quantile(buckets, 0.99, 0.008) == pytest.approx(0.00797)
+    buckets[-1] = 100
+    assert bucket_quantile(buckets, 0.99, 20.0) == pytest.approx(19.8)
+
+
+def test_disabled_instrumentation_shares_a_noop_span():
+    assert not DISABLED.enabled
+    assert DISABLED.span('http', 'a') is DISABLED.span('action', 'b')
+    with DISABLED.span('http', 'a') as span:
+        span.response(object())
+
+
+def test_probes_are_called_in_nesting_order():
+    calls = []
+
+    class Recorder(Probe):
+        def __init__(self, label):
+            self.label = label
+
+        def begin(self, span):
+            calls.append(('begin', self.label, span.name))
+            return self.label
+
+        def end(self, span, state):
+            calls.append(('end', state, span.failed))
+
+    instrumentation = Instrumentation([Recorder('a'), Recorder('b')])
+    with pytest.raises(KeyError):
+        with instrumentation.span('action', 'x'):
+            raise KeyError('x')
+    assert calls == [('begin', 'a', 'x'), ('begin', 'b', 'x'), ('end', 'b', True), ('end', 'a', True)]
+
+
+def test_metrics_probe_snapshot_and_export(tmp_path):
+    with pytest.raises(ValidationError):
+        MetricsProbe(format='xml')
+
+    path = tmp_path / 'metrics.prom'
+    probe = MetricsProbe(str(path))
+    instrumentation = Instrumentation([probe])
+    for _ in range(3):
+        with instrumentation.span('action', 'Sort by "price"'):
+            pass
+
+    snapshot = probe.snapshot()
+    assert snapshot['action']['Sort by "price"']['count'] == 3
+    latency = snapshot['action']['Sort by "price"']['latency_ms']
+    assert set(latency) == {'sum', 'mean', 'p50', 'p95', 'p99', 'max'}
+    assert latency['p50'] <= latency['p99'] <= latency['max']
+
+    instrumentation.export()
+    text = path.read_text()
+    assert '# TYPE reservation_flights_action_seconds histogram' in text
+    assert 'reservation_flights_action_seconds_bucket{name="Sort by \\"price\\"",le="+Inf"} 3' in text
+    assert 'reservation_flights_action_seconds_count{name="Sort by \\"price\\""} 3' in text
+    assert 'reservation_flights_action_errors_total{name="Sort by \\"price\\""} 0' in text
+
+    path = tmp_path / 'metrics.json'
+    MetricsProbe(str(path)).export()
+    assert json.loads(path.read_text()) == {}
+
+
+def test_menu_dispatch_is_recorded():
+    probe = MetricsProbe()
+    menu = Menu.Builder(Description('a description'), instrumentation=Instrumentation([probe])) \
+        .with_entry(Entry.create('1', 'first entry')) \
+        .with_entry(Entry.create('0', 'exit', is_exit=True)) \
+        .build()
+    menu.dispatch('1')
+    menu.dispatch('1')
+    assert probe.snapshot()['action']['first entry']['count'] == 2
+
+
+@patch('builtins.input', side_effect=['1', 'mario', 'secret', '0', '0'])
+@patch('builtins.print')
+def test_app_exports_http_and_action_metrics(mocked_print, mocked_input, tmp_path, stand_in):
+    server = stand_in(5)
+    path = tmp_path / 'metrics.json'
+    instrumentation = Instrumentation([MetricsProbe(str(path))])
+    App(transport=Transport(server.base_url, instrumentation=instrumentation),
+        instrumentation=instrumentation).run()
+
+    metrics = json.loads(path.read_text())
+    assert set(metrics['http']) == {'POST auth/login/', 'GET tickets/idUserLogged/{username}', 'GET tickets/',
+                                    'POST auth/logout/'}
+    assert metrics['http']['GET tickets/']['bytes'] > 0
+    assert metrics['action']['Login']['count'] == 1
+    assert metrics['action']['Logout']['count'] == 1
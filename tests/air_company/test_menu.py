@@ -113,3 +113,16 @@ def test_menu_selection_on_wrong_key(mocked_print, mocked_input):
     menu.run()
     mocked_print.assert_any_call('Invalid selection. Please, try again...')
     mocked_input.assert_called()
+
+
+def test_menu_dispatch_without_input():
+    selected = []
+    menu = Menu.Builder(Description('a description')) \
+        .with_entry(Entry.create('1', 'first entry', on_selected=lambda: selected.append('1'))) \
+        .with_entry(Entry.create('0', 'exit', is_exit=True)) \
+        .build()
+    assert menu.dispatch(' 1\n') == (False, False)
+    assert selected == ['1']
+    assert menu.dispatch('0') == (True, False)
+    with pytest.raises(KeyError):
+        menu.dispatch('2')
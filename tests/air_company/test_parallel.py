@@ -0,0 +1,66 @@
+import datetime
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.app import App
+from air_company.decoder import decode_tickets, decode_records
+from air_company.domain import AirCompany
+from air_company.parallel import ParallelDecoder, DecodedTicket, decode_rows, chunks
+from air_company.transport import Transport
+from stand_in.generator import generate_tickets
+
+
+def test_chunks():
+    assert list(chunks(list(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunks([], 3)) == []
+
+
+def test_decoded_ticket_materializes_validated_row():
+    items = generate_tickets(5, seed=3)
+    records = [DecodedTicket(row) for row in decode_rows(items)]
+    assert [record.materialize() for record in records] == decode_tickets(items)
+    assert records[0].texts == (items[0]['name'], items[0]['surname'], items[0]['departure'], items[0]['destination'])
+    assert decode_rows(items) == [record.primitives() for record in decode_records(items)]
+    for item in (dict(items[0], name='mario'), dict(items[0], departureDateTime='2000-01-01T00:00:00Z')):
+        with pytest.raises(ValueError):
+            decode_rows([item])
+        with pytest.raises(ValueError):
+            decode_records([item])
+    departed = records[0].row[:7] + (0,) + records[0].row[8:]
+    assert DecodedTicket(departed).materialize().departureDateTime.value == datetime.datetime(1970, 1, 1)
+
+
+def test_parallel_decoder_keeps_server_order():
+    items = generate_tickets(250, seed=7)
+    decoder = ParallelDecoder(2, chunk_size=40)
+    try:
+        records = decoder.decode(items)
+        airCompany = AirCompany()
+        airCompany.add_records(records)
+        assert list(airCompany.iter_tickets()) == decode_tickets(items)
+        with pytest.raises(ValueError):
+            decoder.decode(items[:100] + [dict(items[100], price='-1')] + items[101:])
+    finally:
+        decoder.close()
+    with pytest.raises(ValidationError):
+        ParallelDecoder(0)
+
+
+def test_app_decodes_in_parallel(stand_in):
+    server = stand_in(30)
+    state = server.state
+    surname = json.loads(state.tickets()[0])[17]['surname']
+    out = io.StringIO()
+    app = App(transport=Transport(server.base_url), decode_workers=2)
+    with patch('air_company.parallel.PARALLEL_THRESHOLD', 10), patch('air_company.parallel.PARALLEL_CHUNK', 8), \
+            patch.object(ProcessPoolExecutor, 'map', autospec=True, side_effect=ProcessPoolExecutor.map) as map:
+        assert app.run_script(['1 mario secret', f'7 {surname}', '0', '0'], out)
+    assert map.call_count == 1
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert all(result['ok'] for result in results)
+    assert any(surname in line for line in results[1]['output'])
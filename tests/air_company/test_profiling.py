@@ -0,0 +1,70 @@
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+
+from air_company.app import App
+from air_company.instrumentation import Instrumentation
+from air_company.profiling import ProfileProbe, component
+from air_company.transport import Transport
+
+
+@pytest.fixture
+def probe(tmp_path):
+    return ProfileProbe(str(tmp_path / 'profile'), top=5)
+
+
+def test_component():
+    assert component(('/venv/lib/python3.8/site-packages/typeguard/_functions.py', 1, 'check')) == 'typeguard'
+    assert component(('/venv/lib/python3.8/site-packages/valid8/entry_points.py', 1, 'validate')) == 'valid8'
+    assert component(('/usr/lib/python3.8/_strptime.py', 1, '_strptime')) == 'strptime'
+    assert component(('~', 0, "<built-in method strptime>")) == 'strptime'
+    assert component(('~', 0, "<built-in method builtins.len>")) == 'builtins'
+    assert component(('/root/package/air_company/domain.py', 1, 'add_ticket')) == 'air_company'
+    assert component(('/root/package/main.py', 1, 'main')) == 'other'
+
+
+def test_only_outermost_spans_are_profiled(probe, tmp_path):
+    instrumentation = Instrumentation([probe])
+    with instrumentation.span('action', 'Refresh tickets'):
+        with instrumentation.span('action', 'Fetch tickets'):
+            sorted(str(value) for value in range(1000))
+    with instrumentation.span('http', 'GET tickets/'):
+        pass
+    instrumentation.export()
+
+    directory = tmp_path / 'profile'
+    assert sorted(path.name for path in directory.iterdir()) == \
+           ['0001-refresh-tickets.prof', '0001-refresh-tickets.txt', 'summary.txt']
+    report = (directory / '0001-refresh-tickets.txt').read_text()
+    assert report.startswith('action: Refresh tickets\n')
+    assert 'Top 5 functions by cumulative' in report
+    assert 'Top 5 allocation sites' in report
+    assert 'peak traced memory' in report
+    assert (directory / 'summary.txt').read_text().startswith('Refresh tickets\ncomponent')
+
+
+def test_profile_while_already_tracing_without_reset_peak(probe, tmp_path, monkeypatch):
+    monkeypatch.delattr(tracemalloc, 'reset_peak', raising=False)
+    tracemalloc.start()
+    try:
+        with Instrumentation([probe]).span('action', 'Sort by price'):
+            sorted(str(value) for value in range(1000))
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert 'peak traced memory' in (tmp_path / 'profile' / '0001-sort-by-price.txt').read_text()
+
+
+@patch('builtins.input', side_effect=['1', 'mario', 'secret', '5', '0', '0'])
+@patch('builtins.print')
+def test_profile_a_session(mocked_print, mocked_input, probe, tmp_path, stand_in):
+    server = stand_in(20)
+    instrumentation = Instrumentation([probe])
+    App(transport=Transport(server.base_url, instrumentation=instrumentation),
+        instrumentation=instrumentation).run()
+
+    reports = sorted(path.name for path in (tmp_path / 'profile').glob('*.txt'))
+    assert reports[-1] == 'summary.txt'
+    assert {name.split('-', 1)[1] for name in reports[:-1]} == \
+           {'login.txt', 'fetch-tickets.txt', 'render-tickets.txt', 'sort-by-price.txt', 'logout.txt', 'exit.txt'}
@@ -0,0 +1,140 @@
+import io
+import datetime
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import requests
+
+from air_company.app import App
+from air_company.cache import TicketCache, CachedTickets
+from air_company.refresh import Refresher
+from air_company.transport import Transport
+
+
+@pytest.fixture
+def server(stand_in):
+    return stand_in(4)
+
+
+def counter(fail_on: int = 0):
+    calls = []
+
+    def fetch():
+        calls.append(threading.current_thread().name)
+        if len(calls) == fail_on:
+            raise ConnectionError('offline')
+        return len(calls)
+
+    return fetch, calls
+
+
+def test_refresher_on_request():
+    fetch, calls = counter(fail_on=2)
+    refresher = Refresher(fetch, name='worker')
+    assert not refresher.is_running() and refresher.take() is None
+    refresher.start()
+    assert refresher.wait(1, timeout=2)
+    assert refresher.take() == 1 and refresher.take() is None
+    assert refresher.refresh(timeout=2)
+    assert refresher.take() is None and isinstance(refresher.error, ConnectionError)
+    assert refresher.refresh(timeout=2)
+    assert refresher.take() == 3 and refresher.error is None
+    assert calls == ['worker'] * 3
+    refresher.stop()
+    assert not refresher.is_running() and refresher.wait(10)
+    refresher.start()
+    assert refresher.wait(1, timeout=2) and refresher.completed == 1
+    refresher.stop()
+
+
+def test_refresher_is_periodic():
+    fetch, _ = counter()
+    refresher = Refresher(fetch, interval=0.01)
+    refresher.start()
+    assert refresher.wait(3, timeout=2)
+    refresher.stop()
+    with pytest.raises(ValueError):
+        Refresher(fetch, interval=0)
+
+
+def test_app_swaps_background_refresh(server, tmp_path):
+    def lines():
+        yield '1 mario secret'
+        yield f'e {tmp_path / "before.jsonl"} ""'
+        server.state.seed_tickets(3, seed=1)
+        time.sleep(0.5)
+        yield f'e {tmp_path / "after.jsonl"} ""'
+        yield '0'
+
+    out = io.StringIO()
+    app = App(transport=Transport(server.base_url), refresh_interval=0.02)
+    assert app.run_script(lines(), out)
+    assert len((tmp_path / 'before.jsonl').read_text().splitlines()) == 4
+    assert len((tmp_path / 'after.jsonl').read_text().splitlines()) == 7
+
+
+def test_app_discards_refresh_older_than_local_changes(server):
+    departure = (datetime.datetime.now() + datetime.timedelta(days=3)).strftime('%d/%m/%Y %H:%M')
+    tickets, calls, released = server.state.tickets, [], [threading.Event(), threading.Event()]
+
+    def blocking_tickets():
+        res = tickets()
+        calls.append(res)
+        if len(calls) > 1:
+            released[min(len(calls), 3) - 2].wait(5)
+        return res
+
+    def wait_for_calls(count: int):
+        deadline = time.monotonic() + 5
+        while len(calls) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def lines():
+        yield '1 mario secret'
+        wait_for_calls(2)
+        yield f'1 Zaccaria Locanto Crotone Torino 46.78 "{departure}" 01:30'
+        released[0].set()
+        wait_for_calls(3)
+        yield '7 Zaccaria'
+        yield '0'
+
+    out = io.StringIO()
+    with patch.object(server.state, 'tickets', blocking_tickets):
+        try:
+            assert App(transport=Transport(server.base_url), refresh_interval=0.01).run_script(lines(), out)
+        finally:
+            released[1].set()
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(calls) == 3
+    assert results[2]['output'] != ['No tickets found!']
+
+
+def test_app_background_refresh_revalidates_cache(server, tmp_path):
+    cache, get, statuses = TicketCache(str(tmp_path / 'tickets.sqlite3')), requests.Session.get, []
+    export = tmp_path / 'tickets.jsonl'
+
+    def spy(session, url, **kwargs):
+        res = get(session, url, **kwargs)
+        if url.endswith('/tickets/'):
+            statuses.append((res.status_code, sorted(kwargs.get('headers', {}))))
+        return res
+
+    def session():
+        app = App(transport=Transport(server.base_url), cache=cache, refresh_interval=60.0)
+        with patch('requests.Session.get', autospec=True, side_effect=spy):
+            assert app.run_script(['1 mario secret', f'e {export} ""', '0'], io.StringIO())
+        return len(export.read_text().splitlines())
+
+    assert session() == 4
+    assert statuses == [(200, [])]
+    assert session() == 4
+    assert statuses[1] == (304, ['If-None-Match'])
+
+    cache.store('mario', CachedTickets(b'not json', cache.load('mario').etag))
+    del statuses[:]
+    assert session() == 4
+    assert statuses == [(304, ['If-None-Match']), (200, [])]
@@ -0,0 +1,104 @@
+import builtins
+import datetime
+import io
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from air_company.app import App
+from air_company.script import Command, Prompts, ScriptError, headless, parse_command
+from air_company.transport import Transport
+from stand_in.server import StandInServer
+
+
+@pytest.fixture
+def server(stand_in):
+    return stand_in(3)
+
+
+def run(server: StandInServer, script: str, **kwargs):
+    out = io.StringIO()
+    ok = App(transport=Transport(server.base_url)).run_script(io.StringIO(script), out, **kwargs)
+    return ok, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_parse_command():
+    assert parse_command(1, '  # comment') is None
+    assert parse_command(2, '') is None
+    assert parse_command(3, '7 "Lamezia Terme" # search') == Command(3, '7', ('Lamezia Terme',))
+    with pytest.raises(ValueError):
+        parse_command(4, '7 "Lamezia')
+
+
+def test_headless_answers_prompts_and_captures_output():
+    previous = builtins.input
+    with headless(['a', 'b']) as (prompts, output):
+        assert builtins.input is previous
+        assert prompts('first') == 'a'
+        print('hidden')
+        assert prompts.remaining == 1
+        assert prompts() == 'b'
+        with pytest.raises(ScriptError):
+            prompts('third: ')
+    assert output.getvalue() == 'hidden\n'
+    assert Prompts(['x'])('? ') == 'x'
+
+
+def test_headless_runs_on_the_main_thread_only():
+    errors = []
+
+    def target():
+        try:
+            with headless(()):
+                pass
+        except ScriptError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+
+
+def test_run_script(server):
+    departure = (datetime.datetime.now() + datetime.timedelta(days=3)).strftime('%d/%m/%Y %H:%M')
+    ok, results = run(server, f'''
+        # headless session
+        x
+        1 mario wrong
+        1 mario secret
+        5
+        1 Santino Locanto Crotone "Lamezia Terme" 46.78 "{departure}" 01:30
+        8 abc
+        7 "Lamezia Terme" extra
+        2 "unterminated
+        0
+        0
+        1 never reached
+    ''')
+    assert not ok
+    assert [(result['line'], result['key'], result['ok']) for result in results] == [
+        (3, 'x', False), (4, '1', True), (5, '1', True), (6, '5', True), (7, '1', True), (8, '8', False),
+        (9, '7', False), (10, '2 "unterminated', False), (11, '0', True), (12, '0', True)]
+    assert results[0]['error'] == "unknown key 'x'"
+    assert results[1]['output'] == ['Wrong Credentials!'] and not results[1]['logged']
+    assert results[2]['logged'] and results[2]['menu'] == 'Reservation Flights Login'
+    assert results[3] == dict(results[3], menu='Reservation Flights Home', output=[], error=None)
+    assert results[4]['output'] == ['Ticket added!']
+    assert results[5]['error'].startswith('no answer left') and results[5]['output']
+    assert results[6]['error'] == '1 unused arguments' and len(results[6]['output']) > 1
+    assert results[8]['exit'] and results[8]['output'][0] == 'Logged out!'
+    assert results[9]['exit'] and results[9]['menu'] == 'Reservation Flights Login'
+    assert server.state.tickets_count() == 4
+
+
+def test_run_script_stop_on_error_logs_out(server):
+    with patch.object(server.state, 'logout', wraps=server.state.logout) as logout:
+        ok, results = run(server, '1 mario secret\n9 bad\n5\n', stop_on_error=True)
+    assert not ok
+    assert [result['key'] for result in results] == ['1', '9']
+    logout.assert_called_once()
+    ok, results = run(server, '1 mario secret\n5\n0\n0\n')
+    assert ok and len(results) == 4
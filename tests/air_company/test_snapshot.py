@@ -0,0 +1,105 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.decoder import decode_tickets
+from air_company.domain import AirCompany, primitives, microseconds
+from air_company.snapshot import read_snapshot, write_snapshot, HEADER, RECORD, STRING, MappedSnapshot, \
+    MappedTicket
+from stand_in.generator import generate_tickets
+
+
+def air_company(count, seed=0):
+    res = AirCompany()
+    res.add_tickets(decode_tickets(generate_tickets(count, seed)))
+    return res
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'tickets.snap')
+    original = air_company(40)
+    original.sort_by_price()
+    assert original.save(path) == 40
+
+    loaded = AirCompany.load(path)
+    assert loaded.order == 'price' and loaded.tickets() == 40
+    assert not any(loaded.is_materialized(ticket.id) for ticket in original.iter_tickets())
+    assert loaded.ticket(0) == original.ticket(0)
+    assert loaded.is_materialized(original.ticket(0).id) and not loaded.is_materialized(original.ticket(1).id)
+    name = original.ticket(5).name.value
+    assert loaded.search(name) == original.search(name)
+    assert list(loaded.iter_tickets()) == list(original.iter_tickets())
+    loaded.sort_by_departure_date()
+    original.sort_by_departure_date()
+    assert list(loaded.iter_tickets()) == list(original.iter_tickets())
+
+
+def test_snapshot_keeps_insertion_order_and_strings(tmp_path):
+    path = str(tmp_path / 'tickets.snap')
+    tickets = decode_tickets(generate_tickets(10, seed=4))
+    assert write_snapshot(map(primitives, tickets), 'insertion', path) == 10
+    with read_snapshot(path) as snapshot:
+        records = snapshot.records()
+        assert snapshot.order == 'insertion' and all(isinstance(record, MappedTicket) for record in records)
+        assert [record.materialize() for record in records] == tickets
+        assert [record.primitives() for record in records] == [primitives(ticket) for ticket in tickets]
+        assert len(set(snapshot.strings)) == len(snapshot.strings) and records[0].texts[0] in snapshot.strings
+    with pytest.raises(ValueError):
+        records[0].materialize()
+    with pytest.raises(ValidationError):
+        write_snapshot(map(primitives, tickets), 'name', path)
+
+
+def test_snapshot_rewrite_keeps_loaded_store_readable(tmp_path):
+    path = str(tmp_path / 'tickets.snap')
+    air_company(20, seed=1).save(path)
+    loaded = AirCompany.load(path)
+    expected = list(AirCompany.load(path).iter_tickets())
+    air_company(5, seed=2).save(path)
+    assert list(loaded.iter_tickets()) == expected
+    assert AirCompany.load(path).tickets() == 5
+
+
+def test_snapshot_rejects_corrupted_files(tmp_path):
+    path = tmp_path / 'tickets.snap'
+    air_company(3).save(str(path))
+    data = path.read_bytes()
+    for corrupted in [b'', b'NOTASNAP' + data[8:], data[:-1], data[:HEADER.size - 1], data + bytes(RECORD.size)]:
+        path.write_bytes(corrupted)
+        with pytest.raises(ValidationError):
+            read_snapshot(str(path))
+
+    path.write_bytes(data)
+    with read_snapshot(str(path)) as snapshot:
+        offset, count = snapshot.offset, len(snapshot.strings)
+    corrupted = bytearray(data)
+    STRING.pack_into(corrupted, offset + 16, count)
+    path.write_bytes(bytes(corrupted))
+    with read_snapshot(str(path)) as snapshot, pytest.raises(ValidationError):
+        snapshot.records()
+
+
+def test_snapshot_saves_departed_flights_without_validating(tmp_path):
+    first, second = str(tmp_path / 'first.snap'), str(tmp_path / 'second.snap')
+    rows = [primitives(ticket) for ticket in decode_tickets(generate_tickets(3, seed=5))]
+    rows[1] = rows[1][:7] + (microseconds(datetime.datetime(2020, 1, 1)),) + rows[1][8:]
+    write_snapshot(rows, 'insertion', first)
+    loaded = AirCompany.load(first)
+    assert loaded.save(second) == 3
+    with read_snapshot(second) as snapshot:
+        assert [record.primitives() for record in snapshot.records()] == rows
+    assert loaded.ticket(1).departureDateTime.value == datetime.datetime(2020, 1, 1) and loaded.tickets() == 3
+
+
+def test_snapshot_is_closed_with_the_store(tmp_path):
+    path = str(tmp_path / 'tickets.snap')
+    air_company(3).save(path)
+    with patch.object(MappedSnapshot, 'close', autospec=True, side_effect=MappedSnapshot.close) as close:
+        loaded, mapped = AirCompany.load(path), AirCompany()
+        mapped.swap(loaded)
+        loaded.clear()
+        assert close.call_count == 0 and mapped.tickets() == 3
+        mapped.clear()
+        assert close.call_count == 1 and close.call_args[0][0].buffer.closed
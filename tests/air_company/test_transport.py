@@ -0,0 +1,53 @@
+from unittest.mock import patch, Mock
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.transport import Transport
+
+
+def test_transport_validates_arguments():
+    with pytest.raises(ValidationError):
+        Transport('')
+    with pytest.raises(ValidationError):
+        Transport('http://localhost', pool_size=0)
+    with pytest.raises(ValidationError):
+        Transport('http://localhost', timeout=0)
+
+
+def test_transport_url():
+    transport = Transport('http://localhost:8000/api/v1/')
+    assert transport.url('tickets/') == 'http://localhost:8000/api/v1/tickets/'
+    assert transport.url('/auth/login/') == 'http://localhost:8000/api/v1/auth/login/'
+
+
+def test_transport_authorization_header():
+    transport = Transport('http://localhost')
+    assert not transport.is_authorized()
+    transport.authorize('abc')
+    assert transport.is_authorized()
+    transport.deauthorize()
+    assert not transport.is_authorized()
+
+
+@patch('requests.Session.get', return_value=Mock(status_code=200))
+def test_transport_uses_default_timeout(mocked_get):
+    Transport('http://localhost', timeout=2.5).get('tickets/')
+    mocked_get.assert_called_with(url='http://localhost/tickets/', timeout=2.5)
+
+
+@patch('requests.Session.delete', return_value=Mock(status_code=204))
+def test_transport_per_request_timeout(mocked_delete):
+    Transport('http://localhost').delete('tickets/1/', timeout=1.0)
+    mocked_delete.assert_called_with(url='http://localhost/tickets/1/', timeout=1.0)
+
+
+def test_transport_sends_token_on_every_request():
+    transport = Transport('http://localhost')
+    transport.authorize('abc')
+    with patch('requests.Session.send', return_value=Mock(status_code=200)) as mocked_send:
+        transport.get('tickets/')
+        transport.post('auth/logout/')
+    assert mocked_send.call_count == 2
+    for call in mocked_send.call_args_list:
+        assert call.args[0].headers['Authorization'] == 'Token abc'
@@ -0,0 +1,97 @@
+import datetime
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.domain import AirCompany, Ticket, Author, Name, Surname, Departure, Destination, Price, \
+    DepartureDateTime, TimeFlight
+from air_company.columnar import ColumnarAirCompany
+from air_company.view import TicketTable, _row
+
+
+def make_ticket(id: int, euro: int = 15) -> Ticket:
+    return Ticket(id, Author(id), Name("Santino"), Surname("Locanto"), Departure("Crotone"), Destination("Torino"),
+                  Price.create(euro), DepartureDateTime(datetime.datetime.now() + timedelta(days=1)),
+                  TimeFlight(datetime.time(0, 40)))
+
+
+@pytest.fixture
+def airCompany():
+    res = AirCompany()
+    for id in range(1, 8):
+        res.add_ticket(make_ticket(id))
+    return res
+
+
+def rows(rendered: str):
+    return [line.split()[0] for line in rendered.split('\n')[3:-2]]
+
+
+def test_table_pages(airCompany):
+    table = TicketTable(airCompany, page_size=3)
+    assert table.pages() == 3
+    assert rows(table.render()) == ['1', '2', '3']
+    assert table.render().endswith('Page 1/3 - 7 tickets')
+
+    table.next_page()
+    assert rows(table.render()) == ['4', '5', '6']
+    table.next_page()
+    table.next_page()
+    assert table.page == 3
+    assert rows(table.render()) == ['7']
+
+    table.previous_page()
+    assert table.page == 2
+    table.go_to_page(1)
+    assert table.page == 1
+    with pytest.raises(ValidationError):
+        table.go_to_page(4)
+
+
+def test_table_page_size(airCompany):
+    with pytest.raises(ValidationError):
+        TicketTable(airCompany, page_size=0)
+
+    table = TicketTable(airCompany, page_size=2)
+    table.go_to_page(3)
+    table.set_page_size(5)
+    assert table.page == 1
+    assert rows(table.render()) == ['1', '2', '3', '4', '5']
+
+
+def test_table_page_shrinks_with_tickets(airCompany):
+    table = TicketTable(airCompany, page_size=3)
+    table.go_to_page(3)
+    airCompany.remove_by_id(7)
+    assert table.page == 2
+    airCompany.clear()
+    assert table.pages() == 1
+    assert rows(table.render()) == []
+
+
+def test_table_row_cache_follows_ticket_changes(airCompany):
+    table = TicketTable(airCompany, page_size=3)
+    assert '15.00' in table.render()
+    airCompany.replace_by_id(make_ticket(1, euro=99))
+    rendered = table.render()
+    assert '99.00' in rendered
+    assert '15.00' in rendered.split('\n')[4]
+
+
+def test_table_row_cache_hits_columnar_views(airCompany):
+    columnar = ColumnarAirCompany()
+    columnar.add_tickets(airCompany.iter_tickets())
+    table = TicketTable(columnar, page_size=3)
+    with patch('air_company.view._row', side_effect=_row) as row:
+        first = table.render()
+        assert table.render() == first and row.call_count == 3
+        columnar.replace_by_id(make_ticket(2, euro=99))
+        assert '99.00' in table.render() and row.call_count == 4
+
+
+def test_render_tickets(airCompany):
+    lines = TicketTable(airCompany).render_tickets([airCompany.get_by_id(5)]).split('\n')
+    assert len(lines) == 5
+    assert lines[3].split()[:2] == ['1', '5']
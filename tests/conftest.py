@@ -0,0 +1,27 @@
+import pytest
+
+from stand_in.server import StandInServer, StandInState
+
+
+@pytest.fixture
+def stand_in():
+    servers = []
+
+    def start(count: int = 0, seed: int = 0, users=('mario',)) -> StandInServer:
+        state = StandInState()
+        for username in users:
+            state.add_user(username, 'secret')
+        state.seed_tickets(count, seed)
+        res = StandInServer(('127.0.0.1', 0), state)
+        res.start()
+        servers.append(res)
+        return res
+
+    yield start
+    for res in servers:
+        res.stop()
+
+
+@pytest.fixture
+def server(stand_in):
+    return stand_in()
@@ -0,0 +1,16 @@
+from air_company.decoder import decode_tickets
+from stand_in.generator import generate_tickets
+
+
+def test_generated_tickets_pass_domain_validation():
+    items = generate_tickets(200, seed=3, authors=[1, 2])
+    tickets = decode_tickets(items)
+    assert [ticket.id for ticket in tickets] == list(range(1, 201))
+    assert {ticket.author.value for ticket in tickets} <= {1, 2}
+    assert all(ticket.departure != ticket.destination for ticket in tickets)
+
+
+def test_generated_tickets_are_reproducible():
+    assert generate_tickets(20, seed=1) == generate_tickets(20, seed=1)
+    assert generate_tickets(20, seed=1) != generate_tickets(20, seed=2)
+    assert generate_tickets(5, first_id=10)[0]['id'] == 10
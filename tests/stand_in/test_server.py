@@ -0,0 +1,126 @@
+import datetime
+import time
+from unittest.mock import patch
+
+import pytest
+from valid8 import ValidationError
+
+from air_company.app import App
+from air_company.transport import Transport
+from stand_in.server import Faults, StandInServer
+
+
+@pytest.fixture
+def server(stand_in):
+    return stand_in(30, seed=1, users=('mario', 'luigi'))
+
+
+def logged_in(server: StandInServer, username: str = 'mario') -> Transport:
+    transport = Transport(server.base_url)
+    res = transport.post('auth/login/', data={'username': username, 'password': 'secret'})
+    assert res.status_code == 200
+    transport.authorize(res.json()['key'])
+    return transport
+
+
+def ticket_body() -> dict:
+    departure = (datetime.datetime.now() + datetime.timedelta(days=3)).replace(microsecond=0)
+    return {'name': 'Santino', 'surname': 'Locanto', 'departure': 'Crotone', 'destination': 'Torino',
+            'price': '46.78', 'departureDateTime': str(departure), 'timeFlight': '00:40:00'}
+
+
+def test_faults_are_validated():
+    with pytest.raises(ValidationError):
+        Faults(error_rate=2.0)
+    with pytest.raises(ValidationError):
+        Faults(latency=-1.0)
+
+
+def test_login_and_user_id(server):
+    transport = Transport(server.base_url)
+    assert transport.post('auth/login/', data={'username': 'mario', 'password': 'wrong'}).status_code == 400
+    assert transport.get('tickets/').status_code == 401
+
+    transport = logged_in(server, 'luigi')
+    assert transport.get('tickets/idUserLogged/luigi').json() == {'id': 2}
+    assert transport.get('tickets/idUserLogged/nobody').status_code == 404
+
+    assert transport.post('auth/logout/').status_code == 200
+    assert transport.get('tickets/').status_code == 401
+
+
+def test_registration(server):
+    transport = Transport(server.base_url)
+    data = {'username': 'peach', 'email': 'peach@example.com', 'password1': 'a', 'password2': 'b'}
+    assert transport.post('auth/registration/', data=data).status_code == 400
+    data['password2'] = 'a'
+    assert transport.post('auth/registration/', data=data).status_code == 201
+    assert transport.post('auth/registration/', data=data).status_code == 400
+    assert transport.post('auth/login/', data={'username': 'peach', 'password': 'a'}).status_code == 200
+
+
+def test_tickets_etag(server):
+    transport = logged_in(server)
+    res = transport.get('tickets/')
+    assert res.status_code == 200
+    assert len(res.json()) == 30
+    assert transport.get('tickets/', headers={'If-None-Match': res.headers['ETag']}).status_code == 304
+
+    assert transport.post('tickets/', json=ticket_body()).status_code == 201
+    assert transport.get('tickets/', headers={'If-None-Match': res.headers['ETag']}).status_code == 200
+
+
+def test_ticket_crud(server):
+    transport = logged_in(server)
+    res = transport.post('tickets/', json=ticket_body())
+    assert res.status_code == 201
+    created = res.json()
+    assert created['id'] == 31
+    assert created['author'] == 1
+    assert created['departureDateTime'].endswith('Z')
+
+    body = dict(ticket_body(), name='Marco')
+    assert transport.put('tickets/31/', json=body).json()['name'] == 'Marco'
+    assert transport.get('tickets/31/').json()['name'] == 'Marco'
+    assert transport.put('tickets/31/', json=dict(body, name='marco')).status_code == 400
+
+    assert logged_in(server, 'luigi').delete('tickets/31/').status_code == 403
+    assert transport.delete('tickets/31/').status_code == 204
+    assert transport.get('tickets/31/').status_code == 404
+    assert transport.delete('tickets/31/').status_code == 404
+
+
+def test_invalid_ticket_is_rejected(server):
+    transport = logged_in(server)
+    assert transport.post('tickets/', json=dict(ticket_body(), price='free')).status_code == 400
+    assert transport.post('tickets/', json={'name': 'Santino'}).status_code == 400
+
+
+def test_error_injection():
+    server = StandInServer(('127.0.0.1', 0), faults=Faults(error_rate=1.0, error_status=500))
+    server.start()
+    try:
+        assert Transport(server.base_url).post('auth/login/').status_code == 500
+    finally:
+        server.stop()
+
+
+def test_latency_injection():
+    server = StandInServer(('127.0.0.1', 0), faults=Faults(latency=0.05))
+    server.start()
+    try:
+        start = time.perf_counter()
+        Transport(server.base_url).post('auth/logout/')
+        assert time.perf_counter() - start >= 0.05
+    finally:
+        server.stop()
+
+
+@patch('builtins.input', side_effect=['1', 'mario', 'secret', '0', '0'])
+@patch('builtins.print')
+def test_app_against_stand_in(mocked_print, mocked_input, server):
+    app = App(transport=Transport(server.base_url))
+    app.run()
+    printed = [str(args[0]) for args, _ in mocked_print.call_args_list if args]
+    assert any(line.endswith('Page 1/2 - 30 tickets') for line in printed)
+    mocked_print.assert_any_call('Logged out!')
@@ -0,0 +1,95 @@
+from dataclasses import dataclass, InitVar, field
+from typing import Any, Callable
+
+import pytest
+from valid8 import ValidationError
+
+from validation import engine
+from validation.engine import Rule, compile_checks, compile_argument_checks
+from validation.regex import pattern
+
+
+@pytest.fixture
+def trusted():
+    engine.set_mode(engine.TRUSTED)
+    yield
+    engine.set_mode(engine.STRICT)
+
+
+@dataclass(frozen=True)
+class Word:
+    value: str
+
+    def __post_init__(self):
+        _check_word(self)
+
+
+_check_word = compile_checks(Word, value=Rule(min_len=1, max_len=5, custom=pattern(r'[a-z]*')))
+
+
+@dataclass(frozen=True)
+class Guarded:
+    value: int
+    key: InitVar[Any] = field(default=None)
+    on_selected: Callable[[], None] = field(default=lambda: None)
+
+    def __post_init__(self, key):
+        _check_guarded(self, key)
+
+
+_check_guarded = compile_checks(Guarded, initvars={'key': Rule(equals='secret')}, value=Rule(min_value=0))
+
+
+def test_default_mode_is_strict():
+    assert engine.mode() == engine.STRICT
+
+
+def test_set_mode_rejects_unknown_modes():
+    with pytest.raises(ValidationError):
+        engine.set_mode('lenient')
+
+
+def test_compiled_checks_accept_valid_values():
+    assert Word('abc').value == 'abc'
+    assert Guarded(1, 'secret').value == 1
+
+
+def test_compiled_checks_raise_the_same_errors_as_valid8():
+    for value in ['', 'abcdef', 'ABC']:
+        with pytest.raises(ValidationError):
+            Word(value)
+    with pytest.raises(ValidationError):
+        Guarded(1)
+    with pytest.raises(ValidationError):
+        Guarded(-1, 'secret')
+
+
+def test_strict_mode_checks_types():
+    with pytest.raises(TypeError):
+        Word(1)
+    with pytest.raises(TypeError):
+        Guarded(1, 'secret', on_selected=0)
+
+
+def test_trusted_mode_skips_type_checks(trusted):
+    assert engine.mode() == engine.TRUSTED
+    assert Guarded(True, 'secret', on_selected=0).value
+    with pytest.raises(ValidationError):
+        Word('ABC')
+    with pytest.raises(ValidationError):
+        Guarded(1)
+
+
+def test_compile_argument_checks():
+    check = compile_argument_checks(euro=Rule(min_value=0, instance_of=int), cents=Rule(max_value=99))
+    check(1, 99)
+    with pytest.raises(ValidationError):
+        check(-1, 0)
+    with pytest.raises(ValidationError):
+        check(1, 100)
+    with pytest.raises(TypeError):
+        check('1', 0)
+
+
+def test_compile_argument_checks_skips_types_when_trusted(trusted):
+    compile_argument_checks(euro=Rule(instance_of=int))(1.5)
@@ -0,0 +1,159 @@
+import collections.abc
+import os
+import types
+import typing
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional
+
+from valid8 import validate
+
+from validation.dataclasses import validate_dataclass
+
+STRICT = 'strict'
+TRUSTED = 'trusted'
+MODES = (STRICT, TRUSTED)
+MODE_ENVIRONMENT_VARIABLE = 'RESERVATION_FLIGHTS_VALIDATION'
+
+_UNSET = object()
+
+
+class _State:
+    strict = True
+
+
+_state = _State()
+
+
+def mode() -> str:
+    return STRICT if _state.strict else TRUSTED
+
+
+def set_mode(value: str) -> None:
+    validate('mode', value, is_in=MODES)
+    _state.strict = value == STRICT
+
+
+@dataclass(frozen=True)
+class Rule:
+    min_len: Any = _UNSET
+    max_len: Any = _UNSET
+    min_value: Any = _UNSET
+    max_value: Any = _UNSET
+    equals: Any = _UNSET
+    custom: Any = _UNSET
+    instance_of: Any = _UNSET
+    label: Optional[str] = None
+
+    def kwargs(self) -> Dict[str, Any]:
+        res = {}
+        for name in ('min_len', 'max_len', 'min_value', 'max_value', 'equals', 'custom'):
+            value = getattr(self, name)
+            if value is _UNSET:
+                continue
+            res[name] = value() if name in ('min_value', 'max_value') and callable(value) else value
+        return res
+
+
+def _type_condition(annotation: Any, value: str, namespace: Dict[str, Any]) -> Optional[str]:
+    if isinstance(annotation, type):
+        name = f'_type{len(namespace)}'
+        namespace[name] = annotation
+        return f'isinstance({value}, {name})'
+    if typing.get_origin(annotation) is collections.abc.Callable:
+        namespace['_FunctionType'] = types.FunctionType
+        return f'isinstance({value}, _FunctionType)'
+    return None
+
+
+def _rule_conditions(rule: Rule, value: str, namespace: Dict[str, Any]) -> List[str]:
+    def bind(argument: Any) -> str:
+        name = f'_arg{len(namespace)}'
+        namespace[name] = argument
+        return name
+
+    res = [f'{value} is not None']
+    if rule.min_len is not _UNSET:
+        res.append(f'len({value}) >= {bind(rule.min_len)}')
+    if rule.max_len is not _UNSET:
+        res.append(f'len({value}) <= {bind(rule.max_len)}')
+    for argument, operator in ((rule.min_value, '>='), (rule.max_value, '<=')):
+        if argument is not _UNSET:
+            bound = bind(argument) + ('()' if callable(argument) else '')
+            res.append(f'{value} {operator} {bound}')
+    if rule.equals is not _UNSET:
+        res.append(f'{value} == {bind(rule.equals)}')
+    if rule.custom is not _UNSET:
+        res.append(f'{bind(rule.custom)}({value})')
+    return res
+
+
+def compile_checks(cls: type, initvars: Optional[Dict[str, Rule]] = None, **rules: Rule) -> Callable[..., None]:
+    initvars = initvars or {}
+    namespace = {'_state': _state, 'validate_dataclass': validate_dataclass}
+
+    initvar_conditions = [condition for name, rule in initvars.items()
+                          for condition in _rule_conditions(rule, name, namespace)]
+    type_conditions = [_type_condition(f.type, f'obj.{f.name}', namespace) for f in fields(cls)]
+    if None in type_conditions:
+        type_conditions = ['validate_dataclass(obj) is None']
+    rule_conditions = [condition for name, rule in rules.items()
+                       for condition in _rule_conditions(rule, f'obj.{name}', namespace)]
+
+    def reference(obj: Any, *values: Any) -> None:
+        for (name, rule), value in zip(initvars.items(), values):
+            validate(rule.label or name, value, **rule.kwargs())
+        if _state.strict:
+            validate_dataclass(obj)
+        for name, rule in rules.items():
+            validate(rule.label or name, getattr(obj, name), **rule.kwargs())
+
+    namespace['_reference'] = reference
+    arguments = ', '.join(['obj', *initvars])
+    source = '\n'.join([
+        f'def check({arguments}):',
+        '    try:',
+        f'        if ({" and ".join(initvar_conditions) or "True"}) \\',
+        f'                and (not _state.strict or ({" and ".join(type_conditions) or "True"})) \\',
+        f'                and ({" and ".join(rule_conditions) or "True"}):',
+        '            return',
+        '    except Exception:',
+        '        pass',
+        f'    _reference({arguments})',
+    ])
+    exec(compile(source, f'<checks {cls.__qualname__}>', 'exec'), namespace)
+    check = namespace['check']
+    check.__qualname__ = f'{cls.__qualname__}.check'
+    return check
+
+
+def compile_argument_checks(**rules: Rule) -> Callable[..., None]:
+    namespace = {'_state': _state}
+    type_conditions = [_type_condition(rule.instance_of, name, namespace)
+                       for name, rule in rules.items() if rule.instance_of is not _UNSET]
+    validate('instance_of', type_conditions, custom=lambda v: None not in v)
+    conditions = [condition for name, rule in rules.items() for condition in _rule_conditions(rule, name, namespace)]
+
+    def reference(*values: Any) -> None:
+        for (name, rule), value in zip(rules.items(), values):
+            if _state.strict and rule.instance_of is not _UNSET and not isinstance(value, rule.instance_of):
+                raise TypeError(f'{rule.label or name} must be of type {rule.instance_of.__qualname__}; '
+                                f'got {type(value).__qualname__} instead')
+            validate(rule.label or name, value, **rule.kwargs())
+
+    namespace['_reference'] = reference
+    arguments = ', '.join(rules)
+    source = '\n'.join([
+        f'def check({arguments}):',
+        '    try:',
+        f'        if (not _state.strict or ({" and ".join(type_conditions) or "True"})) \\',
+        f'                and {" and ".join(conditions)}:',
+        '            return',
+        '    except Exception:',
+        '        pass',
+        f'    _reference({arguments})',
+    ])
+    exec(compile(source, '<argument checks>', 'exec'), namespace)
+    return namespace['check']
+
+
+set_mode(os.environ.get(MODE_ENVIRONMENT_VARIABLE, STRICT))